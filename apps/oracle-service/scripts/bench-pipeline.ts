@@ -0,0 +1,72 @@
+#!/usr/bin/env ts-node
+// Times the scaleToIndex -> sanityCheckJump -> shouldPublishValue decision loop
+// over a long synthetic tick stream. Prints one JSON object (seconds per tick)
+// for scripts/bench.py to merge into its results.
+import { sanityCheckJump, scaleToIndex, shouldPublishValue } from '../src/pipeline';
+
+const ticks = Number(process.argv[2] ?? 1_000_000);
+const repeat = Number(process.argv[3] ?? 5);
+
+// Deterministic random walk so every run sees the same stream.
+function makeStream(n: number): Float64Array {
+  const raw = new Float64Array(n);
+  let seed = 42;
+  let price = 4000;
+  for (let i = 0; i < n; i++) {
+    seed = (seed * 1664525 + 1013904223) % 4294967296;
+    price *= 1 + ((seed / 4294967296) - 0.5) * 0.002;
+    raw[i] = price;
+  }
+  return raw;
+}
+
+function runLoop(raw: Float64Array): number {
+  let lastPublishedValue: number | null = null;
+  let lastPublishTimestamp = 0;
+  let previousIndex: number | null = null;
+  let publishes = 0;
+
+  for (let i = 0; i < raw.length; i++) {
+    const now = i * 250;
+    const scaled = scaleToIndex(raw[i], 40);
+    const jump = sanityCheckJump(previousIndex, scaled, 0.2);
+    if (!jump.ok) {
+      continue;
+    }
+    previousIndex = scaled;
+    const decision = shouldPublishValue(scaled, lastPublishedValue, lastPublishTimestamp, now, 0.01, 10000);
+    if (decision.publish) {
+      lastPublishedValue = scaled;
+      lastPublishTimestamp = now;
+      publishes += 1;
+    }
+  }
+  return publishes;
+}
+
+function main() {
+  const raw = makeStream(ticks);
+  runLoop(raw);  // warm up the JIT
+
+  const perTick: number[] = [];
+  let publishes = 0;
+  for (let r = 0; r < repeat; r++) {
+    const started = process.hrtime.bigint();
+    publishes = runLoop(raw);
+    perTick.push(Number(process.hrtime.bigint() - started) / 1e9 / ticks);
+  }
+  perTick.sort((a, b) => a - b);
+
+  console.log(JSON.stringify({
+    pipeline_decision_loop_ts: {
+      median_s: perTick[Math.floor(perTick.length / 2)],
+      min_s: perTick[0],
+      max_s: perTick[perTick.length - 1],
+      unit: 'tick',
+      n: ticks,
+      publishes,
+    },
+  }));
+}
+
+main();
@@ -0,0 +1,54 @@
+#!/usr/bin/env ts-node
+// Times publishToHyperliquid end to end through the real transport: Node ->
+// set-oracle.py (execFile per publish, or the persistent --serve signer when
+// HL_PERSISTENT_SIGNER=true) -> POST /exchange. scripts/bench.py sets the env,
+// pointing HL_API_URL at a local stand-in. Prints one JSON object (seconds per
+// publish) for scripts/bench.py to merge into its results.
+import { config } from '../src/config';
+import { loadMarkets } from '../src/markets';
+import { publishToHyperliquid } from '../src/services/hyperliquid';
+import { createPublishStats } from '../src/state';
+
+const count = Number(process.argv[2] ?? 20);
+const repeat = Number(process.argv[3] ?? 5);
+
+async function publishOnce(value: number) {
+  const [market] = loadMarkets();
+  // Fresh stats every time so the epsilon / heartbeat gate always lets it through.
+  await publishToHyperliquid(market, createPublishStats(), value, {
+    priceChangeEpsilon: market.priceChangeEpsilon,
+    minPublishIntervalMs: market.minPublishIntervalMs,
+  });
+}
+
+async function main() {
+  const name = config.hlPersistentSigner ? 'publish_e2e_persistent' : 'publish_e2e_execfile';
+  await publishOnce(100);  // warm up (starts the persistent signer)
+
+  const perPublish: number[] = [];
+  for (let r = 0; r < repeat; r++) {
+    const started = process.hrtime.bigint();
+    for (let i = 0; i < count; i++) {
+      await publishOnce(100 + i / 100);
+    }
+    perPublish.push(Number(process.hrtime.bigint() - started) / 1e9 / count);
+  }
+  perPublish.sort((a, b) => a - b);
+
+  console.log(JSON.stringify({
+    [name]: {
+      median_s: perPublish[Math.floor(perPublish.length / 2)],
+      min_s: perPublish[0],
+      max_s: perPublish[perPublish.length - 1],
+      unit: 'publish',
+      n: count,
+    },
+  }));
+}
+
+main()
+  .then(() => process.exit(0))  // the persistent signer would keep the event loop alive
+  .catch((err) => {
+    console.error(err);
+    process.exit(1);
+  });
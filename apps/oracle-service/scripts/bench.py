@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the hot paths, with stored baselines.
+
+Benchmarks (median seconds per unit of work; lower is better):
+  generate_orders_L<n>        seed-from-preset ladder at depth n
+  set_oracle_sign             setOracle action build + sign_l1_action
+  cold_start_<script>         wall time to start a script (imports + --help); fails on a non-zero exit
+  json_{encode,decode}_*      setOracle and 100-order payloads
+  pipeline_decision_loop_py   warmarket.pipeline decision loop, per tick
+  pipeline_decision_loop_ts   src/pipeline.ts decision loop, per tick (needs ts-node)
+  publish_e2e_local           build + sign + POST /exchange to a local stand-in, in-process
+  publish_e2e_execfile        publishToHyperliquid -> execFile set-oracle.py -> POST (needs ts-node)
+  publish_e2e_persistent      publishToHyperliquid -> set-oracle.py --serve -> POST (needs ts-node)
+
+Usage:
+    python3 scripts/bench.py                               # run and print results
+    python3 scripts/bench.py --save-baseline               # store bench/baseline.json
+    python3 scripts/bench.py --compare --tolerance 0.25    # exit 1 on >25% regressions
+    python3 scripts/bench.py --only generate_orders,json
+
+Baselines are machine-specific: save one per machine before comparing.
+--compare fails if a baseline entry has no result in this run, so a suite that
+was skipped (missing dependency or ts runner) cannot pass silently.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_BASELINE = os.path.join(SERVICE_DIR, "bench", "baseline.json")
+
+
+def measure(fn: Callable[[], None], number: int, repeat: int, unit: str = "op") -> dict:
+    """Median/min/max seconds per call over `repeat` batches of `number` calls."""
+    fn()  # warm-up
+    per_op: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_op.append((time.perf_counter() - started) / number)
+    return {"median_s": statistics.median(per_op), "min_s": min(per_op), "max_s": max(per_op), "unit": unit, "n": number}
+
+
+def load_script(name: str):
+    """Import a hyphenated script (e.g. seed-from-preset.py) as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), os.path.join(SCRIPTS_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def set_oracle_action(coin: str, price: str) -> dict:
+    return {
+        "type": "perpDeploy",
+        "setOracle": {
+            "dex": coin.split(":", 1)[0],
+            "oraclePxs": [[coin, price]],
+            "markPxs": [],
+            "externalPerpPxs": [[coin, price]],
+        },
+    }
+
+
+# --- suites ------------------------------------------------------------------
+
+def bench_generate_orders(args) -> Dict[str, dict]:
+    from warmarket.precision import AssetRules
+
+    generate_orders = load_script("seed-from-preset").generate_orders
+    rules = AssetRules(2)
+    results = {}
+    for levels in (1, 10, 100, 1000):
+        preset = {"mid": 100.0, "spread_bps": 25, "step_bps": 1, "levels": levels, "size": 0.01}
+        results[f"generate_orders_L{levels}"] = measure(
+            lambda: generate_orders(preset, rules), number=max(5, 2000 // levels), repeat=args.repeat, unit="ladder"
+        )
+    return results
+
+
+def bench_set_oracle_sign(args) -> Dict[str, dict]:
+    import eth_account
+    from hyperliquid.utils.signing import sign_l1_action
+
+    wallet = eth_account.Account.create()
+    nonce = [1_700_000_000_000]
+
+    def sign_once() -> None:
+        nonce[0] += 1
+        action = set_oracle_action("wa:GDR", "101.25")
+        sign_l1_action(wallet, action, None, nonce[0], None, False)
+
+    return {"set_oracle_sign": measure(sign_once, number=50, repeat=args.repeat, unit="signature")}
+
+
+COLD_START = [
+    # (script, argv, env overrides). --help stops after module-level imports and
+    # argparse (set-oracle imports the SDK at module level before handling it).
+    ("set-oracle", ["--help"], {}),
+    ("halt-trading", ["--help"], {}),
+    ("seed-from-preset", ["--help"], {}),
+    ("wind-down", ["--help"], {}),
+    ("deploy-asset", ["--help"], {}),
+    ("fleet-health", ["--help"], {}),
+    ("replay-pipeline", ["--help"], {}),
+    ("journal-query", ["--help"], {}),
+]
+
+
+def bench_cold_start(args) -> Dict[str, dict]:
+    results = {}
+    env = {**os.environ, "ENV_FILE": os.devnull}
+    for script, argv, overrides in COLD_START:
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, os.path.join(SCRIPTS_DIR, f"{script}.py"), *argv],
+                cwd=SERVICE_DIR,
+                env={**env, **overrides},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            samples.append(time.perf_counter() - started)
+            if proc.returncode != 0:
+                # A crash at import time would otherwise look like a fast start.
+                raise RuntimeError(f"{script} {' '.join(argv)} exited {proc.returncode}: {proc.stderr.strip()[-300:]}")
+        results[f"cold_start_{script}"] = {
+            "median_s": statistics.median(samples), "min_s": min(samples), "max_s": max(samples), "unit": "start", "n": 1,
+        }
+    return results
+
+
+def bench_json(args) -> Dict[str, dict]:
+    oracle_payload = {
+        "action": set_oracle_action("wa:GDR", "101.25"),
+        "nonce": 1_700_000_000_000,
+        "signature": {"r": "0x" + "ab" * 32, "s": "0x" + "cd" * 32, "v": 27},
+        "expiresAfter": None,
+    }
+    orders_payload = {
+        "action": {
+            "type": "order",
+            "orders": [
+                {"a": 110000, "b": i % 2 == 0, "p": f"{100 + i * 0.01:.2f}", "s": "0.01", "r": False, "t": {"limit": {"tif": "Gtc"}}}
+                for i in range(100)
+            ],
+            "grouping": "na",
+        },
+        "nonce": 1_700_000_000_000,
+        "signature": oracle_payload["signature"],
+    }
+    results = {}
+    for name, payload in (("set_oracle", oracle_payload), ("orders100", orders_payload)):
+        encoded = json.dumps(payload)
+        results[f"json_encode_{name}"] = measure(lambda p=payload: json.dumps(p), number=2000, repeat=args.repeat)
+        results[f"json_decode_{name}"] = measure(lambda e=encoded: json.loads(e), number=2000, repeat=args.repeat)
+    return results
+
+
+def _tick_stream(n: int) -> List[float]:
+    seed, price, raw = 42, 4000.0, []
+    for _ in range(n):
+        seed = (seed * 1664525 + 1013904223) % 4294967296
+        price *= 1 + (seed / 4294967296 - 0.5) * 0.002
+        raw.append(price)
+    return raw
+
+
+def bench_pipeline(args) -> Dict[str, dict]:
+    from warmarket.pipeline import sanity_check_jump, scale_to_index, should_publish_value
+
+    raw = _tick_stream(args.ticks)
+
+    def run_loop() -> None:
+        last_published, last_ts, previous = None, 0, None
+        for i, price in enumerate(raw):
+            now = i * 250
+            scaled = scale_to_index(price, 40)
+            ok, _ = sanity_check_jump(previous, scaled, 0.2)
+            if not ok:
+                continue
+            previous = scaled
+            publish, _ = should_publish_value(scaled, last_published, last_ts, now, 0.01, 10000)
+            if publish:
+                last_published, last_ts = scaled, now
+
+    result = measure(run_loop, number=1, repeat=args.repeat, unit="tick")
+    for key in ("median_s", "min_s", "max_s"):
+        result[key] /= len(raw)
+    result["n"] = len(raw)
+    results = {"pipeline_decision_loop_py": result}
+
+    ts_cmd = args.ts_runner.split() + [os.path.join(SCRIPTS_DIR, "bench-pipeline.ts"), str(args.ticks), str(args.repeat)]
+    try:
+        out = subprocess.run(ts_cmd, cwd=SERVICE_DIR, capture_output=True, text=True, timeout=300)
+        if out.returncode == 0:
+            results.update(json.loads(out.stdout.strip().splitlines()[-1]))
+        else:
+            print(f"⚠️  TS pipeline bench skipped: {out.stderr.strip()[:200]}", file=sys.stderr)
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        print(f"⚠️  TS pipeline bench skipped: {e}", file=sys.stderr)
+    return results
+
+
+class _ExchangeStandin(BaseHTTPRequestHandler):
+    """/exchange answers ok after delay_s; /info answers just enough for Exchange() and rules_for()."""
+
+    delay_s = 0.0
+    protocol_version = "HTTP/1.1"  # keep-alive, like the SDK session
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        if self.path == "/info":
+            reply = json.dumps(self._info(body)).encode()
+        else:
+            if self.delay_s:
+                time.sleep(self.delay_s)
+            reply = b'{"status":"ok","response":{"type":"default"}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    @staticmethod
+    def _info(body: dict):
+        kind = body.get("type")
+        if kind == "meta":
+            dex = body.get("dex") or ""
+            return {"universe": [{"name": f"{dex}:{BENCH_COIN}" if dex else BENCH_COIN, "szDecimals": 2}]}
+        if kind == "spotMeta":
+            return {"universe": [], "tokens": []}
+        if kind == "perpDexs":
+            return [None]
+        return {}
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+# Dedicated dex tag, so the meta cache entry the subprocess bench writes never
+# shadows a real dex.
+BENCH_DEX = "bnch"
+BENCH_COIN = "GDR"
+
+
+def bench_publish_e2e(args) -> Dict[str, dict]:
+    import eth_account
+    from hyperliquid.api import API
+    from hyperliquid.utils.signing import sign_l1_action
+
+    from warmarket.precision import AssetRules, normalize_price
+
+    _ExchangeStandin.delay_s = args.standin_delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ExchangeStandin)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api = API(f"http://127.0.0.1:{server.server_address[1]}")
+    wallet = eth_account.Account.create()
+    rules = AssetRules(2)
+    nonce = [1_700_000_000_000]
+
+    def publish_once() -> None:
+        nonce[0] += 1
+        action = set_oracle_action("wa:GDR", normalize_price(101.2345, rules))
+        signature = sign_l1_action(wallet, action, None, nonce[0], None, False)
+        api.post("/exchange", {"action": action, "nonce": nonce[0], "signature": signature, "expiresAfter": None})
+
+    try:
+        results = {"publish_e2e_local": measure(publish_once, number=50, repeat=args.repeat, unit="publish")}
+        results.update(_bench_publish_subprocess(args, f"http://127.0.0.1:{server.server_address[1]}"))
+        return results
+    finally:
+        server.shutdown()
+
+
+def _bench_publish_subprocess(args, api_url: str) -> Dict[str, dict]:
+    """The service's real publish path, via scripts/bench-publish.ts, once per signer mode."""
+    import eth_account
+
+    wallet = eth_account.Account.create()
+    env = {
+        **os.environ,
+        "ENV_FILE": os.devnull,
+        "NETWORK": "testnet",
+        "HL_API_URL": api_url,
+        "HL_TESTNET_URL": api_url,
+        "HL_MASTER_ADDRESS": wallet.address,
+        "HL_MASTER_PRIVATE_KEY": wallet.key.hex(),
+        "HL_EXPECTED_API_ADDRESS": wallet.address,
+        "HL_DEX_NAME": BENCH_DEX,
+        "HL_COIN_SYMBOL": BENCH_COIN,
+        "HL_PUBLISH_ENABLED": "true",
+        "HL_WS_POST": "false",
+        "PYTH_FEED_ID": "0" * 64,
+        "AUDIT_JOURNAL": "off",
+    }
+    env.pop("MARKETS_FILE", None)
+
+    results: Dict[str, dict] = {}
+    for persistent, count in (("false", 5), ("true", 50)):
+        cmd = args.ts_runner.split() + [os.path.join(SCRIPTS_DIR, "bench-publish.ts"), str(count), str(args.repeat)]
+        try:
+            out = subprocess.run(
+                cmd, cwd=SERVICE_DIR, env={**env, "HL_PERSISTENT_SIGNER": persistent},
+                capture_output=True, text=True, timeout=600,
+            )
+            if out.returncode == 0:
+                results.update(json.loads(out.stdout.strip().splitlines()[-1]))
+            else:
+                print(f"⚠️  subprocess publish bench skipped: {out.stderr.strip()[-300:]}", file=sys.stderr)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            print(f"⚠️  subprocess publish bench skipped: {e}", file=sys.stderr)
+    return results
+
+
+SUITES = {
+    "generate_orders": bench_generate_orders,
+    "set_oracle_sign": bench_set_oracle_sign,
+    "cold_start": bench_cold_start,
+    "json": bench_json,
+    "pipeline": bench_pipeline,
+    "publish_e2e": bench_publish_e2e,
+}
+
+
+# --- baselines ---------------------------------------------------------------
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float, selected: List[str]) -> List[str]:
+    regressions = []
+    for name in sorted(set(baseline) - set(results)):
+        # Only entries of the selected suites; --only leaves the rest alone.
+        if any(name == suite or name.startswith(f"{suite}_") for suite in selected):
+            print(f"❌ {name}: in the baseline but not measured (suite skipped or failed)", file=sys.stderr)
+            regressions.append(name)
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if not base:
+            print(f"   {name}: no baseline", file=sys.stderr)
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        flag = "❌" if ratio > 1 + tolerance else "✅"
+        print(f"{flag} {name}: {result['median_s'] * 1e6:.2f}us vs {base['median_s'] * 1e6:.2f}us ({ratio:.2f}x)", file=sys.stderr)
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run hot-path benchmarks and compare against a stored baseline.")
+    parser.add_argument("--only", help="Comma-separated suites: " + ",".join(SUITES))
+    parser.add_argument("--repeat", type=int, default=5, help="Batches per benchmark (median is reported)")
+    parser.add_argument("--ticks", type=int, default=200_000, help="Tick stream length for the pipeline loop")
+    parser.add_argument("--ts-runner", default="npx ts-node --transpile-only", help="Command that runs a .ts file")
+    parser.add_argument("--standin-delay-ms", type=float, default=0.0, help="Artificial exchange latency for publish_e2e")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=float(os.getenv("BENCH_TOLERANCE", 0.25)),
+                        help="Allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else list(SUITES)
+    unknown = [s for s in selected if s not in SUITES]
+    if unknown:
+        print(f"❌ Unknown suite(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    results: Dict[str, dict] = {}
+    failed: List[str] = []
+    for suite in selected:
+        print(f"➡️  {suite}", file=sys.stderr)
+        try:
+            results.update(SUITES[suite](args))
+        except ImportError as e:
+            print(f"⚠️  {suite} skipped, missing dependency: {e}", file=sys.stderr)
+        except Exception as e:  # noqa: BLE001 - report every suite before failing
+            print(f"❌ {suite} failed: {e}", file=sys.stderr)
+            failed.append(suite)
+
+    report = {
+        "ts": int(time.time()),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpu": platform.processor()},
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if failed:
+        print(f"❌ {len(failed)} suite(s) failed: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        existing: Optional[dict] = None
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+        merged = {**(existing or {}).get("results", {}), **results}  # --only updates just those entries
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**report, "results": merged}, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}", file=sys.stderr)
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline} (run with --save-baseline first)", file=sys.stderr)
+            sys.exit(1)
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        regressions = compare(results, baseline, args.tolerance, selected)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) regressed more than {args.tolerance:.0%} or are missing: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Check warmarket.precision.normalize_price against test/fixtures/precision.json.
+
+The same fixture is checked against src/precision.ts formatPerpPrice by
+scripts/regression.ts, so the Python scripts and the service produce the same
+wire string for every price. Run with `npm run precision`.
+
+Usage:
+    python3 scripts/check-precision.py [fixture.json]
+"""
+
+import json
+import os
+import sys
+
+from warmarket.precision import AssetRules, PrecisionError, normalize_price
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test", "fixtures", "precision.json")
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FIXTURE
+    with open(path, "r", encoding="utf-8") as f:
+        fixtures = json.load(f)
+
+    failures = []
+    for idx, case in enumerate(fixtures):
+        label = f"Precision {idx} ({case['price']}, szDecimals {case['szDecimals']})"
+        try:
+            got = normalize_price(case["price"], AssetRules(case["szDecimals"]))
+        except PrecisionError as e:
+            if not case.get("error"):
+                failures.append(f"{label} raised: {e}")
+            continue
+        if case.get("error"):
+            failures.append(f"{label} expected an error, got {got}")
+        elif got != case["expected"]:
+            failures.append(f"{label} expected {case['expected']} got {got}")
+
+    if failures:
+        print(f"❌ Precision check failed ({len(failures)} issues):", file=sys.stderr)
+        for failure in failures:
+            print(f" - {failure}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ Precision fixtures passed ({len(fixtures)} cases)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,23 +5,41 @@ Register an additional HIP-3 asset on an existing perp DEX.
 Usage:
     NETWORK=testnet python3 scripts/deploy-asset.py
 
+Bulk mode (every asset listed under "markets" in the builder manifest's dex.json;
+entry fields are documented in builder/README.md):
+    NETWORK=testnet python3 scripts/deploy-asset.py --manifest ../../builder/manifest.json --dry-run
+    NETWORK=testnet python3 scripts/deploy-asset.py --manifest ../../builder/manifest.json --gas-budget 2000000
+
 Assumes:
   - The DEX already exists (e.g. created via deploy-dex.py).
   - Single-wallet model: HL_MASTER_ADDRESS / HL_MASTER_PRIVATE_KEY.
+  - HL_API_URL (default: testnet) is used for both reads and registration.
   - HL_DEX_NAME is the existing DEX tag (e.g. "wa").
   - HL_COIN_SYMBOL is the NEW asset name (e.g. "ESV"), and the on-chain
     coin id will be "<dex>:<ASSET_NAME>" (e.g. "wa:ESV").
 """
 
+import argparse
 import os
 import sys
 import json
+import time
+from typing import List, Optional
+
 from dotenv import load_dotenv
 
+from warmarket import journal
+from warmarket.meta_cache import load_dex_meta, record_asset
+
 
 env_file = os.getenv("ENV_FILE", ".env.testnet")
 load_dotenv(env_file)
 
+# One endpoint for both the universe read and the Exchange, so bulk mode never
+# checks one network and registers on another. Defaults to the SDK's
+# constants.TESTNET_API_URL (the SDK is only imported once signing is needed).
+HL_API_URL = os.getenv("HL_API_URL") or "https://api.hyperliquid-testnet.xyz"
+
 
 def required(name: str) -> str:
     v = os.getenv(name)
@@ -31,11 +49,136 @@ def required(name: str) -> str:
     return v
 
 
+def load_manifest_markets(manifest_path: str) -> dict:
+    """Resolve builder/manifest.json -> dex.json and return the dex definition."""
+    if not os.path.exists(manifest_path):
+        print(f"❌ Manifest not found: {manifest_path}")
+        sys.exit(1)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    dex_path = os.path.join(os.path.dirname(os.path.abspath(manifest_path)), manifest.get("dex", "dex.json"))
+    with open(dex_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def current_auction_gas(info) -> Optional[float]:
+    status = info.query_perp_deploy_auction_status() or {}
+    gas = status.get("currentGas")
+    return float(gas) if gas is not None else None
+
+
+def bulk_register(args: argparse.Namespace) -> None:
+    """
+    Register every manifest asset that is not already on the dex.
+
+    Existing assets are skipped using a cached copy of the dex universe. The rest
+    are registered one after another from a single signer, checking the deploy
+    auction price before each so the total stays within --gas-budget.
+    """
+    dex_def = load_manifest_markets(args.manifest)
+    entries: List[dict] = dex_def.get("markets", [])
+    if not entries:
+        print("ℹ️  No markets listed in the manifest's dex.json; nothing to register.")
+        return
+
+    dex = (args.dex or dex_def.get("dex") or os.getenv("HL_DEX_NAME") or "").lower()
+    if not dex:
+        print("❌ Missing dex tag (--dex, \"dex\" in dex.json, or HL_DEX_NAME)")
+        sys.exit(1)
+
+    meta = load_dex_meta(HL_API_URL, dex, refresh=args.refresh_meta)
+    existing = {asset["name"] for asset in meta.get("universe", [])}
+
+    pending = []
+    for entry in entries:
+        coin = f"{dex}:{entry['asset'].upper()}"
+        if coin in existing:
+            print(f"⏭️  {coin} already registered, skipping")
+        else:
+            pending.append((coin, entry))
+
+    print(f"📋 {len(entries)} manifest asset(s), {len(pending)} to register on dex={dex}")
+    if not pending or args.dry_run:
+        for coin, entry in pending:
+            print(f"   would register {coin}: {json.dumps(entry)}")
+        return
+
+    try:
+        from eth_account import Account
+        from hyperliquid.exchange import Exchange
+    except ImportError as e:
+        print(f"❌ Missing dependency: {e}")
+        print("Install with: pip3 install hyperliquid-python-sdk python-dotenv eth-account")
+        sys.exit(1)
+
+    master_address = required("HL_MASTER_ADDRESS")
+    wallet = Account.from_key(required("HL_MASTER_PRIVATE_KEY"))
+    if wallet.address.lower() != master_address.lower():
+        print("❌ HL_MASTER_ADDRESS must match the address derived from HL_MASTER_PRIVATE_KEY.")
+        sys.exit(1)
+
+    exchange = Exchange(wallet=wallet, base_url=HL_API_URL)
+    journal.install(exchange, "deploy-asset")
+    default_max_gas = int(os.getenv("HL_MAX_GAS")) if os.getenv("HL_MAX_GAS", "").strip() else None
+    spent = 0.0
+    results = []
+
+    for idx, (coin, entry) in enumerate(pending, start=1):
+        max_gas = entry.get("maxGas", default_max_gas)
+        gas = current_auction_gas(exchange.info)
+        if gas is not None and args.gas_budget is not None and spent + gas > args.gas_budget:
+            print(f"⛽ Gas budget reached ({spent:.0f} spent, next costs {gas:.0f}); stopping before {coin}")
+            break
+        if gas is not None and max_gas is not None and gas > max_gas:
+            print(f"⛽ Auction gas {gas:.0f} exceeds maxGas {max_gas} for {coin}; stopping")
+            break
+
+        started = time.perf_counter()
+        try:
+            result = exchange.perp_deploy_register_asset(
+                dex=dex,
+                max_gas=max_gas,
+                coin=coin,
+                sz_decimals=int(entry.get("szDecimals", 2)),
+                oracle_px=str(entry.get("oraclePx", os.getenv("INITIAL_ORACLE_PRICE", "100.0"))),
+                margin_table_id=int(entry.get("marginTableId", 1)),
+                only_isolated=bool(entry.get("onlyIsolated", True)),
+                schema=None,
+            )
+        except Exception as e:
+            result = {"status": "err", "response": str(e)}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        ok = isinstance(result, dict) and result.get("status") == "ok"
+        if ok:
+            spent += gas or 0
+            record_asset(dex, {"name": coin, "szDecimals": int(entry.get("szDecimals", 2))})
+        results.append({"coin": coin, "ok": ok, "gas": gas, "ms": round(elapsed_ms, 1), "response": result})
+        print(f"{'✅' if ok else '❌'} [{idx}/{len(pending)}] {coin} in {elapsed_ms:.0f}ms (gas={gas}): {json.dumps(result)}")
+        if not ok:
+            break
+
+    print(json.dumps({"dex": dex, "registered": sum(r["ok"] for r in results), "gasSpent": spent, "results": results}))
+    if any(not r["ok"] for r in results):
+        sys.exit(1)
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Register additional HIP-3 assets on an existing dex.")
+    parser.add_argument("--manifest", help="Builder manifest (e.g. ../../builder/manifest.json) for bulk mode")
+    parser.add_argument("--dex", help="Dex tag for bulk mode (default: dex.json \"dex\" or HL_DEX_NAME)")
+    parser.add_argument("--gas-budget", type=float, help="Stop once total auction gas would exceed this")
+    parser.add_argument("--refresh-meta", action="store_true", help="Ignore the cached dex universe")
+    parser.add_argument("--dry-run", action="store_true", help="Show what bulk mode would register")
+    args = parser.parse_args()
+
+    if args.manifest:
+        bulk_register(args)
+        return
+
     try:
         from eth_account import Account
         from hyperliquid.exchange import Exchange
-        from hyperliquid.utils import constants
     except ImportError as e:
         print(f"❌ Missing dependency: {e}")
         print("Install with: pip3 install hyperliquid-python-sdk python-dotenv eth-account")
@@ -73,8 +216,9 @@ def main() -> None:
 
     exchange = Exchange(
         wallet=wallet,
-        base_url=constants.TESTNET_API_URL,
+        base_url=HL_API_URL,
     )
+    journal.install(exchange, "deploy-asset")
 
     print("✅ Exchange client:")
     print(f"   base_url:        {exchange.base_url}")
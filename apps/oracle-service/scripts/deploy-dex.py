@@ -16,6 +16,8 @@ import sys
 import json
 from dotenv import load_dotenv
 
+from warmarket import journal
+
 
 # Load environment (.env.testnet by default)
 env_file = os.getenv("ENV_FILE", ".env.testnet")
@@ -82,6 +84,7 @@ def main() -> None:
         wallet=wallet,
         base_url=constants.TESTNET_API_URL,
     )
+    journal.install(exchange, "deploy-dex")
 
     print("✅ Exchange client:")
     print(f"   base_url:        {exchange.base_url}")
@@ -30,6 +30,8 @@ import time
 
 from dotenv import load_dotenv
 
+from warmarket import journal
+
 
 env_file = os.getenv("ENV_FILE", ".env.testnet")
 load_dotenv(env_file)
@@ -131,15 +133,21 @@ def main() -> None:
     print(json.dumps(payload, indent=2))
     print()
 
-    resp = requests.post(
-        f"{base_url}/exchange",
-        json=payload,
-        headers={"Content-Type": "application/json"},
-        timeout=15,
-    )
-
-    print(f"📥 HTTP {resp.status_code}")
-    print(resp.text)
+    def post(url_path: str, body: dict):
+        resp = requests.post(
+            f"{base_url}{url_path}",
+            json=body,
+            headers={"Content-Type": "application/json"},
+            timeout=15,
+        )
+        print(f"📥 HTTP {resp.status_code}")
+        print(resp.text)
+        try:
+            return resp.json()
+        except ValueError:
+            return resp.text
+
+    journal.wrap_post(post, "deploy-register2")("/exchange", payload)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Poll /health on every oracle-service instance concurrently and cross-check the
+reported index against the on-chain oracle price.
+
+Each instance is polled by its own task over one shared keep-alive session, so
+a slow or dead instance never delays the rest. On-chain oracle prices are read
+once per dex per interval via `metaAndAssetCtxs` and shared by all instances.
+
+Usage:
+    python3 scripts/fleet-health.py --instances fleet.json
+    python3 scripts/fleet-health.py --url http://localhost:4000 --url http://localhost:4001 --once
+
+fleet.json is a list of URLs or {"name": ..., "url": ...} objects.
+
+Output:
+  - stdout: one compact JSON snapshot per interval
+  - stderr (or --alerts FILE): one JSON line per alert transition (raised / cleared)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, TextIO
+
+from dotenv import load_dotenv
+
+
+@dataclass
+class Instance:
+    name: str
+    url: str
+    health: Optional[dict] = None
+    error: Optional[str] = None
+    latency_ms: Optional[float] = None
+    polled_at: float = 0.0
+
+
+@dataclass
+class FleetState:
+    instances: List[Instance]
+    oracle_pxs: Dict[str, float] = field(default_factory=dict)  # coin -> on-chain oracle px
+    oracle_error: Optional[str] = None
+    active_alerts: Dict[str, dict] = field(default_factory=dict)
+
+
+def load_instances(path: Optional[str], urls: List[str]) -> List[Instance]:
+    entries: list = list(urls)
+    if path:
+        if not os.path.exists(path):
+            print(f"❌ Instances file not found: {path}", file=sys.stderr)
+            sys.exit(1)
+        with open(path, "r", encoding="utf-8") as f:
+            entries.extend(json.load(f))
+
+    instances = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"url": entry}
+        url = entry["url"].rstrip("/")
+        instances.append(Instance(name=entry.get("name", url), url=url))
+
+    if not instances:
+        print("❌ No instances configured (use --instances or --url)", file=sys.stderr)
+        sys.exit(1)
+    return instances
+
+
+async def poll_instance(session, inst: Instance, interval: float, timeout: float, stop: asyncio.Event) -> None:
+    import aiohttp
+
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            async with session.get(f"{inst.url}/health", timeout=client_timeout) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"HTTP {resp.status}")
+                inst.health = await resp.json()
+                inst.error = None
+        except Exception as e:  # noqa: BLE001 - any failure marks the instance down
+            inst.error = str(e) or type(e).__name__
+        inst.latency_ms = (time.monotonic() - started) * 1000
+        inst.polled_at = time.time()
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def dexes_in_fleet(state: FleetState) -> List[str]:
+    dexes = set()
+    for inst in state.instances:
+        for market in (inst.health or {}).get("markets") or []:
+            coin = market.get("market") or ""
+            if ":" in coin:
+                dexes.add(coin.split(":", 1)[0])
+    return sorted(dexes)
+
+
+async def fetch_dex_oracles(session, info_url: str, dex: str, timeout: float) -> Dict[str, float]:
+    import aiohttp
+
+    async with session.post(
+        info_url,
+        json={"type": "metaAndAssetCtxs", "dex": dex},
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"info HTTP {resp.status}")
+        meta, ctxs = await resp.json()
+
+    pxs = {}
+    for asset, ctx in zip(meta.get("universe", []), ctxs):
+        oracle_px = ctx.get("oraclePx")
+        if oracle_px is not None:
+            pxs[asset["name"]] = float(oracle_px)
+    return pxs
+
+
+async def poll_oracles(session, state: FleetState, info_url: str, interval: float, timeout: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.monotonic()
+        dexes = dexes_in_fleet(state)
+        results = await asyncio.gather(
+            *(fetch_dex_oracles(session, info_url, dex, timeout) for dex in dexes),
+            return_exceptions=True,
+        )
+        errors = []
+        for dex, result in zip(dexes, results):
+            if isinstance(result, Exception):
+                errors.append(f"{dex}: {result}")
+            else:
+                state.oracle_pxs.update(result)
+        state.oracle_error = "; ".join(errors) or None
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def build_snapshot(state: FleetState, max_divergence_bps: float) -> tuple:
+    now = time.time()
+    rows = []
+    alerts: Dict[str, dict] = {}
+
+    for inst in state.instances:
+        if inst.error or inst.health is None:
+            error = inst.error or "no response yet"
+            alerts[f"{inst.name}:down"] = {"instance": inst.name, "kind": "down", "detail": error}
+            rows.append({"i": inst.name, "up": False, "err": error, "ms": round(inst.latency_ms or 0, 1)})
+            continue
+
+        # Pre-sharding instances only report the top-level fields.
+        markets = inst.health.get("markets") or [{
+            "market": None,
+            "lastPrice": inst.health.get("lastPrice"),
+            "lastUpdate": inst.health.get("lastUpdate"),
+            "stale": inst.health.get("stale"),
+            "publishes": inst.health.get("publishes"),
+            "error": inst.health.get("error"),
+        }]
+        for m in markets:
+            coin = m.get("market")
+            px = m.get("lastPrice")
+            oracle = state.oracle_pxs.get(coin) if coin else None
+            div_bps = abs(px - oracle) / oracle * 10000 if px and oracle else None
+            key = f"{inst.name}:{coin}"
+
+            if m.get("stale"):
+                alerts[f"{key}:stale"] = {"instance": inst.name, "market": coin, "kind": "stale", "detail": m.get("error")}
+            elif m.get("error"):
+                alerts[f"{key}:error"] = {"instance": inst.name, "market": coin, "kind": "error", "detail": m.get("error")}
+            if div_bps is not None and div_bps > max_divergence_bps:
+                alerts[f"{key}:divergence"] = {
+                    "instance": inst.name,
+                    "market": coin,
+                    "kind": "divergence",
+                    "detail": f"{div_bps:.1f}bps (index={px}, oracle={oracle})",
+                }
+
+            rows.append({
+                "i": inst.name,
+                "up": True,
+                "m": coin,
+                "px": px,
+                "oracle": oracle,
+                "divBps": None if div_bps is None else round(div_bps, 2),
+                "stale": m.get("stale"),
+                "pub": m.get("publishes"),
+                "err": m.get("error"),
+                "ms": round(inst.latency_ms or 0, 1),
+            })
+
+    if state.oracle_error:
+        alerts["oracle:fetch"] = {"kind": "oracle_fetch", "detail": state.oracle_error}
+
+    snapshot = {
+        "ts": round(now, 3),
+        "instances": len(state.instances),
+        "up": sum(1 for inst in state.instances if not inst.error and inst.health is not None),
+        "alerts": len(alerts),
+        "markets": rows,
+    }
+    return snapshot, alerts
+
+
+def emit_alert_transitions(state: FleetState, alerts: Dict[str, dict], out: TextIO) -> None:
+    now = round(time.time(), 3)
+    for key, alert in alerts.items():
+        if key not in state.active_alerts:
+            out.write(json.dumps({"ts": now, "state": "raised", **alert}, separators=(",", ":")) + "\n")
+    for key, alert in state.active_alerts.items():
+        if key not in alerts:
+            out.write(json.dumps({"ts": now, "state": "cleared", **alert}, separators=(",", ":")) + "\n")
+    out.flush()
+    state.active_alerts = alerts
+
+
+async def run(args: argparse.Namespace) -> None:
+    try:
+        import aiohttp
+    except ImportError as e:
+        print(f"❌ Missing dependency: {e}", file=sys.stderr)
+        print("   Install with: pip3 install aiohttp python-dotenv", file=sys.stderr)
+        sys.exit(1)
+
+    state = FleetState(instances=load_instances(args.instances, args.url))
+    info_url = f"{os.getenv('HL_TESTNET_URL', 'https://api.hyperliquid-testnet.xyz').rstrip('/')}/info"
+    alert_out = open(args.alerts, "a", encoding="utf-8") if args.alerts else sys.stderr
+    stop = asyncio.Event()
+
+    connector = aiohttp.TCPConnector(limit=args.max_connections, limit_per_host=4, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [
+            asyncio.create_task(poll_instance(session, inst, args.interval, args.timeout, stop))
+            for inst in state.instances
+        ]
+        tasks.append(asyncio.create_task(poll_oracles(session, state, info_url, args.interval, args.timeout, stop)))
+
+        try:
+            # First poll needs the health to know which dexes to query; give it one timeout.
+            await asyncio.sleep(args.timeout if args.once else args.interval)
+            while True:
+                snapshot, alerts = build_snapshot(state, args.max_divergence_bps)
+                print(json.dumps(snapshot, separators=(",", ":")), flush=True)
+                emit_alert_transitions(state, alerts, alert_out)
+                if args.once:
+                    break
+                await asyncio.sleep(args.interval)
+        finally:
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if alert_out is not sys.stderr:
+                alert_out.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent health poller for oracle-service instances.")
+    parser.add_argument("--instances", help="JSON file listing instance URLs")
+    parser.add_argument("--url", action="append", default=[], help="Instance base URL (repeatable)")
+    parser.add_argument("--interval", type=float, default=0.5, help="Poll interval in seconds (default 0.5)")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Per-request timeout in seconds (default 2)")
+    parser.add_argument("--max-divergence-bps", type=float, default=50.0, help="Alert when index vs on-chain oracle exceeds this")
+    parser.add_argument("--max-connections", type=int, default=256, help="Connection pool size")
+    parser.add_argument("--alerts", help="Append alert lines to this file instead of stderr")
+    parser.add_argument("--once", action="store_true", help="Print one snapshot and exit")
+    args = parser.parse_args()
+
+    env_file = os.getenv("ENV_FILE", ".env.testnet")
+    load_dotenv(env_file)
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,8 @@ import sys
 
 from dotenv import load_dotenv
 
+from warmarket import journal, ws_post
+
 
 def main() -> None:
     # Load env (same convention as other scripts)
@@ -84,6 +86,8 @@ def main() -> None:
     # Wallet / exchange client
     api_wallet = eth_account.Account.from_key(hl_master_private_key)
     exchange = Exchange(api_wallet, constants.TESTNET_API_URL)
+    ws_post.install(exchange)
+    journal.install(exchange, "halt-trading")
 
     # Optional sanity check (same pattern as set-oracle.py)
     EXPECTED_API_ADDRESS = "0x47515db2eab01758c740ab220352a34b8d5a3826"
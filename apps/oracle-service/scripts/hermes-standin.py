@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Local Hermes-compatible price server with synthetic feeds, for load-testing the
+ingest path (fetchPythPrice, pipeline, Python tooling) far above production rates.
+
+Serves:
+  GET /api/latest_price_feeds?ids[]=...       (what src/services/pyth.ts calls)
+  GET /api/price_feeds_metadata?search=...    (what src/services/pyth-metadata.ts calls)
+  GET /v2/updates/price/latest?ids[]=...      (Hermes v2 {binary, parsed}; binary.data is empty)
+  GET /v2/updates/price/stream?ids[]=...      (SSE stream of the same v2 payloads)
+
+All feeds advance together each tick as one NumPy step (GBM, optionally with
+Poisson jumps), so thousands of feeds cost a few vector ops per tick.
+
+Usage:
+    python3 scripts/hermes-standin.py --feeds 5000 --tick-hz 20 --port 8787
+    python3 scripts/hermes-standin.py --feeds 10 --model jump --outlier-prob 0.001 --stale-fraction 0.05
+    python3 scripts/hermes-standin.py --replay ticks.csv --speed 50
+    python3 scripts/hermes-standin.py --feeds 3 --print-ids
+
+Point the service at it with PYTH_API_URL=http://localhost:8787/api.
+
+Replay CSV header: `timestamp,price[,feed_id][,conf]` (timestamp in ms, conf in
+price units). A replay serves exactly the feed ids found in the CSV (each
+starting at its first recorded price); rows without feed_id drive one synthetic
+feed (feed_id(0)). Rows without conf fall back to --conf-bps. Replay time is
+compressed by --speed; --feeds is ignored.
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+def feed_id(index: int) -> str:
+    return hashlib.sha256(f"warmarket-synthetic-{index}".encode()).hexdigest()
+
+
+class SyntheticFeeds:
+    """Vectorised price state for every feed; one step() advances all of them."""
+
+    def __init__(self, args: argparse.Namespace, ids: Optional[List[str]] = None):
+        import numpy as np
+
+        self.np = np
+        self.rng = np.random.default_rng(args.seed)
+        self.ids: List[str] = ids if ids is not None else [feed_id(i) for i in range(args.feeds)]
+        n = len(self.ids)
+        self.index: Dict[str, int] = {fid: i for i, fid in enumerate(self.ids)}
+        self.model = args.model
+        self.sigma = args.vol
+        self.mu = args.drift
+        self.jump_intensity = args.jump_intensity
+        self.jump_sigma = args.jump_size
+        self.outlier_prob = args.outlier_prob
+        self.outlier_size = args.outlier_size
+
+        self.prices = np.full(n, args.start_price, dtype=np.float64) * self.rng.uniform(0.5, 1.5, n)
+        self.expos = np.full(n, args.expo, dtype=np.int64)
+        self.conf_bps = args.conf_bps
+        self.conf_override = np.full(n, np.nan)  # replayed conf in price units; NaN = use conf_bps
+        self.published = self.prices.copy()
+        self.publish_time = np.full(n, int(time.time()), dtype=np.int64)
+
+        # Feeds in the stale set keep reporting an old publish_time.
+        stale_count = int(round(n * args.stale_fraction))
+        self.stale_mask = np.zeros(n, dtype=bool)
+        if stale_count:
+            self.stale_mask[self.rng.choice(n, stale_count, replace=False)] = True
+        self.stale_lag_s = args.stale_lag
+
+        self.tick = 0
+        self._cache: Dict[int, tuple] = {}  # feed index -> (tick, serialized entry)
+
+    def step(self, dt_s: float) -> None:
+        np = self.np
+        n = self.prices.size
+        dt = dt_s / SECONDS_PER_YEAR
+        log_ret = (self.mu - 0.5 * self.sigma ** 2) * dt + self.sigma * np.sqrt(dt) * self.rng.standard_normal(n)
+        if self.model == "jump":
+            jumps = self.rng.poisson(self.jump_intensity * dt, n)
+            log_ret += jumps * self.rng.normal(0.0, self.jump_sigma, n)
+        self.prices *= np.exp(log_ret)
+
+        self.published = self.prices.copy()
+        if self.outlier_prob > 0:
+            hit = self.rng.random(n) < self.outlier_prob
+            if hit.any():
+                signs = np.where(self.rng.random(hit.sum()) < 0.5, -1.0, 1.0)
+                self.published[hit] *= 1.0 + signs * self.outlier_size
+
+        now = int(time.time())
+        self.publish_time[:] = now
+        self.publish_time[self.stale_mask] = now - self.stale_lag_s
+        self.tick += 1
+
+    def set_price(self, index: int, price: float, conf: Optional[float] = None) -> None:
+        self.prices[index] = price
+        self.published[index] = price
+        self.conf_override[index] = self.np.nan if conf is None else conf
+        self.publish_time[index] = int(time.time())
+        self.tick += 1
+        self._cache.pop(index, None)
+
+    def entry(self, index: int) -> str:
+        cached = self._cache.get(index)
+        if cached and cached[0] == self.tick:
+            return cached[1]
+        expo = int(self.expos[index])
+        scale = 10.0 ** -expo
+        price = int(round(self.published[index] * scale))
+        conf_px = self.conf_override[index]
+        if self.np.isnan(conf_px):
+            conf_px = self.published[index] * self.conf_bps / 10000
+        conf = int(round(conf_px * scale))
+        ema = int(round(self.prices[index] * scale))
+        ts = int(self.publish_time[index])
+        body = json.dumps({
+            "id": self.ids[index],
+            "price": {"price": str(price), "conf": str(conf), "expo": expo, "publish_time": ts},
+            "ema_price": {"price": str(ema), "conf": str(conf), "expo": expo, "publish_time": ts},
+        }, separators=(",", ":"))
+        self._cache[index] = (self.tick, body)
+        return body
+
+    def metadata(self, index: int) -> dict:
+        symbol = f"Synthetic.SYN{index}/USD"
+        return {
+            "id": self.ids[index],
+            "symbol": symbol,
+            "description": f"Synthetic feed {index} ({self.model})",
+            "attributes": {"symbol": symbol, "asset_type": "Synthetic", "quote_currency": "USD"},
+        }
+
+
+def requested_indices(feeds: SyntheticFeeds, request) -> List[int]:
+    ids = request.query.getall("ids[]", [])
+    return [feeds.index[i.lower().removeprefix("0x")] for i in ids if i.lower().removeprefix("0x") in feeds.index]
+
+
+async def run_generator(feeds: SyntheticFeeds, tick_hz: float, new_tick: asyncio.Condition) -> None:
+    interval = 1.0 / tick_hz
+    last = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        feeds.step(now - last)
+        last = now
+        async with new_tick:
+            new_tick.notify_all()
+
+
+def replay_feed_id(row: dict) -> str:
+    return (row.get("feed_id") or "").lower().removeprefix("0x") or feed_id(0)
+
+
+def load_replay(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def replay_feeds(args: argparse.Namespace, rows: List[dict]) -> SyntheticFeeds:
+    """Feeds for exactly the ids in the CSV, each starting at its first recorded price."""
+    first: Dict[str, float] = {}
+    for row in rows:
+        first.setdefault(replay_feed_id(row), float(row["price"]))
+    feeds = SyntheticFeeds(args, list(first))
+    for index, price in enumerate(first.values()):
+        feeds.set_price(index, price)
+    return feeds
+
+
+async def run_replay(feeds: SyntheticFeeds, rows: List[dict], speed: float, new_tick: asyncio.Condition) -> None:
+    if not rows:
+        return
+    first_ts = float(rows[0]["timestamp"])
+    started = time.monotonic()
+    for row in rows:
+        due = (float(row["timestamp"]) - first_ts) / 1000 / speed
+        delay = due - (time.monotonic() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        index = feeds.index[replay_feed_id(row)]
+        conf = row.get("conf")
+        feeds.set_price(index, float(row["price"]), float(conf) if conf not in (None, "") else None)
+        async with new_tick:
+            new_tick.notify_all()
+    print(f"✅ Replay of {len(rows)} rows finished", file=sys.stderr)
+
+
+def v2_payload(feeds: SyntheticFeeds, indices: List[int]) -> str:
+    """Hermes v2 update body. There is no signed VAA to serve, so binary.data is empty."""
+    parsed = ",".join(feeds.entry(i) for i in indices)
+    return f'{{"binary":{{"encoding":"hex","data":[]}},"parsed":[{parsed}]}}'
+
+
+def build_app(feeds: SyntheticFeeds, new_tick: asyncio.Condition, stats: dict):
+    from aiohttp import web
+
+    async def latest_price_feeds(request):
+        stats["latest"] += 1
+        indices = requested_indices(feeds, request)
+        body = "[" + ",".join(feeds.entry(i) for i in indices) + "]"
+        return web.Response(text=body, content_type="application/json")
+
+    async def latest_price_updates(request):
+        stats["latest"] += 1
+        return web.Response(text=v2_payload(feeds, requested_indices(feeds, request)), content_type="application/json")
+
+    async def price_feeds_metadata(request):
+        search = (request.query.get("search") or "").lower()
+        items = [feeds.metadata(i) for i in range(len(feeds.ids))]
+        if search:
+            items = [m for m in items if search in m["symbol"].lower()]
+        return web.json_response(items)
+
+    async def price_stream(request):
+        indices = requested_indices(feeds, request)
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+        stats["streams"] += 1
+        try:
+            while True:
+                async with new_tick:
+                    await new_tick.wait()
+                await resp.write(f"data: {v2_payload(feeds, indices)}\n\n".encode())
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            stats["streams"] -= 1
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/api/latest_price_feeds", latest_price_feeds)
+    app.router.add_get("/api/price_feeds_metadata", price_feeds_metadata)
+    app.router.add_get("/v2/updates/price/latest", latest_price_updates)
+    app.router.add_get("/v2/updates/price/stream", price_stream)
+    return app
+
+
+async def report(stats: dict, feeds: SyntheticFeeds, every_s: float) -> None:
+    last_requests, last_ticks = 0, 0
+    while True:
+        await asyncio.sleep(every_s)
+        requests_per_s = (stats["latest"] - last_requests) / every_s
+        ticks_per_s = (feeds.tick - last_ticks) / every_s
+        last_requests, last_ticks = stats["latest"], feeds.tick
+        print(
+            f"[hermes-standin] {requests_per_s:.0f} req/s, {ticks_per_s:.1f} ticks/s, {stats['streams']} stream(s)",
+            file=sys.stderr,
+        )
+
+
+async def serve(args: argparse.Namespace, feeds: SyntheticFeeds, rows: Optional[List[dict]] = None) -> None:
+    from aiohttp import web
+
+    new_tick = asyncio.Condition()
+    stats = {"latest": 0, "streams": 0}
+    runner = web.AppRunner(build_app(feeds, new_tick, stats))
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"✅ Hermes stand-in on http://{args.host}:{args.port}/api ({len(feeds.ids)} feeds)", file=sys.stderr)
+
+    tasks = [asyncio.create_task(report(stats, feeds, args.report_every))]
+    if args.replay:
+        tasks.append(asyncio.create_task(run_replay(feeds, rows or [], args.speed, new_tick)))
+    else:
+        tasks.append(asyncio.create_task(run_generator(feeds, args.tick_hz, new_tick)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic Hermes-compatible price server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--feeds", type=int, default=100, help="Number of synthetic feeds")
+    parser.add_argument("--tick-hz", type=float, default=10.0, help="Price updates per second (all feeds)")
+    parser.add_argument("--model", choices=["gbm", "jump"], default="gbm", help="GBM or Merton jump-diffusion")
+    parser.add_argument("--vol", type=float, default=0.4, help="Annualised volatility")
+    parser.add_argument("--drift", type=float, default=0.0, help="Annualised drift")
+    parser.add_argument("--jump-intensity", type=float, default=50.0, help="Jumps per year (jump model)")
+    parser.add_argument("--jump-size", type=float, default=0.05, help="Std dev of log jump size (jump model)")
+    parser.add_argument("--start-price", type=float, default=4000.0)
+    parser.add_argument("--expo", type=int, default=-8, help="Pyth exponent for all feeds")
+    parser.add_argument("--conf-bps", type=float, default=2.0, help="Reported confidence as bps of price")
+    parser.add_argument("--stale-fraction", type=float, default=0.0, help="Fraction of feeds with old publish_time")
+    parser.add_argument("--stale-lag", type=int, default=60, help="Seconds of publish_time lag for stale feeds")
+    parser.add_argument("--outlier-prob", type=float, default=0.0, help="Per-feed per-tick outlier probability")
+    parser.add_argument("--outlier-size", type=float, default=0.3, help="Outlier magnitude as a fraction of price")
+    parser.add_argument("--replay", help="CSV to replay instead of generating")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--report-every", type=float, default=5.0, help="Seconds between throughput reports")
+    parser.add_argument("--print-ids", action="store_true", help="Print feed ids as JSON and exit")
+    args = parser.parse_args()
+
+    if args.print_ids:
+        print(json.dumps([feed_id(i) for i in range(args.feeds)], indent=2))
+        return
+
+    try:
+        import numpy  # noqa: F401
+        import aiohttp  # noqa: F401
+    except ImportError as e:
+        print(f"❌ Missing dependency: {e}", file=sys.stderr)
+        print("   Install with: pip3 install numpy aiohttp", file=sys.stderr)
+        sys.exit(1)
+
+    if args.replay and not os.path.exists(args.replay):
+        print(f"❌ Replay file not found: {args.replay}", file=sys.stderr)
+        sys.exit(1)
+
+    rows = load_replay(args.replay) if args.replay else None
+    feeds = replay_feeds(args, rows) if rows is not None else SyntheticFeeds(args)
+    try:
+        asyncio.run(serve(args, feeds, rows))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Look up signed actions in the audit journal (including rotated .gz archives).
+
+Usage:
+    python3 scripts/journal-query.py --coin wa:GDR --since 2025-01-10T12:00
+    python3 scripts/journal-query.py --nonce 1736512345678
+    python3 scripts/journal-query.py --since 1736512000000 --until 1736515600000 --failed
+    python3 scripts/journal-query.py --type perpDeploy --summary
+
+Times are epoch milliseconds or ISO-8601 (UTC when no offset is given).
+Matching entries are printed as JSON lines on stdout.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from warmarket.journal import DEFAULT_PATH, read_entries
+
+
+def parse_time(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the signed-action audit journal.")
+    parser.add_argument("--journal", help="Journal path (default AUDIT_JOURNAL or journal/actions.jsonl)")
+    parser.add_argument("--coin", help="Coin id (e.g. wa:GDR) or numeric asset id")
+    parser.add_argument("--nonce", type=int)
+    parser.add_argument("--type", help="Action type (perpDeploy, order, cancel, ...)")
+    parser.add_argument("--since", help="Start time (epoch ms or ISO-8601)")
+    parser.add_argument("--until", help="End time (epoch ms or ISO-8601)")
+    parser.add_argument("--failed", action="store_true", help="Only actions that did not return status ok")
+    parser.add_argument("--summary", action="store_true", help="Print counts and latency percentiles instead of entries")
+    args = parser.parse_args()
+
+    env_file = os.getenv("ENV_FILE", ".env.testnet")
+    load_dotenv(env_file)
+    path = args.journal or os.getenv("AUDIT_JOURNAL", DEFAULT_PATH)
+
+    try:
+        since, until = parse_time(args.since), parse_time(args.until)
+    except ValueError as e:
+        print(f"❌ Invalid time: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    matched = []
+    for entry in read_entries(path):
+        if "nonce" not in entry:
+            continue  # dropped-entry markers
+        if args.nonce is not None and entry.get("nonce") != args.nonce:
+            continue
+        if args.coin and args.coin not in [str(c) for c in entry.get("coins") or []]:
+            continue
+        if args.type and entry.get("type") != args.type:
+            continue
+        if since is not None and entry.get("ts", 0) < since:
+            continue
+        if until is not None and entry.get("ts", 0) > until:
+            continue
+        if args.failed and entry.get("ok"):
+            continue
+        if args.summary:
+            matched.append(entry)
+        else:
+            print(json.dumps(entry, separators=(",", ":")))
+
+    if args.summary:
+        latencies = sorted(e["latencyMs"] for e in matched if e.get("latencyMs") is not None)
+
+        def pct(p: float) -> Optional[float]:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+        print(json.dumps({
+            "actions": len(matched),
+            "failed": sum(1 for e in matched if not e.get("ok")),
+            "latencyMs": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99), "max": latencies[-1] if latencies else None},
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 #!/usr/bin/env ts-node
 import * as fs from 'fs';
 import * as path from 'path';
-import { sanityCheckJump, scaleToIndex, shouldPublishValue } from '../src/pipeline';
+import {
+  applySmoothing,
+  createSmoothingState,
+  parseSmoothingMode,
+  sanityCheckJump,
+  scaleToIndex,
+  shouldPublishValue,
+} from '../src/pipeline';
+import { formatPerpPrice } from '../src/precision';
 
 type Fixture = {
   raw: number;
@@ -9,15 +17,47 @@ type Fixture = {
   expectPublish: boolean;
   expectSkipReason?: string;
   timestamp?: number;
+  conf?: number;
+};
+
+type PrecisionFixture = {
+  price: number;
+  szDecimals: number;
+  expected?: string;
+  error?: boolean;
 };
 
 const fixturePath =
   process.argv[2] ?? path.join(__dirname, '../test/fixtures/regression.json');
+// Shared with scripts/check-precision.py so both sides format prices identically.
+const precisionFixturePath = path.join(__dirname, '../test/fixtures/precision.json');
 
 const indexScale = Number(process.env.INDEX_SCALE ?? 40);
 const maxJumpFraction = Number(process.env.MAX_JUMP_FRACTION ?? 0.2);
 const priceChangeEpsilon = Number(process.env.PRICE_EPSILON ?? 0.01);
 const minPublishIntervalMs = Number(process.env.MIN_PUBLISH_INTERVAL_MS ?? 10000);
+const smoothingMode = parseSmoothingMode(process.env.SMOOTHING_MODE);
+const smoothingWindowMs = Number(process.env.SMOOTHING_WINDOW_MS ?? 15000);
+
+function checkPrecision(failures: string[]) {
+  const fixtures = JSON.parse(fs.readFileSync(precisionFixturePath, 'utf-8')) as PrecisionFixture[];
+  fixtures.forEach(({ price, szDecimals, expected, error }, idx) => {
+    let got: string;
+    try {
+      got = formatPerpPrice(price, szDecimals);
+    } catch (err) {
+      if (!error) {
+        failures.push(`Precision ${idx} (${price}, szDecimals ${szDecimals}) threw: ${err instanceof Error ? err.message : err}`);
+      }
+      return;
+    }
+    if (error) {
+      failures.push(`Precision ${idx} (${price}, szDecimals ${szDecimals}) expected an error, got ${got}`);
+    } else if (got !== expected) {
+      failures.push(`Precision ${idx} (${price}, szDecimals ${szDecimals}) expected ${expected} got ${got}`);
+    }
+  });
+}
 
 function main() {
   const content = fs.readFileSync(fixturePath, 'utf-8');
@@ -26,11 +66,15 @@ function main() {
   let lastPublishedValue: number | null = null;
   let lastPublishTimestamp = 0;
   let previousIndex: number | null = null;
+  let smoothing = createSmoothingState();
   const failures: string[] = [];
 
   fixtures.forEach((entry, idx) => {
     const now = entry.timestamp ?? idx * 3000;
-    const scaled = scaleToIndex(entry.raw, indexScale);
+    const rawIndex = scaleToIndex(entry.raw, indexScale);
+    const conf = entry.conf !== undefined ? scaleToIndex(entry.conf, indexScale) : undefined;
+    const smoothed = applySmoothing(smoothing, rawIndex, now, conf, smoothingMode, smoothingWindowMs);
+    const scaled = smoothed.value ?? rawIndex;
 
     if (Math.abs(scaled - entry.expected) > 1e-6) {
       failures.push(`Fixture ${idx} expected ${entry.expected} got ${scaled}`);
@@ -74,9 +118,12 @@ function main() {
     }
     if (jumpCheck.ok) {
       previousIndex = scaled;
+      smoothing = smoothed;
     }
   });
 
+  checkPrecision(failures);
+
   if (failures.length) {
     console.error(`❌ Regression failed (${failures.length} issues):`);
     failures.forEach((f) => console.error(` - ${f}`));
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Replay recorded ticks through the oracle pipeline (scale -> smooth -> jump check
+-> publish decision) without touching the network.
+
+Uses the same env file and variables as the oracle-service, so a replay shows
+what the service would have published with that configuration.
+
+Usage:
+    python3 scripts/replay-pipeline.py test/fixtures/regression.json
+    SMOOTHING_MODE=ema python3 scripts/replay-pipeline.py ticks.csv --verbose
+
+Input is either the regression fixture format (JSON list of {raw, timestamp, conf?})
+or a CSV with header `timestamp,raw[,conf]` (timestamp in ms).
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from warmarket.pipeline import (
+    PipelineConfig,
+    SmoothingState,
+    apply_smoothing,
+    sanity_check_jump,
+    scale_to_index,
+    should_publish_value,
+)
+
+
+def load_ticks(path: str) -> Iterator[Tuple[float, float, Optional[float]]]:
+    if not os.path.exists(path):
+        print(f"❌ Tick file not found: {path}", file=sys.stderr)
+        sys.exit(1)
+
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        for idx, entry in enumerate(entries):
+            conf = entry.get("conf")
+            yield float(entry.get("timestamp", idx * 3000)), float(entry["raw"]), None if conf is None else float(conf)
+        return
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            conf = row.get("conf")
+            yield float(row["timestamp"]), float(row["raw"]), float(conf) if conf else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay ticks through the oracle pipeline.")
+    parser.add_argument("ticks", help="Fixture JSON or CSV (timestamp,raw[,conf])")
+    parser.add_argument("--verbose", action="store_true", help="Print one line per tick")
+    args = parser.parse_args()
+
+    env_file = os.getenv("ENV_FILE", ".env.testnet")
+    load_dotenv(env_file)
+    cfg = PipelineConfig.from_env()
+
+    smoothing = SmoothingState()
+    previous_index: Optional[float] = None
+    last_published: Optional[float] = None
+    last_publish_ts = 0.0
+    ticks = publishes = jump_rejects = 0
+
+    for timestamp, raw, conf in load_ticks(args.ticks):
+        ticks += 1
+        raw_index = scale_to_index(raw, cfg.index_scale)
+        scaled_conf = scale_to_index(conf, cfg.index_scale) if conf is not None else None
+        smoothed = apply_smoothing(smoothing, raw_index, timestamp, scaled_conf, cfg.smoothing_mode, cfg.smoothing_window_ms)
+        value = smoothed.value if smoothed.value is not None else raw_index
+
+        ok, reason = sanity_check_jump(previous_index, value, cfg.max_jump_fraction)
+        publish = False
+        if ok:
+            publish, reason = should_publish_value(
+                value, last_published, last_publish_ts, timestamp, cfg.price_epsilon, cfg.min_publish_interval_ms
+            )
+            previous_index = value
+            smoothing = smoothed
+        else:
+            jump_rejects += 1
+
+        if publish:
+            publishes += 1
+            last_published = value
+            last_publish_ts = timestamp
+
+        if args.verbose:
+            action = "publish" if publish else f"skip ({reason})"
+            print(f"{int(timestamp):>14} raw={raw_index:.6f} value={value:.6f} {action}", file=sys.stderr)
+
+    print(json.dumps({
+        "ticks": ticks,
+        "publishes": publishes,
+        "jumpRejects": jump_rejects,
+        "smoothingMode": cfg.smoothing_mode,
+        "smoothingWindowMs": cfg.smoothing_window_ms,
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,9 @@ from typing import Dict, List
 
 from dotenv import load_dotenv
 
+from warmarket import journal, ws_post
+from warmarket.precision import DEFAULT_SZ_DECIMALS, AssetRules, PrecisionError, normalize_prices, normalize_size, rules_for
+
 
 def load_presets(path: str) -> Dict[str, dict]:
     if not os.path.exists(path):
@@ -26,19 +29,22 @@ def load_presets(path: str) -> Dict[str, dict]:
         return json.load(f)
 
 
-def generate_orders(config: dict) -> List[dict]:
+def generate_orders(config: dict, rules: AssetRules) -> List[dict]:
+    """Ladder of bid/ask pairs around mid, formatted to the asset's tick and lot size."""
+    import numpy as np
+
     mid = float(config["mid"])
     spread_bps = float(config.get("spread_bps", 25))
     step_bps = float(config.get("step_bps", 0))
     levels = int(config.get("levels", 1))
-    size = float(config["size"])
+
+    factors = (spread_bps + np.arange(levels) * step_bps) / 10000.0
+    bids = normalize_prices(mid * (1 - factors), rules)
+    asks = normalize_prices(mid * (1 + factors), rules)
+    size = normalize_size(float(config["size"]), rules)
 
     orders: List[dict] = []
-    for level in range(levels):
-        spread = spread_bps + level * step_bps
-        factor = spread / 10000.0
-        bid_px = round(mid * (1 - factor), 4)
-        ask_px = round(mid * (1 + factor), 4)
+    for bid_px, ask_px in zip(bids, asks):
         orders.append({"side": "buy", "price": bid_px, "size": size})
         orders.append({"side": "sell", "price": ask_px, "size": size})
     return orders
@@ -70,7 +76,18 @@ def main() -> None:
 
     preset = presets[key]
     coin = preset["coin"]
-    orders = generate_orders(preset)
+    # Dry runs stay offline: szDecimals from the preset (or HL_SZ_DECIMALS) instead of dex meta.
+    if args.dry_run or "szDecimals" in preset:
+        rules = AssetRules(int(preset.get("szDecimals", os.getenv("HL_SZ_DECIMALS", DEFAULT_SZ_DECIMALS))))
+    else:
+        from hyperliquid.utils import constants
+
+        rules = rules_for(constants.TESTNET_API_URL, coin.split(":", 1)[0], coin)
+    try:
+        orders = generate_orders(preset, rules)
+    except PrecisionError as e:
+        print(f"❌ Preset {key} produces invalid orders: {e}", file=sys.stderr)
+        sys.exit(1)
 
     print(f"✅ Using preset '{key}' for coin={coin}")
     print(f"   mid={preset['mid']}, spread_bps={preset.get('spread_bps', 25)}, levels={preset.get('levels', 1)}, size={preset['size']}")
@@ -101,6 +118,8 @@ def main() -> None:
 
     api_wallet = eth_account.Account.from_key(hl_master_private_key)
     exchange = Exchange(api_wallet, constants.TESTNET_API_URL)
+    ws_post.install(exchange)
+    journal.install(exchange, "seed-from-preset")
 
     order_type: OrderType = {"limit": {"tif": "Gtc"}}
 
@@ -112,8 +131,8 @@ def main() -> None:
             resp = exchange.order(
                 name=coin,
                 is_buy=is_buy,
-                sz=order["size"],
-                limit_px=order["price"],
+                sz=float(order["size"]),
+                limit_px=float(order["price"]),
                 order_type=order_type,
                 reduce_only=False,
             )
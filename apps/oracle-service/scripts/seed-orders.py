@@ -23,6 +23,8 @@ import json
 
 from dotenv import load_dotenv
 
+from warmarket import journal
+
 
 def main() -> None:
     env_file = os.getenv("ENV_FILE", ".env.testnet")
@@ -56,6 +58,7 @@ def main() -> None:
 
     api_wallet = eth_account.Account.from_key(hl_master_private_key)
     exchange = Exchange(api_wallet, constants.TESTNET_API_URL)
+    journal.install(exchange, "seed-orders")
 
     # Simple GTC limit
     order_type: OrderType = {"limit": {"tif": "Gtc"}}
@@ -5,17 +5,34 @@ Uses Python SDK's sign_l1_action (canonical implementation)
 
 Usage:
     NETWORK=testnet python3 scripts/set-oracle.py <price>
-    
-Or call from Node.js:
-    const { execSync } = require('child_process');
-    execSync(`python3 scripts/set-oracle.py ${price}`, { cwd: __dirname });
+    NETWORK=testnet python3 scripts/set-oracle.py --serve
+    python3 scripts/set-oracle.py --help
+
+One-shot mode signs and posts a single price for HL_DEX_NAME / HL_COIN_SYMBOL
+and prints one JSON result.
+
+--serve keeps one signer alive for the oracle service (src/services/signer.ts).
+Wallet, Exchange, WebSocket transport and journal are set up once, then each
+stdin line {"id", "dex", "coin", "price", "nonce"?} is signed and posted on a
+worker thread and answered with one JSON line on stdout carrying the same id.
+
+HL_API_URL overrides the exchange URL (default: testnet), e.g. to point the
+script at a local stand-in for scripts/bench.py. HL_EXPECTED_API_ADDRESS
+overrides the wallet address the key must derive to.
 """
 
 import os
 import sys
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from dotenv import load_dotenv
 
+from warmarket import journal, ws_post
+from warmarket.nonce import NonceStream
+from warmarket.precision import PrecisionError, normalize_price, rules_for
+
 # Load environment
 env_file = os.getenv('ENV_FILE', '.env.testnet')
 load_dotenv(env_file)
@@ -25,6 +42,7 @@ try:
     import eth_account
     from hyperliquid.exchange import Exchange
     from hyperliquid.utils import constants
+    from hyperliquid.utils.signing import sign_l1_action
 except ImportError:
     print("❌ Error: Hyperliquid Python SDK not installed")
     print("Install with: pip3 install hyperliquid-python-sdk python-dotenv")
@@ -39,116 +57,150 @@ HL_MASTER_PRIVATE_KEY = os.getenv('HL_MASTER_PRIVATE_KEY')  # Master wallet priv
 # - HL_COIN_SYMBOL: base asset name (e.g. "GDR")
 HL_DEX_NAME = os.getenv('HL_DEX_NAME', 'wa').lower()
 HL_ASSET_NAME = os.getenv('HL_COIN_SYMBOL', 'GDR').upper()
-# On-chain coin identifier matches deployment: "{dex}:{ASSET_NAME}"
-HL_COIN_ID = f"{HL_DEX_NAME}:{HL_ASSET_NAME}"
 
-if not HL_MASTER_PRIVATE_KEY:
-    print("❌ Error: Missing HL_MASTER_PRIVATE_KEY")
-    sys.exit(1)
+HL_API_URL = os.getenv('HL_API_URL') or constants.TESTNET_API_URL
+EXPECTED_API_ADDRESS = os.getenv('HL_EXPECTED_API_ADDRESS', "0x47515db2eab01758c740ab220352a34b8d5a3826")
 
-if not HL_MASTER_ADDRESS:
-    print("❌ Error: Missing HL_MASTER_ADDRESS")
-    sys.exit(1)
 
-# Get price from command line or stdin
-if len(sys.argv) > 1:
-    price = sys.argv[1]
-else:
-    price = sys.stdin.read().strip()
+class OracleSigner:
+    """Wallet, Exchange and transports set up once and reused for every price."""
 
-if not price:
-    print("❌ Error: No price provided")
-    sys.exit(1)
+    def __init__(self):
+        # Single-wallet model: builder/master wallet both signs and owns the account
+        self.wallet = eth_account.Account.from_key(HL_MASTER_PRIVATE_KEY)
+        if self.wallet.address.lower() != EXPECTED_API_ADDRESS.lower():
+            print(f"❌ Error: API wallet address mismatch", file=sys.stderr)
+            print(f"   Expected: {EXPECTED_API_ADDRESS}", file=sys.stderr)
+            print(f"   Got:      {self.wallet.address}", file=sys.stderr)
+            sys.exit(1)
 
-try:
-    price_float = float(price)
-    price_str = f"{price_float:.8f}".rstrip('0').rstrip('.')
-except ValueError:
-    print(f"❌ Error: Invalid price: {price}")
-    sys.exit(1)
+        self.exchange = Exchange(self.wallet, HL_API_URL)
+        self.nonces = NonceStream()  # concurrent requests in --serve must not share a millisecond
+        ws_post.install(self.exchange)  # HL_WS_POST=true sends /exchange over a WebSocket
+        journal.install(self.exchange, "set-oracle")
 
-def set_oracle(price: str):
-    """Set oracle price using Python SDK (canonical signing)."""
-    
-    # Initialize wallet and exchange
-    # Single-wallet model: builder/master wallet both signs and owns the account
-    api_wallet = eth_account.Account.from_key(HL_MASTER_PRIVATE_KEY)
-    exchange = Exchange(api_wallet, constants.TESTNET_API_URL)
-    
-    # Verify API wallet address
-    EXPECTED_API_ADDRESS = "0x47515db2eab01758c740ab220352a34b8d5a3826"
-    if api_wallet.address.lower() != EXPECTED_API_ADDRESS.lower():
-        print(f"❌ Error: API wallet address mismatch")
-        print(f"   Expected: {EXPECTED_API_ADDRESS}")
-        print(f"   Got:      {api_wallet.address}")
-        sys.exit(1)
-    
-    # Log to stderr so Node wrapper can safely parse stdout as pure JSON.
-    print(f"✅ API wallet (agent): {api_wallet.address}", file=sys.stderr)
-    print(f"✅ Master account: {HL_MASTER_ADDRESS}", file=sys.stderr)
-    
-    # Use SDK's sign_l1_action for canonical signing
-    from hyperliquid.utils.signing import sign_l1_action
-    from hyperliquid.exchange import get_timestamp_ms
-    
-    # Build setOracle action for this DEX + coin id
-    oracle_pxs_wire = sorted(list({HL_COIN_ID: price_str}.items()))
-    mark_pxs_wire = []
-    external_perp_pxs_wire = sorted(list({HL_COIN_ID: price_str}.items()))
-    
-    action = {
-        "type": "perpDeploy",
-        "setOracle": {
-            "dex": HL_DEX_NAME,
-            "oraclePxs": oracle_pxs_wire,
-            "markPxs": mark_pxs_wire,
-            "externalPerpPxs": external_perp_pxs_wire,
-        },
-    }
-    
-    # Sign WITHOUT a vaultAddress override – let HL infer from signer
-    timestamp = get_timestamp_ms()
-    signature = sign_l1_action(
-        api_wallet,
-        action,
-        None,                              # active_pool / vaultAddress override
-        timestamp,
-        exchange.expires_after,
-        exchange.base_url == constants.MAINNET_API_URL,
-    )
-    
-    # Post WITHOUT an explicit vaultAddress – HL will infer from signer
-    payload = {
-        "action": action,
-        "nonce": timestamp,
-        "signature": signature,
-        "expiresAfter": exchange.expires_after,
-    }
-    
-    try:
-        result = exchange.post("/exchange", payload)
-
-        # Output JSON for Node.js to parse (stdout must be JSON only).
-        print(json.dumps({
+        # Log to stderr so Node wrapper can safely parse stdout as pure JSON.
+        print(f"✅ API wallet (agent): {self.wallet.address}", file=sys.stderr)
+        print(f"✅ Master account: {HL_MASTER_ADDRESS}", file=sys.stderr)
+
+    def set_oracle(self, dex: str, coin: str, price: str, nonce: Optional[int] = None) -> dict:
+        """Sign and post one setOracle; returns the JSON result for the caller."""
+        coin_id = f"{dex}:{coin}"  # On-chain coin identifier matches deployment
+        try:
+            price_float = float(price)
+        except ValueError:
+            return {"ok": False, "error": f"Invalid price: {price}", "price": price}
+
+        # Round to the asset's tick (5 sig figs, 6 - szDecimals decimals) and refuse
+        # unrepresentable prices here rather than after signing.
+        try:
+            price_str = normalize_price(price_float, rules_for(HL_API_URL, dex, coin_id))
+        except PrecisionError as e:
+            return {"ok": False, "error": str(e), "price": price}
+
+        # Build setOracle action for this DEX + coin id
+        action = {
+            "type": "perpDeploy",
+            "setOracle": {
+                "dex": dex,
+                "oraclePxs": sorted(list({coin_id: price_str}.items())),
+                "markPxs": [],
+                "externalPerpPxs": sorted(list({coin_id: price_str}.items())),
+            },
+        }
+
+        # Sign WITHOUT a vaultAddress override – let HL infer from signer.
+        # A caller-supplied nonce lets a sharded publisher avoid collisions.
+        timestamp = nonce if nonce is not None else self.nonces.next()
+        signature = sign_l1_action(
+            self.wallet,
+            action,
+            None,                              # active_pool / vaultAddress override
+            timestamp,
+            self.exchange.expires_after,
+            self.exchange.base_url == constants.MAINNET_API_URL,
+        )
+
+        # Post WITHOUT an explicit vaultAddress – HL will infer from signer
+        payload = {
+            "action": action,
+            "nonce": timestamp,
+            "signature": signature,
+            "expiresAfter": self.exchange.expires_after,
+        }
+
+        try:
+            result = self.exchange.post("/exchange", payload)
+        except Exception as e:
+            return {"ok": False, "error": str(e), "price": price_str}
+        return {
             "ok": result.get("status") == "ok",
             "status": result.get("status"),
             "response": result.get("response"),
             "price": price_str,
-        }))
-        
-        if result.get('status') == 'ok':
-            sys.exit(0)
-        else:
-            sys.exit(1)
-            
-    except Exception as e:
-        print(json.dumps({
-            "ok": False,
-            "error": str(e),
-            "price": price_str,
-        }))
+        }
+
+
+def serve(signer: OracleSigner) -> None:
+    """Answer JSON-line requests on stdin until it closes."""
+    write_lock = threading.Lock()
+
+    def handle(request: dict) -> None:
+        try:
+            result = signer.set_oracle(
+                request["dex"].lower(), request["coin"].upper(), str(request["price"]), request.get("nonce")
+            )
+        except Exception as e:  # noqa: BLE001 - one bad request must not kill the signer
+            result = {"ok": False, "error": str(e), "price": request.get("price")}
+        result["id"] = request.get("id")
+        with write_lock:
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=int(os.getenv("SIGNER_THREADS", "8"))) as pool:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                print(f"⚠️  signer: ignoring malformed request: {line[:200]}", file=sys.stderr)
+                continue
+            pool.submit(handle, request)
+
+
+def main() -> None:
+    if sys.argv[1:2] in (["-h"], ["--help"]):
+        print(__doc__.strip())
+        return
+
+    if not HL_MASTER_PRIVATE_KEY:
+        print("❌ Error: Missing HL_MASTER_PRIVATE_KEY")
         sys.exit(1)
 
-if __name__ == '__main__':
-    set_oracle(price_str)
+    if not HL_MASTER_ADDRESS:
+        print("❌ Error: Missing HL_MASTER_ADDRESS")
+        sys.exit(1)
+
+    if "--serve" in sys.argv[1:]:
+        serve(OracleSigner())
+        return
+
+    # Get price from command line or stdin
+    price = sys.argv[1] if len(sys.argv) > 1 else sys.stdin.read().strip()
+    if not price:
+        print("❌ Error: No price provided")
+        sys.exit(1)
 
+    # HL_NONCE lets a sharded publisher hand out non-colliding nonces per shard.
+    nonce_env = os.getenv('HL_NONCE', '').strip()
+    result = OracleSigner().set_oracle(HL_DEX_NAME, HL_ASSET_NAME, price, int(nonce_env) if nonce_env else None)
+
+    # Output JSON for Node.js to parse (stdout must be JSON only).
+    print(json.dumps(result))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the WAR.MARKET oracle scripts.
+
+Scripts run as `python3 scripts/<name>.py`, which puts `scripts/` on sys.path,
+so they can `from warmarket import ...` without installing anything.
+"""
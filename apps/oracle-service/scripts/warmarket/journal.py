@@ -0,0 +1,255 @@
+"""
+Append-only JSON-lines journal of every signed `/exchange` action and its outcome.
+
+`install(exchange, script)` wraps `exchange.post` so each signed payload is
+recorded with its nonce, latency and response; scripts that sign and post
+without an `Exchange` wrap their own post function with `wrap_post`. The
+signing path only does a `put_nowait` onto a bounded queue; a background
+thread derives the coin list and action hash, writes batches under an flock
+(several scripts may share one journal) and rotates the file into gzip archives
+once it passes the size limit. If the queue is full the entry is dropped and
+counted rather than blocking.
+
+Env:
+  AUDIT_JOURNAL            journal path (default journal/actions.jsonl; "off" disables)
+  AUDIT_JOURNAL_MAX_BYTES  rotate past this size (default 10 MiB)
+  AUDIT_JOURNAL_BACKUPS    gzip archives to keep (default 5)
+
+Query with scripts/journal-query.py.
+"""
+
+import atexit
+import fcntl
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional
+
+# apps/oracle-service/journal (git-ignored)
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "journal", "actions.jsonl"
+)
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+
+_STOP = object()
+
+
+class Journal:
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        queue_size: int = 10000,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="audit-journal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, entry: dict) -> None:
+        """Queue an entry; never blocks the caller."""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # --- writer thread -----------------------------------------------------
+
+    def _run(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            lines = []
+            for item in batch:
+                if item is _STOP:
+                    continue
+                try:
+                    lines.append(json.dumps(_enrich(item), separators=(",", ":"), default=str))
+                except Exception as e:  # noqa: BLE001 - a bad entry must not kill the writer
+                    print(f"⚠️  audit journal: dropped entry ({e})", file=sys.stderr)
+            if self.dropped:
+                lines.append(json.dumps({"ts": _now_ms(), "dropped": self.dropped}))
+                self.dropped = 0
+            if lines:
+                try:
+                    self._write(lines)
+                except OSError as e:
+                    print(f"⚠️  audit journal: write failed ({e})", file=sys.stderr)
+            if stop:
+                return
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                if f.tell() >= self.max_bytes:
+                    self._rotate()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _rotate(self) -> None:
+        for n in range(self.backups - 1, 0, -1):
+            src = archive_path(self.path, n)
+            if os.path.exists(src):
+                os.replace(src, archive_path(self.path, n + 1))
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        with open(self.path, "rb") as src, gzip.open(archive_path(self.path, 1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        # Truncate rather than unlink so other writers holding the path keep appending here.
+        os.truncate(self.path, 0)
+
+
+def archive_path(path: str, n: int) -> str:
+    base, ext = os.path.splitext(path)
+    return f"{base}.{n}{ext}.gz"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _coins(action: dict) -> List[Any]:
+    kind = action.get("type")
+    if kind == "perpDeploy":
+        body = next((v for k, v in action.items() if k != "type"), {})
+        if isinstance(body, dict):
+            if "oraclePxs" in body:
+                return [coin for coin, _ in body["oraclePxs"]]
+            if "coin" in body:
+                return [body["coin"]]
+            if "assetRequest" in body:
+                return [body["assetRequest"].get("coin")]
+        return []
+    if kind == "order":
+        return sorted({o.get("a") for o in action.get("orders", [])}, key=str)
+    if kind in ("cancel", "cancelByCloid"):
+        return sorted({c.get("a", c.get("asset")) for c in action.get("cancels", [])}, key=str)
+    return []
+
+
+def _enrich(item: dict) -> dict:
+    """Turn a raw (payload, response) record into a journal line. Runs on the writer thread."""
+    payload = item.pop("payload", None) or {}
+    action = payload.get("action") or {}
+    nonce = payload.get("nonce")
+    entry = {
+        "ts": item.pop("ts"),
+        "script": item.pop("script", None),
+        "type": action.get("type"),
+        "op": next((k for k in action if k != "type"), None) if action.get("type") == "perpDeploy" else None,
+        "coins": _coins(action),
+        "nonce": nonce,
+    }
+    try:
+        from hyperliquid.utils.signing import action_hash
+
+        entry["hash"] = "0x" + action_hash(action, payload.get("vaultAddress"), nonce, payload.get("expiresAfter")).hex()
+    except Exception:  # noqa: BLE001 - hashing is best effort
+        entry["hash"] = None
+    entry["action"] = action
+    entry.update(item)
+    return entry
+
+
+def journal_from_env() -> Optional[Journal]:
+    path = os.getenv("AUDIT_JOURNAL", DEFAULT_PATH).strip()
+    if not path or path.lower() == "off":
+        return None
+    return Journal(
+        path,
+        max_bytes=int(os.getenv("AUDIT_JOURNAL_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        backups=int(os.getenv("AUDIT_JOURNAL_BACKUPS", DEFAULT_BACKUPS)),
+    )
+
+
+def install(exchange, script: str) -> Optional[Journal]:
+    """Journal every `exchange.post("/exchange", ...)` made through this client."""
+    journal = journal_from_env()
+    if journal is not None:
+        exchange.post = _journaled(exchange.post, journal, script)
+    return journal
+
+
+def wrap_post(post: Callable[[str, Any], Any], script: str) -> Callable[[str, Any], Any]:
+    """Journal a `post(url_path, payload)` function for scripts that do not go through `Exchange`."""
+    journal = journal_from_env()
+    return post if journal is None else _journaled(post, journal, script)
+
+
+def _journaled(inner_post: Callable[[str, Any], Any], journal: Journal, script: str) -> Callable[[str, Any], Any]:
+    def post(url_path: str, payload: Any = None) -> Any:
+        if url_path != "/exchange":
+            return inner_post(url_path, payload)
+        ts = _now_ms()
+        started = time.perf_counter()
+        try:
+            response = inner_post(url_path, payload)
+        except Exception as e:
+            journal.record({
+                "ts": ts, "script": script, "payload": payload,
+                "latencyMs": round((time.perf_counter() - started) * 1000, 2),
+                "ok": False, "error": str(e),
+            })
+            raise
+        journal.record({
+            "ts": ts, "script": script, "payload": payload,
+            "latencyMs": round((time.perf_counter() - started) * 1000, 2),
+            "ok": isinstance(response, dict) and response.get("status") == "ok",
+            "response": response,
+        })
+        return response
+
+    return post
+
+
+def read_entries(path: str = DEFAULT_PATH) -> Iterator[dict]:
+    """Yield entries from the oldest archive through the live file."""
+    n = 1
+    while os.path.exists(archive_path(path, n)):
+        n += 1
+    for i in range(n - 1, 0, -1):
+        with gzip.open(archive_path(path, i), "rt", encoding="utf-8") as f:
+            yield from _parse(f)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _parse(f)
+
+
+def _parse(lines) -> Iterator[dict]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,63 @@
+"""
+On-disk cache of per-dex perp metadata (`meta` info call).
+
+Bulk tooling checks assets against the dex universe many times per run; reading
+it once and caching it on disk keeps repeated runs to zero extra info calls
+until the cache expires or is refreshed.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+# apps/oracle-service/.cache (git-ignored)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache")
+DEFAULT_MAX_AGE_S = 300
+
+
+def _cache_path(cache_dir: str, dex: str) -> str:
+    return os.path.join(cache_dir, f"meta-{dex or 'default'}.json")
+
+
+def load_dex_meta(
+    base_url: str,
+    dex: str,
+    max_age_s: float = DEFAULT_MAX_AGE_S,
+    refresh: bool = False,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> dict:
+    """Return {"universe": [...]} for the dex, from cache when fresh enough."""
+    path = _cache_path(cache_dir, dex)
+    if not refresh and os.path.exists(path) and time.time() - os.path.getmtime(path) <= max_age_s:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    from hyperliquid.api import API
+
+    meta = API(base_url).post("/info", {"type": "meta", "dex": dex})
+    _write(path, meta)
+    return meta
+
+
+def record_asset(dex: str, asset: dict, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+    """Add a freshly registered asset to the cached universe so reruns skip it."""
+    path = _cache_path(cache_dir, dex)
+    meta: Optional[dict] = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    meta = meta or {"universe": []}
+    meta.setdefault("universe", []).append(asset)
+    _write(path, meta)
+
+
+def _write(path: str, meta: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique temp name: concurrent writers (threads or processes) must not share one.
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp", delete=False
+    ) as f:
+        json.dump(meta, f)
+    os.replace(f.name, path)
@@ -0,0 +1,29 @@
+"""
+Thread-safe nonce allocation for signed actions (mirror of src/nonce.ts).
+
+Hyperliquid nonces are millisecond timestamps that must be unique per signer.
+The SDK uses the wall clock directly, so two actions signed in the same
+millisecond collide; NonceStream hands out strictly increasing values instead.
+With `count > 1` each stream only uses its residue class (nonce % count ==
+index) so several processes sharing one signer never collide.
+"""
+
+import threading
+import time
+
+
+class NonceStream:
+    def __init__(self, index: int = 0, count: int = 1):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid nonce stream {index}/{count}")
+        self.index = index
+        self.count = count
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            nonce = max(int(time.time() * 1000), self._last + 1)
+            nonce += (self.index - nonce % self.count) % self.count
+            self._last = nonce
+            return nonce
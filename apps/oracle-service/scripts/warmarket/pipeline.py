@@ -0,0 +1,129 @@
+"""
+Python mirror of src/pipeline.ts for replay and offline tooling.
+
+Reads the same env vars as the oracle-service (INDEX_SCALE, MAX_JUMP_FRACTION,
+PRICE_EPSILON, MIN_PUBLISH_INTERVAL_MS, SMOOTHING_MODE, SMOOTHING_WINDOW_MS) so
+a replay uses exactly the configuration the service would. Keep the maths in
+lock-step with the TypeScript implementation.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+SMOOTHING_MODES = ("none", "ema", "twap", "conf")
+
+
+@dataclass
+class PipelineConfig:
+    index_scale: float = 40.0
+    max_jump_fraction: float = 0.2
+    price_epsilon: float = 0.01
+    min_publish_interval_ms: float = 10000.0
+    smoothing_mode: str = "none"
+    smoothing_window_ms: float = 15000.0
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        return cls(
+            index_scale=float(os.getenv("INDEX_SCALE", "40")),
+            max_jump_fraction=float(os.getenv("MAX_JUMP_FRACTION", "0.2")),
+            price_epsilon=float(os.getenv("PRICE_EPSILON", "0.01")),
+            min_publish_interval_ms=float(os.getenv("MIN_PUBLISH_INTERVAL_MS", "10000")),
+            smoothing_mode=parse_smoothing_mode(os.getenv("SMOOTHING_MODE")),
+            smoothing_window_ms=float(os.getenv("SMOOTHING_WINDOW_MS", "15000")),
+        )
+
+
+@dataclass
+class SmoothingState:
+    value: Optional[float] = None  # smoothed output
+    last: Optional[float] = None  # last raw input
+    timestamp: float = 0.0
+    weight: float = 0.0  # twap: covered time (ms); conf: accumulated precision
+
+
+def parse_smoothing_mode(mode: Optional[str]) -> str:
+    normalized = (mode or "none").lower()
+    if normalized not in SMOOTHING_MODES:
+        raise ValueError(f"Unknown SMOOTHING_MODE: {mode}")
+    return normalized
+
+
+def scale_to_index(raw_price: float, index_scale: float) -> float:
+    if index_scale <= 0:
+        raise ValueError("index_scale must be > 0")
+    return raw_price / index_scale
+
+
+def sanity_check_jump(previous: Optional[float], nxt: float, max_jump_fraction: float) -> Tuple[bool, Optional[str]]:
+    if previous is None or max_jump_fraction <= 0:
+        return True, None
+    jump_fraction = abs(nxt - previous) / max(abs(previous), 1e-9)
+    if jump_fraction > max_jump_fraction:
+        return False, f"Jump too large: {jump_fraction * 100:.2f}% > {max_jump_fraction * 100:.2f}%"
+    return True, None
+
+
+def should_publish_value(
+    next_value: float,
+    last_published_value: Optional[float],
+    last_publish_timestamp: float,
+    now: float,
+    price_epsilon: float,
+    min_publish_interval_ms: float,
+) -> Tuple[bool, Optional[str]]:
+    if last_published_value is None:
+        return True, None
+    if abs(next_value - last_published_value) >= price_epsilon:
+        return True, None
+    if now - last_publish_timestamp >= min_publish_interval_ms:
+        return True, None
+    return False, "No material change"
+
+
+def _precision(conf: Optional[float], value: float) -> float:
+    # Fall back to 1 bp of the value when Pyth does not report a confidence.
+    width = conf if conf is not None and conf > 0 else abs(value) * 1e-4
+    return 1.0 / max(width * width, 1e-18)
+
+
+def apply_smoothing(
+    state: SmoothingState,
+    value: float,
+    timestamp: float,
+    conf: Optional[float],
+    mode: str,
+    window_ms: float,
+) -> SmoothingState:
+    """Same O(1) EMA / TWAP / confidence-weighted stage as applySmoothing in pipeline.ts."""
+    if mode == "none" or state.value is None or state.last is None or window_ms <= 0:
+        weight = _precision(conf, value) if mode == "conf" else 0.0
+        return SmoothingState(value=value, last=value, timestamp=timestamp, weight=weight)
+
+    dt = timestamp - state.timestamp
+    if dt < 0:
+        return state
+
+    if mode == "ema":
+        alpha = 1 - math.exp(-dt / window_ms)
+        return SmoothingState(value=state.value + alpha * (value - state.value), last=value, timestamp=timestamp)
+
+    if mode == "twap":
+        held = min(dt, window_ms)
+        prior = min(state.weight, window_ms - held)
+        covered = prior + held
+        segment = (state.last + value) / 2
+        twap = (state.value * prior + segment * held) / covered if covered > 0 else state.value
+        return SmoothingState(value=twap, last=value, timestamp=timestamp, weight=covered)
+
+    prior_weight = state.weight * math.exp(-dt / window_ms)
+    next_weight = _precision(conf, value)
+    total = prior_weight + next_weight
+    return SmoothingState(
+        value=(state.value * prior_weight + value * next_weight) / total,
+        last=value,
+        timestamp=timestamp,
+        weight=total,
+    )
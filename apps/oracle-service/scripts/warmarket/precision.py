@@ -0,0 +1,154 @@
+"""
+Price and size formatting that follows Hyperliquid's per-asset precision rules.
+
+Perp prices may carry at most 5 significant figures and at most
+`6 - szDecimals` decimal places (integer prices are always allowed). Sizes are
+rounded to `szDecimals`. Anything that breaks these rules is rejected by the
+exchange only after it has been signed and posted, so the scripts normalise
+here and refuse invalid values before signing.
+
+Rules come from the dex `meta` universe via `meta_cache`, so they are read once
+and reused across runs; within a process the parsed rules are also kept in
+memory for the cache's max age. A coin that is missing even after a refresh (or
+whose meta cannot be fetched) is remembered for HL_META_MISS_TTL_S seconds
+(default 30), so a long-lived signer does not refetch meta on every publish.
+Both caches are shared by the signer's worker threads under one lock.
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from warmarket.meta_cache import DEFAULT_MAX_AGE_S, load_dex_meta
+
+PERP_MAX_DECIMALS = 6
+MAX_SIG_FIGS = 5
+DEFAULT_SZ_DECIMALS = 2
+DEFAULT_MISS_TTL_S = 30.0
+
+_lock = threading.Lock()
+# (base_url, dex) -> (monotonic load time, parsed rules)
+_tables: Dict[Tuple[str, str], Tuple[float, Dict[str, "AssetRules"]]] = {}
+# (base_url, dex, coin) -> monotonic time until which no refresh is attempted
+_misses: Dict[Tuple[str, str, str], float] = {}
+
+
+class PrecisionError(ValueError):
+    """Raised when a price or size cannot be represented for the asset."""
+
+
+@dataclass(frozen=True)
+class AssetRules:
+    sz_decimals: int
+    max_decimals: int = PERP_MAX_DECIMALS
+
+    @property
+    def price_decimals(self) -> int:
+        return max(0, self.max_decimals - self.sz_decimals)
+
+
+def load_rules(base_url: str, dex: str, refresh: bool = False) -> Dict[str, AssetRules]:
+    """Return {coin: AssetRules} for every asset in the dex universe."""
+    meta = load_dex_meta(base_url, dex, refresh=refresh)
+    return {asset["name"]: AssetRules(int(asset["szDecimals"])) for asset in meta.get("universe", [])}
+
+
+def rules_for(base_url: str, dex: str, coin: str) -> AssetRules:
+    """Rules for one coin; falls back to HL_SZ_DECIMALS when meta is unavailable or the coin is not listed yet."""
+    key = (base_url, dex, coin)
+    # Held across a fetch on purpose: threads that miss together wait for one
+    # refresh instead of each issuing their own.
+    with _lock:
+        cached = _tables.get((base_url, dex))
+        fresh = cached is not None and time.monotonic() - cached[0] <= DEFAULT_MAX_AGE_S
+        rules = cached[1].get(coin) if fresh else None
+        if rules is None and time.monotonic() >= _misses.get(key, 0.0):
+            try:
+                if not fresh:
+                    rules = _load_table(base_url, dex, refresh=False).get(coin)
+                if rules is None:
+                    rules = _load_table(base_url, dex, refresh=True).get(coin)
+            except Exception as e:  # noqa: BLE001 - meta is an optimisation, not a hard dependency
+                print(f"⚠️  Could not load {dex} meta ({e}); using HL_SZ_DECIMALS", file=sys.stderr)
+            if rules is None:
+                _misses[key] = time.monotonic() + float(os.getenv("HL_META_MISS_TTL_S", DEFAULT_MISS_TTL_S))
+    if rules is None:
+        rules = AssetRules(int(os.getenv("HL_SZ_DECIMALS", DEFAULT_SZ_DECIMALS)))
+    return rules
+
+
+def _load_table(base_url: str, dex: str, refresh: bool) -> Dict[str, AssetRules]:
+    table = load_rules(base_url, dex, refresh=refresh)
+    _tables[(base_url, dex)] = (time.monotonic(), table)
+    return table
+
+
+def _to_wire(mantissas, decimals) -> List[str]:
+    out = []
+    for m, d in zip(mantissas.tolist(), decimals.tolist()):
+        digits = str(int(m))
+        if d > 0:
+            digits = digits.rjust(d + 1, "0")
+            digits = f"{digits[:-d]}.{digits[-d:]}".rstrip("0").rstrip(".")
+        out.append(digits)
+    return out
+
+
+def _round_half_up(np, values, decimals):
+    scaled = values * np.power(10.0, decimals)
+    # Undo binary noise (1.0049999999 for 1.005) before rounding half up.
+    return np.floor(np.round(scaled, 6) + 0.5)
+
+
+def _check(np, values, what: str) -> None:
+    bad = ~np.isfinite(values) | (values <= 0)
+    if bad.any():
+        idx = np.flatnonzero(bad)[:5].tolist()
+        raise PrecisionError(f"{what} must be finite and positive (bad index {idx})")
+
+
+def normalize_prices(prices: Iterable[float], rules: AssetRules) -> List[str]:
+    """Round every price to the asset's tick and return exact wire strings."""
+    import numpy as np
+
+    values = np.asarray(list(prices), dtype=np.float64)
+    if values.size == 0:
+        return []
+    _check(np, values, "price")
+
+    integer_digits = np.floor(np.log10(values)).astype(np.int64) + 1
+    decimals = np.clip(MAX_SIG_FIGS - integer_digits, 0, rules.price_decimals)
+    mantissas = _round_half_up(np, values, decimals)
+    if (mantissas <= 0).any():
+        idx = np.flatnonzero(mantissas <= 0)[:5].tolist()
+        raise PrecisionError(f"price rounds to zero at {rules.price_decimals} decimals (bad index {idx})")
+    return _to_wire(mantissas, decimals)
+
+
+def normalize_sizes(sizes: Iterable[float], rules: AssetRules) -> List[str]:
+    """Round every size to szDecimals and return exact wire strings."""
+    import numpy as np
+
+    values = np.asarray(list(sizes), dtype=np.float64)
+    if values.size == 0:
+        return []
+    _check(np, values, "size")
+
+    decimals = np.full(values.shape, rules.sz_decimals, dtype=np.int64)
+    mantissas = _round_half_up(np, values, decimals)
+    if (mantissas <= 0).any():
+        idx = np.flatnonzero(mantissas <= 0)[:5].tolist()
+        raise PrecisionError(f"size rounds to zero at szDecimals={rules.sz_decimals} (bad index {idx})")
+    return _to_wire(mantissas, decimals)
+
+
+def normalize_price(price: float, rules: AssetRules) -> str:
+    return normalize_prices([price], rules)[0]
+
+
+def normalize_size(size: float, rules: AssetRules) -> str:
+    return normalize_sizes([size], rules)[0]
+
@@ -0,0 +1,204 @@
+"""
+Optional WebSocket transport for signed `/exchange` actions.
+
+Hyperliquid accepts the same signed payload as a `post` message on `/ws`:
+
+    {"method": "post", "id": 7, "request": {"type": "action", "payload": {...}}}
+
+and answers on the `post` channel with the matching id. One socket carries any
+number of in-flight requests, so callers skip per-request HTTPS setup.
+
+Enable with HL_WS_POST=true and call `install(exchange)` after building the
+SDK `Exchange`; every `exchange.post("/exchange", ...)` (including SDK helpers
+such as `exchange.order`) then goes over the socket. If the socket is down, the
+signed payload goes over HTTP instead. Once a payload has been sent on the
+socket it is never re-sent: a timeout or a socket drop while waiting raises,
+because the action may already have landed and a retry with the same nonce
+would only be rejected as a reuse.
+
+`install` never waits for the handshake: requests use HTTP until the socket is
+up. The socket only pays off in a long-lived process such as the oracle
+service's persistent signer (`set-oracle.py --serve`); a one-shot script will
+usually finish before it connects.
+"""
+
+import itertools
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class NotSentError(ConnectionError):
+    """The payload never left this process, so another transport may send it."""
+
+
+def ws_post_enabled() -> bool:
+    return os.getenv("HL_WS_POST", "").strip().lower() in ("1", "true", "yes")
+
+
+class WsPostTransport:
+    """Keeps one WebSocket open in a background thread and matches replies by id."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        ping_interval: float = 30.0,
+        max_backoff: float = 30.0,
+    ):
+        self.url = base_url.replace("https://", "wss://").replace("http://", "ws://").rstrip("/") + "/ws"
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._open = threading.Event()
+        self._closed = threading.Event()
+        self._ws = None
+        self._thread = threading.Thread(target=self._run, name="ws-post", daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self) -> bool:
+        return self._open.is_set()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._open.wait(self.connect_timeout if timeout is None else timeout)
+
+    def post(self, payload: dict, timeout: Optional[float] = None) -> dict:
+        """Send one signed action and block for its response (HTTP-shaped dict)."""
+        request_id, future = self._send(payload)
+        wait = self.timeout if timeout is None else timeout
+        try:
+            return future.result(wait)
+        except FutureTimeout:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise TimeoutError(f"ws-post: no reply within {wait}s") from None
+
+    def submit(self, payload: dict) -> Future:
+        """Send one signed action without waiting; many may be in flight at once."""
+        return self._send(payload)[1]
+
+    def _send(self, payload: dict) -> Tuple[int, Future]:
+        if not self._open.is_set():
+            raise NotSentError("ws-post: socket not connected")
+        request_id = next(self._ids)
+        future: Future = Future()
+        with self._lock:
+            self._pending[request_id] = future
+        message = {"method": "post", "id": request_id, "request": {"type": "action", "payload": payload}}
+        try:
+            self._ws.send(json.dumps(message, separators=(",", ":")))
+        except Exception as e:  # noqa: BLE001 - socket died between the check and the send
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise NotSentError(f"ws-post: send failed: {e}") from e
+        return request_id, future
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._ws is not None:
+            self._ws.close()
+        self._thread.join(timeout=2)
+
+    # --- background thread -------------------------------------------------
+
+    def _run(self) -> None:
+        import websocket
+
+        backoff = 0.5
+        while not self._closed.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_close=self._on_close,
+                on_error=lambda _ws, e: print(f"⚠️  ws-post: {e}", file=sys.stderr),
+            )
+            self._ws.run_forever()
+            self._open.clear()
+            self._fail_pending("socket closed")
+            if self._closed.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
+        self._fail_pending("transport closed")
+
+    def _on_open(self, ws) -> None:
+        self._open.set()
+        threading.Thread(target=self._ping, args=(ws,), name="ws-post-ping", daemon=True).start()
+
+    def _ping(self, ws) -> None:
+        # The server drops sockets that stay silent for a minute; pings are JSON text.
+        while self._open.is_set() and not self._closed.wait(self.ping_interval):
+            if ws is not self._ws:
+                return
+            try:
+                ws.send('{"method":"ping"}')
+            except Exception:  # noqa: BLE001 - the reconnect loop handles dead sockets
+                return
+
+    def _on_close(self, _ws, *_args) -> None:
+        self._open.clear()
+
+    def _on_message(self, _ws, raw: str) -> None:
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            return
+        if msg.get("channel") != "post":
+            return
+        data = msg.get("data") or {}
+        with self._lock:
+            future = self._pending.pop(data.get("id"), None)
+        if future is None:
+            return
+        response = data.get("response") or {}
+        if response.get("type") == "error":
+            future.set_result({"status": "err", "response": response.get("payload")})
+        else:
+            future.set_result(response.get("payload"))
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"ws-post: {reason}"))
+
+
+def post_or_fallback(transport: WsPostTransport, payload: dict, http_post: Callable[[], Any]) -> Any:
+    if transport.connected:
+        try:
+            return transport.post(payload)
+        except NotSentError as e:
+            print(f"⚠️  ws-post failed ({e}); sending over HTTP", file=sys.stderr)
+        # Anything else (timeout, socket dropped after the send) propagates: the
+        # action may have landed, so re-posting the same nonce is not safe.
+    return http_post()
+
+
+def install(exchange) -> Optional[WsPostTransport]:
+    """Route `exchange.post("/exchange", ...)` over a WebSocket when HL_WS_POST is set."""
+    if not ws_post_enabled():
+        return None
+
+    # Connects in the background; post_or_fallback uses HTTP until it is up.
+    transport = WsPostTransport(exchange.base_url)
+    http_post = exchange.post
+
+    def post(url_path: str, payload: Any = None) -> Any:
+        if url_path != "/exchange":
+            return http_post(url_path, payload)
+        return post_or_fallback(transport, payload, lambda: http_post(url_path, payload))
+
+    exchange.post = post
+    return transport
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Wind down a HIP-3 dex: cancel every resting order and flatten every position
+held by the master account, one batch per market, all markets concurrently.
+
+Use before recycle_market.py or an unhalt, instead of cancelling seeded orders
+by hand in the UI.
+
+Usage (testnet):
+    NETWORK=testnet python3 scripts/wind-down.py --dex wa --dry-run
+    NETWORK=testnet python3 scripts/wind-down.py --dex wa
+    NETWORK=testnet python3 scripts/wind-down.py --dex wa --coins wa:GDR1,wa:ESV1 --skip-positions
+
+State is read with three info calls for the whole dex (openOrders,
+clearinghouseState, allMids). Each market then gets at most one bulk cancel and
+one reduce-only IOC close. Nonces come from a shared NonceStream, so concurrent
+signing never reuses one.
+
+A batch only counts as done if every per-order status succeeded (the exchange
+answers "ok" at the top level even when an IOC close does not fill or a cancel
+fails). Afterwards orders and positions are read again; anything still open is
+reported under "remaining" and the script exits 1.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from warmarket import journal, ws_post
+from warmarket.nonce import NonceStream
+
+
+def group_by_coin(open_orders: List[dict], positions: List[dict], coins: Optional[set]) -> Dict[str, dict]:
+    markets: Dict[str, dict] = {}
+    for order in open_orders:
+        coin = order["coin"]
+        if coins and coin not in coins:
+            continue
+        markets.setdefault(coin, {"orders": [], "szi": 0.0})["orders"].append(order["oid"])
+    for entry in positions:
+        pos = entry.get("position", {})
+        coin = pos.get("coin")
+        szi = float(pos.get("szi", 0) or 0)
+        if not coin or szi == 0 or (coins and coin not in coins):
+            continue
+        markets.setdefault(coin, {"orders": [], "szi": 0.0})["szi"] = szi
+    return markets
+
+
+def status_errors(resp: dict) -> List[str]:
+    """Failures in an /exchange response, including per-order ones under data.statuses."""
+    if resp.get("status") != "ok":
+        return [str(resp.get("response"))]
+    data = (resp.get("response") or {}).get("data") or {}
+    errors = []
+    for status in data.get("statuses", []):
+        if isinstance(status, dict) and "error" in status:
+            errors.append(status["error"])
+    return errors
+
+
+def main() -> None:
+    env_file = os.getenv("ENV_FILE", ".env.testnet")
+    load_dotenv(env_file)
+
+    parser = argparse.ArgumentParser(description="Cancel all orders and flatten positions on a HIP-3 dex.")
+    parser.add_argument("--dex", default=os.getenv("HL_DEX_NAME"), help="Dex tag (default HL_DEX_NAME)")
+    parser.add_argument("--coins", help="Comma-separated coin ids to limit to (e.g. wa:GDR1,wa:ESV1)")
+    parser.add_argument("--skip-positions", action="store_true", help="Only cancel orders, keep positions")
+    parser.add_argument("--slippage", type=float, default=0.05, help="Max slippage for reduce-only closes (default 5%%)")
+    parser.add_argument("--workers", type=int, default=8, help="Markets processed concurrently")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without signing anything")
+    args = parser.parse_args()
+
+    if not args.dex:
+        print("❌ Missing --dex (or HL_DEX_NAME)", file=sys.stderr)
+        sys.exit(1)
+    dex = args.dex.lower()
+    coins = {c.strip() for c in args.coins.split(",")} if args.coins else None
+
+    hl_master_address = os.getenv("HL_MASTER_ADDRESS")
+    hl_master_private_key = os.getenv("HL_MASTER_PRIVATE_KEY")
+    if not hl_master_private_key:
+        print("❌ Error: Missing HL_MASTER_PRIVATE_KEY in env", file=sys.stderr)
+        sys.exit(1)
+    if not hl_master_address:
+        print("❌ Error: Missing HL_MASTER_ADDRESS in env", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        import eth_account
+        from hyperliquid.exchange import Exchange
+        from hyperliquid.utils import constants
+        from hyperliquid.utils.signing import (
+            order_request_to_order_wire,
+            order_wires_to_order_action,
+            sign_l1_action,
+        )
+    except ImportError as e:
+        print(f"❌ Missing dependency: {e}", file=sys.stderr)
+        print("   Install with: pip3 install hyperliquid-python-sdk python-dotenv eth-account", file=sys.stderr)
+        sys.exit(1)
+
+    api_wallet = eth_account.Account.from_key(hl_master_private_key)
+    exchange = Exchange(api_wallet, constants.TESTNET_API_URL, perp_dexs=[dex])
+    ws_post.install(exchange)
+    journal.install(exchange, "wind-down")
+    is_mainnet = exchange.base_url == constants.MAINNET_API_URL
+    nonces = NonceStream()
+
+    started = time.perf_counter()
+    open_orders = exchange.info.open_orders(hl_master_address, dex)
+    user_state = exchange.info.user_state(hl_master_address, dex)
+    mids = exchange.info.all_mids(dex)
+    fetch_ms = (time.perf_counter() - started) * 1000
+
+    markets = group_by_coin(
+        open_orders,
+        [] if args.skip_positions else user_state.get("assetPositions", []),
+        coins,
+    )
+
+    print(f"✅ Wallet: {api_wallet.address}", file=sys.stderr)
+    print(f"➡️  dex={dex}: {len(markets)} market(s) to wind down (state fetched in {fetch_ms:.0f}ms)", file=sys.stderr)
+    for coin, m in sorted(markets.items()):
+        print(f"   {coin}: cancel {len(m['orders'])} order(s), position {m['szi']}", file=sys.stderr)
+
+    if args.dry_run:
+        print(json.dumps({"dex": dex, "dryRun": True, "markets": markets}, indent=2))
+        sys.exit(0)
+
+    def post_signed(action: dict) -> dict:
+        nonce = nonces.next()
+        signature = sign_l1_action(api_wallet, action, None, nonce, exchange.expires_after, is_mainnet)
+        return exchange.post("/exchange", {
+            "action": action,
+            "nonce": nonce,
+            "signature": signature,
+            "expiresAfter": exchange.expires_after,
+        })
+
+    def wind_down_market(coin: str, plan: dict) -> dict:
+        result = {"coin": coin, "ok": True}
+        t0 = time.perf_counter()
+        try:
+            if plan["orders"]:
+                asset = exchange.info.name_to_asset(coin)
+                resp = post_signed({"type": "cancel", "cancels": [{"a": asset, "o": oid} for oid in plan["orders"]]})
+                result["cancel"] = resp
+                errors = status_errors(resp)
+                if errors:
+                    result["ok"] = False
+                    result["cancelErrors"] = errors
+            result["cancelMs"] = round((time.perf_counter() - t0) * 1000, 1)
+
+            if plan["szi"]:
+                t1 = time.perf_counter()
+                is_buy = plan["szi"] < 0
+                mid = float(mids[coin])
+                close = {
+                    "coin": coin,
+                    "is_buy": is_buy,
+                    "sz": abs(plan["szi"]),
+                    "limit_px": exchange._slippage_price(coin, is_buy, args.slippage, mid),
+                    "order_type": {"limit": {"tif": "Ioc"}},
+                    "reduce_only": True,
+                }
+                wire = order_request_to_order_wire(close, exchange.info.name_to_asset(coin))
+                resp = post_signed(order_wires_to_order_action([wire]))
+                result["close"] = resp
+                errors = status_errors(resp)
+                if errors:
+                    result["ok"] = False
+                    result["closeErrors"] = errors
+                result["closeMs"] = round((time.perf_counter() - t1) * 1000, 1)
+        except Exception as e:
+            result["ok"] = False
+            result["error"] = str(e)
+        result["totalMs"] = round((time.perf_counter() - t0) * 1000, 1)
+        status = "✅" if result["ok"] else "❌"
+        print(f"{status} {coin} done in {result['totalMs']}ms", file=sys.stderr)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        results = list(pool.map(lambda item: wind_down_market(*item), sorted(markets.items())))
+
+    # Verify against the exchange rather than trusting the responses.
+    remaining = group_by_coin(
+        exchange.info.open_orders(hl_master_address, dex),
+        [] if args.skip_positions else exchange.info.user_state(hl_master_address, dex).get("assetPositions", []),
+        coins,
+    )
+    for coin, m in sorted(remaining.items()):
+        print(f"❌ {coin} still open: {len(m['orders'])} order(s), position {m['szi']}", file=sys.stderr)
+
+    print(json.dumps({
+        "dex": dex,
+        "fetchMs": round(fetch_ms, 1),
+        "totalMs": round((time.perf_counter() - started) * 1000, 1),
+        "markets": results,
+        "remaining": remaining,
+    }, indent=2))
+
+    if remaining or any(not r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
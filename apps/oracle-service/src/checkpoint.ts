@@ -0,0 +1,132 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { config } from './config';
+import { MarketConfig } from './markets';
+
+// Per-market warm-start state. Each market owns one fixed-size file that stays
+// open and is overwritten in place (a positioned write at offset 0) after every
+// cycle, so saving costs one small syscall and never rewrites or renames files.
+//
+// Only accepted ticks are saved, so the record always describes the last
+// price the market accepted; its age is measured from that price's timestamp.
+//
+// Layout (bytes):
+//   0   u32     magic
+//   4   u32     FNV-1a checksum of bytes 8..80
+//   8   f64[9]  fields (see FIELD_*); NaN encodes null
+const MAGIC = 0x57414d32;  // "WAM2"
+const FIELD_SAVED_AT = 0;
+const FIELD_INDEX_SCALE = 1;
+const FIELD_LAST_COMPUTED_INDEX = 2;
+const FIELD_LAST_PUBLISHED_VALUE = 3;
+const FIELD_LAST_PUBLISH = 4;
+const FIELD_TOTAL_PUBLISHES = 5;
+const FIELD_PRICE_VALUE = 6;
+const FIELD_PRICE_TIMESTAMP = 7;
+const FIELD_FEED_HASH = 8;
+const FIELD_COUNT = 9;
+const HEADER_BYTES = 8;
+const FILE_BYTES = HEADER_BYTES + FIELD_COUNT * 8;
+
+export interface Checkpoint {
+  savedAt: number;
+  lastComputedIndex: number | null;
+  lastPublishedValue: number | null;
+  lastPublish?: number;
+  totalPublishes: number;
+  priceValue: number;
+  priceTimestamp: number;
+}
+
+function fnv1a(bytes: Uint8Array, start = 0, end = bytes.length): number {
+  let hash = 0x811c9dc5;
+  for (let i = start; i < end; i++) {
+    hash ^= bytes[i];
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+  }
+  return hash;
+}
+
+function checksum(bytes: Uint8Array): number {
+  return fnv1a(bytes, HEADER_BYTES, FILE_BYTES);
+}
+
+function feedHash(feedId: string): number {
+  return fnv1a(Buffer.from(feedId.toLowerCase().replace(/^0x/, ''), 'utf-8'));
+}
+
+function orNull(value: number): number | null {
+  return Number.isNaN(value) ? null : value;
+}
+
+export class CheckpointFile {
+  private readonly buffer = Buffer.alloc(FILE_BYTES);
+  private readonly view = new DataView(this.buffer.buffer, this.buffer.byteOffset, FILE_BYTES);
+
+  private constructor(private readonly fd: number, private readonly market: MarketConfig) {}
+
+  static open(market: MarketConfig): CheckpointFile | null {
+    if (!config.checkpointDir) {
+      return null;
+    }
+    const dir = path.resolve(process.cwd(), config.checkpointDir);
+    fs.mkdirSync(dir, { recursive: true });
+    const file = path.join(dir, `${market.id.replace(/[^A-Za-z0-9_-]/g, '_')}.ckpt`);
+    const fd = fs.openSync(file, fs.existsSync(file) ? 'r+' : 'w+');
+    return new CheckpointFile(fd, market);
+  }
+
+  // Returns the saved state, or null when missing, corrupt, or not safe to
+  // resume from: the last accepted price is older than CHECKPOINT_MAX_AGE_MS,
+  // or the state was written under a different feed or indexScale (its index
+  // values would trip the jump guard, which never re-anchors).
+  read(now = Date.now()): Checkpoint | null {
+    const bytes = Buffer.alloc(FILE_BYTES);
+    if (fs.readSync(this.fd, bytes, 0, FILE_BYTES, 0) !== FILE_BYTES) {
+      return null;
+    }
+    const view = new DataView(bytes.buffer, bytes.byteOffset, FILE_BYTES);
+    if (view.getUint32(0, true) !== MAGIC || view.getUint32(4, true) !== checksum(bytes)) {
+      return null;
+    }
+    const field = (idx: number) => view.getFloat64(HEADER_BYTES + idx * 8, true);
+    const savedAt = field(FIELD_SAVED_AT);
+    if (
+      now - field(FIELD_PRICE_TIMESTAMP) > config.checkpointMaxAgeMs ||
+      field(FIELD_INDEX_SCALE) !== this.market.indexScale ||
+      field(FIELD_FEED_HASH) !== feedHash(this.market.pythFeedId)
+    ) {
+      return null;
+    }
+    const lastPublish = field(FIELD_LAST_PUBLISH);
+    return {
+      savedAt,
+      lastComputedIndex: orNull(field(FIELD_LAST_COMPUTED_INDEX)),
+      lastPublishedValue: orNull(field(FIELD_LAST_PUBLISHED_VALUE)),
+      lastPublish: lastPublish > 0 ? lastPublish : undefined,
+      totalPublishes: field(FIELD_TOTAL_PUBLISHES),
+      priceValue: field(FIELD_PRICE_VALUE),
+      priceTimestamp: field(FIELD_PRICE_TIMESTAMP),
+    };
+  }
+
+  write(state: Checkpoint): void {
+    const set = (idx: number, value: number) => this.view.setFloat64(HEADER_BYTES + idx * 8, value, true);
+    set(FIELD_SAVED_AT, state.savedAt);
+    set(FIELD_INDEX_SCALE, this.market.indexScale);
+    set(FIELD_LAST_COMPUTED_INDEX, state.lastComputedIndex ?? Number.NaN);
+    set(FIELD_LAST_PUBLISHED_VALUE, state.lastPublishedValue ?? Number.NaN);
+    set(FIELD_LAST_PUBLISH, state.lastPublish ?? 0);
+    set(FIELD_TOTAL_PUBLISHES, state.totalPublishes);
+    set(FIELD_PRICE_VALUE, state.priceValue);
+    set(FIELD_PRICE_TIMESTAMP, state.priceTimestamp);
+    set(FIELD_FEED_HASH, feedHash(this.market.pythFeedId));
+    this.view.setUint32(0, MAGIC, true);
+    this.view.setUint32(4, checksum(this.buffer), true);
+    fs.writeSync(this.fd, this.buffer, 0, FILE_BYTES, 0);
+  }
+
+  close(): void {
+    fs.closeSync(this.fd);
+  }
+}
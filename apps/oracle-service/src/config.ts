@@ -1,5 +1,6 @@
 import * as path from 'path';
 import * as dotenv from 'dotenv';
+import { parseSmoothingMode, SmoothingMode } from './pipeline';
 
 const NETWORK = process.env.NETWORK;
 
@@ -19,6 +20,11 @@ export interface ServiceConfig {
   port: number;
   pythFeedId: string;
   pythApiUrl: string;
+  pythApiUrls: string[];  // extra Hermes endpoints queried in parallel for a price quorum
+  priceSourceHlMid: boolean;
+  priceDeadlineMs: number;
+  priceQuorum: number;
+  priceOutlierFraction: number;
   pythCluster?: string;
   hlUrl: string;
   hlMasterAddress: string;  // Master/builder account (where funds are deposited and signing happens)
@@ -26,6 +32,7 @@ export interface ServiceConfig {
   hlDexName?: string;  // DEX name for HIP-3 markets (2-4 chars, e.g., "XAU")
   hlCoinSymbol?: string;  // Coin symbol (e.g., "XAU-TEST")
   hlAssetId?: number;  // Numeric asset ID from meta.universe (for trading)
+  hlSzDecimals: number;  // Asset szDecimals; bounds oracle price decimals to 6 - szDecimals
   hlPublishEnabled: boolean;
   hlOracleEndpoint?: string;
   publishIntervalMs: number;
@@ -34,6 +41,31 @@ export interface ServiceConfig {
   priceChangeEpsilon: number;
   indexScale: number;
   maxJumpFraction: number;
+  adaptiveCadence: boolean;
+  adaptiveMinIntervalMs: number;
+  adaptiveMaxIntervalMs: number;
+  adaptiveMinEpsilon: number;
+  adaptiveMaxEpsilon: number;
+  adaptiveMaxMinPublishIntervalMs: number;
+  volHalfLifeMs: number;
+  volReference: number;
+  epsilonSigmaMultiple: number;
+  smoothingMode: SmoothingMode;
+  smoothingWindowMs: number;
+  marketsFile?: string;
+  marketsWatch: boolean;
+  marketsWatchIntervalMs: number;
+  shardByDex: boolean;
+  shardRestartDelayMs: number;
+  checkpointDir?: string;
+  checkpointMaxAgeMs: number;
+  streamIntervalMs: number;
+  streamMaxBlockedMs: number;
+  hlPersistentSigner: boolean;
+  signerTimeoutMs: number;
+  shadowFile?: string;
+  shadowHistorySize: number;
+  shadowHistoryDir?: string;
 }
 
 function required(name: string, fallback?: string): string {
@@ -47,15 +79,21 @@ function required(name: string, fallback?: string): string {
 export const config: ServiceConfig = {
   network: NETWORK,
   port: Number(process.env.PORT ?? 4000),
-  pythFeedId: required('PYTH_FEED_ID'),
+  pythFeedId: process.env.MARKETS_FILE ? process.env.PYTH_FEED_ID ?? '' : required('PYTH_FEED_ID'),
   pythApiUrl: required('PYTH_API_URL', 'https://hermes-beta.pyth.network/api'),
   pythCluster: process.env.PYTH_CLUSTER,
+  pythApiUrls: (process.env.PYTH_API_URLS ?? '').split(',').map((u) => u.trim()).filter(Boolean),
+  priceSourceHlMid: (process.env.PRICE_SOURCE_HL_MID ?? 'false').toLowerCase() === 'true',
+  priceDeadlineMs: Number(process.env.PRICE_DEADLINE_MS ?? 1500),  // per-tick budget across all sources
+  priceQuorum: Number(process.env.PRICE_QUORUM ?? 0),  // 0 = majority of configured sources
+  priceOutlierFraction: Number(process.env.PRICE_OUTLIER_FRACTION ?? 0.01),  // reject >1% from the median
   hlUrl: required('HL_TESTNET_URL'),
   hlMasterAddress: required('HL_MASTER_ADDRESS'),
   hlMasterPrivateKey: required('HL_MASTER_PRIVATE_KEY'),
   hlDexName: process.env.HL_DEX_NAME,  // DEX name (2-4 chars, e.g., "XAU")
   hlCoinSymbol: process.env.HL_COIN_SYMBOL,  // Coin symbol (e.g., "XAU-TEST")
   hlAssetId: process.env.HL_ASSET_ID ? Number(process.env.HL_ASSET_ID) : undefined,  // Asset ID for trading
+  hlSzDecimals: Number(process.env.HL_SZ_DECIMALS ?? 2),
   hlPublishEnabled: (process.env.HL_PUBLISH_ENABLED ?? 'false').toLowerCase() === 'true',
   hlOracleEndpoint: process.env.HL_ORACLE_ENDPOINT ?? '/exchange',  // Hyperliquid exchange endpoint
   publishIntervalMs: Number(process.env.PUBLISH_INTERVAL_MS ?? 3000),
@@ -64,4 +102,29 @@ export const config: ServiceConfig = {
   priceChangeEpsilon: Number(process.env.PRICE_EPSILON ?? 0.01),
   indexScale: Number(process.env.INDEX_SCALE ?? 40), // scale raw Pyth price down (e.g. 4000/40 ~= 100)
   maxJumpFraction: Number(process.env.MAX_JUMP_FRACTION ?? 0.2), // 20% tick-to-tick guardrail
+  adaptiveCadence: (process.env.ADAPTIVE_CADENCE ?? 'false').toLowerCase() === 'true',
+  adaptiveMinIntervalMs: Number(process.env.ADAPTIVE_MIN_INTERVAL_MS ?? 1000),
+  adaptiveMaxIntervalMs: Number(process.env.ADAPTIVE_MAX_INTERVAL_MS ?? 15000),
+  adaptiveMinEpsilon: Number(process.env.ADAPTIVE_MIN_EPSILON ?? 0.005),
+  adaptiveMaxEpsilon: Number(process.env.ADAPTIVE_MAX_EPSILON ?? 0.05),
+  adaptiveMaxMinPublishIntervalMs: Number(process.env.ADAPTIVE_MAX_MIN_PUBLISH_INTERVAL_MS ?? 60000),  // longest heartbeat in a flat market
+  volHalfLifeMs: Number(process.env.VOL_HALF_LIFE_MS ?? 60000),
+  volReference: Number(process.env.VOL_REFERENCE ?? 0.0002), // sigma per sqrt(s) that maps to PUBLISH_INTERVAL_MS
+  epsilonSigmaMultiple: Number(process.env.EPSILON_SIGMA_MULTIPLE ?? 1),
+  smoothingMode: parseSmoothingMode(process.env.SMOOTHING_MODE), // none | ema | twap | conf
+  smoothingWindowMs: Number(process.env.SMOOTHING_WINDOW_MS ?? 15000),
+  marketsFile: process.env.MARKETS_FILE,  // JSON array of markets; defaults to the single env market
+  marketsWatch: (process.env.MARKETS_WATCH ?? 'true').toLowerCase() === 'true',  // hot-reload MARKETS_FILE on change
+  marketsWatchIntervalMs: Number(process.env.MARKETS_WATCH_INTERVAL_MS ?? 1000),
+  shardByDex: (process.env.SHARD_BY_DEX ?? 'false').toLowerCase() === 'true',  // one worker thread per dex
+  shardRestartDelayMs: Number(process.env.SHARD_RESTART_DELAY_MS ?? 1000),
+  checkpointDir: process.env.CHECKPOINT_DIR === 'off' ? undefined : process.env.CHECKPOINT_DIR ?? 'checkpoints',  // "off" disables warm start
+  checkpointMaxAgeMs: Number(process.env.CHECKPOINT_MAX_AGE_MS ?? 600000),  // ignore warm-start state older than this
+  streamIntervalMs: Number(process.env.STREAM_INTERVAL_MS ?? 250),  // /stream coalescing window
+  streamMaxBlockedMs: Number(process.env.STREAM_MAX_BLOCKED_MS ?? 30000),  // drop subscribers that stop reading for this long
+  hlPersistentSigner: (process.env.HL_PERSISTENT_SIGNER ?? 'true').toLowerCase() === 'true',  // one long-lived set-oracle.py --serve
+  signerTimeoutMs: Number(process.env.SIGNER_TIMEOUT_MS ?? 30000),
+  shadowFile: process.env.SHADOW_FILE,  // JSON array of candidate configs run beside the live pipeline
+  shadowHistorySize: Number(process.env.SHADOW_HISTORY_SIZE ?? 500),  // in-memory records per shadow and market
+  shadowHistoryDir: process.env.SHADOW_HISTORY_DIR,  // also append every record to <dir>/<shadow>_<market>.jsonl
 };
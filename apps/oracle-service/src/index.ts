@@ -1,37 +1,90 @@
 import express from 'express';
 import { config } from './config';
-import { fetchPythPrice } from './services/pyth';
-import { publishToHyperliquid } from './services/hyperliquid';
 import { fetchFeedMetadata, listAvailableFeeds, validateFeedId } from './services/pyth-metadata';
-import { priceState, publishStats } from './state';
-import { sanityCheckJump, scaleToIndex } from './pipeline';
+import { marketHealth } from './market';
+import { groupByDex, loadMarkets } from './markets';
+import { createNonceStream } from './nonce';
+import { isEmptyDiff, MarketRegistry, watchMarketsFile } from './registry';
+import { ShardSupervisor } from './shards/supervisor';
+import { loadShadowDefinitions, shadowHistory } from './shadow';
+import { MarketHealth } from './state';
+import { PriceStream } from './stream';
 
 const app = express();
 app.use(express.json());
 
+const markets = loadMarkets();
+let registry: MarketRegistry | null = null;
+let supervisor: ShardSupervisor | null = null;
+
+function collectHealth(): MarketHealth[] {
+  return supervisor ? supervisor.marketHealth() : (registry?.runtimes() ?? []).map(marketHealth);
+}
+
+const stream = new PriceStream(collectHealth);
+
 app.get('/health', (_req, res) => {
+  const marketsHealth = collectHealth();
+  // Top-level fields describe the first market so single-market consumers keep working.
+  const primary = marketsHealth[0];
   res.json({
     status: 'ok',
     network: config.network,
-    lastPrice: priceState.value || null,
-    lastUpdate: priceState.timestamp ? new Date(priceState.timestamp).toISOString() : null,
-    stale: priceState.stale,
-    publishes: publishStats.totalPublishes,
-    error: priceState.lastError ?? null,
+    lastPrice: primary?.lastPrice ?? null,
+    lastUpdate: primary?.lastUpdate ?? null,
+    stale: primary?.stale ?? true,
+    publishes: marketsHealth.reduce((sum, m) => sum + m.publishes, 0),
+    error: primary?.error ?? null,
+    cadence: primary?.cadence ?? null,
+    markets: marketsHealth,
+    shards: supervisor ? supervisor.shardStatus() : null,
+    streamSubscribers: stream.subscriberCount(),
   });
 });
 
 app.get('/price', (_req, res) => {
+  const requested = _req.query.market as string | undefined;
+  const health = collectHealth();
+  const entry = requested ? health.find((m) => m.market.toLowerCase() === requested.toLowerCase()) : health[0];
+  if (!entry) {
+    res.status(404).json({ error: 'Market not found' });
+    return;
+  }
   res.json({
-    index: 'testnet-index',
-    value: priceState.value || null,
+    index: entry.market,
+    value: entry.lastPrice,
     source: {
-      pyth: priceState.value || null,
-      timestamp: priceState.timestamp || null,
+      pyth: entry.lastPrice,
+      timestamp: entry.lastUpdate ? Date.parse(entry.lastUpdate) : null,
     },
   });
 });
 
+// Server-sent events: a snapshot of every market on connect, then coalesced updates.
+app.get('/stream', (req, res) => {
+  stream.subscribe(req, res);
+});
+
+// Shadow pipelines (SHADOW_FILE): per shadow and market counters and divergence
+// from live. Only available when markets run in this process (not sharded).
+app.get('/shadows', (_req, res) => {
+  const runtimes = registry?.runtimes() ?? [];
+  res.json({ shadows: runtimes.flatMap((rt) => rt.shadows.map((shadow) => shadow.stats)) });
+});
+
+app.get('/shadows/:name/history', (_req, res) => {
+  const requested = (_req.query.market as string | undefined)?.toLowerCase();
+  const limit = Number(_req.query.limit ?? 100);
+  const shadows = (registry?.runtimes() ?? [])
+    .flatMap((rt) => rt.shadows)
+    .filter((shadow) => shadow.definition.name === _req.params.name && (!requested || shadow.market.id === requested));
+  if (!shadows.length) {
+    res.status(404).json({ error: 'Shadow not found' });
+    return;
+  }
+  res.json({ history: shadows.flatMap((shadow) => shadowHistory(shadow, limit)) });
+});
+
 app.get('/feeds', async (_req, res) => {
   const query = _req.query.search as string | undefined;
   const feeds = await listAvailableFeeds(query);
@@ -54,67 +107,40 @@ app.get('/feeds/:feedId/validate', async (_req, res) => {
   res.json({ feedId, valid: isValid });
 });
 
-let lastComputedIndex: number | null = null;
-
 async function main() {
   console.log(`[boot] WAR.MARKET oracle-service running on network=${config.network}`);
-  console.log(`[boot] Using feed=${config.pythFeedId}`);
-  console.log(`[boot] Index scale=${config.indexScale}`);
+  console.log(`[boot] Markets: ${markets.map((m) => `${m.id} (feed=${m.pythFeedId}, scale=${m.indexScale})`).join(', ')}`);
   console.log(`[boot] Hyperliquid publish ${config.hlPublishEnabled ? 'ENABLED' : 'DISABLED'}`);
-  
-  // Validate feed ID on startup
-  console.log(`[boot] Validating feed ID...`);
-  const isValid = await validateFeedId(config.pythFeedId);
-  if (!isValid) {
-    console.warn(`[boot] WARNING: Feed ID ${config.pythFeedId} validation failed. Service will continue but may fail to fetch prices.`);
-  } else {
-    const metadata = await fetchFeedMetadata(config.pythFeedId);
-    if (metadata) {
-      console.log(`[boot] Feed metadata: ${metadata.symbol || 'unknown'} (${metadata.description || 'no description'})`);
-    }
-    console.log(`[boot] Feed ID validated successfully`);
+  console.log(`[boot] Smoothing mode=${config.smoothingMode} window=${config.smoothingWindowMs}ms`);
+  console.log(`[boot] Adaptive cadence ${config.adaptiveCadence ? 'ENABLED' : 'DISABLED'}`);
+  if (config.shadowFile) {
+    console.log(`[boot] Shadow pipelines: ${loadShadowDefinitions().map((s) => s.name).join(', ') || 'none'}`);
   }
 
-  setInterval(async () => {
-    try {
-      const { value, timestamp } = await fetchPythPrice(config.pythFeedId);
-
-      // Scale raw Pyth price into an index level suitable for the DEX.
-      // For example, XAUT ~ 4200 / 40 ~= 105.
-      const indexValue = scaleToIndex(value, config.indexScale);
-
-      const stale = Date.now() - timestamp > config.staleThresholdMs;
-      priceState.stale = stale;
-
-      if (stale) {
-        console.warn('[price] stale data detected, skipping publish');
-        return;
-      }
-
-      const jumpCheck = sanityCheckJump(lastComputedIndex, indexValue, config.maxJumpFraction);
-      if (!jumpCheck.ok) {
-        priceState.lastError = jumpCheck.reason;
-        console.warn(`[price] sanity check failed: ${jumpCheck.reason}`);
-        return;
-      }
-
-      priceState.value = indexValue;
-      priceState.timestamp = timestamp;
-      priceState.lastError = undefined;
-      lastComputedIndex = indexValue;
-
-      const result = await publishToHyperliquid(indexValue);
-      if (result.skipped && result.reason) {
-        console.log(`[HL] skipped publish: ${result.reason}`);
-      }
-    } catch (err) {
-      const message = err instanceof Error ? err.message : String(err);
-      priceState.stale = true;
-      priceState.lastError = message;
-      console.error('[loop] error', err);
-    }
-  }, config.publishIntervalMs);
+  if (config.shardByDex) {
+    const groups = groupByDex(markets);
+    console.log(`[boot] Sharding by dex: ${groups.size} shard(s)`);
+    supervisor = new ShardSupervisor(groups);
+    supervisor.start();
+    watchMarketsFile((next) => {
+      void supervisor?.reload(groupByDex(next)).catch((err) => console.error('[registry] shard reload failed', err));
+    });
+  } else {
+    registry = new MarketRegistry(createNonceStream());
+    await registry.apply(markets);
+    watchMarketsFile((next) => {
+      void registry!
+        .apply(next)
+        .then((diff) => {
+          if (!isEmptyDiff(diff)) {
+            console.log(`[registry] applied: +${diff.added.length} -${diff.removed.length} ~${diff.changed.length}`);
+          }
+        })
+        .catch((err) => console.error('[registry] reload failed', err));
+    });
+  }
 
+  stream.start();
   app.listen(config.port, () => {
     console.log(`[server] listening on port ${config.port}`);
   });
@@ -0,0 +1,401 @@
+import { CheckpointFile } from './checkpoint';
+import { config } from './config';
+import { MarketConfig } from './markets';
+import { fetchMarketPrice } from './services/price-quorum';
+import { publishToHyperliquid } from './services/hyperliquid';
+import { fetchFeedMetadata, validateFeedId } from './services/pyth-metadata';
+import { PythPriceResult } from './services/pyth';
+import { closeShadows, createShadows, rebaseShadows, runShadows, ShadowPipeline } from './shadow';
+import {
+  CadenceState,
+  createCadenceState,
+  createPriceSnapshot,
+  createPublishStats,
+  createSchedulerStats,
+  MarketHealth,
+  PriceSnapshot,
+  PublishStats,
+  SchedulerStats,
+} from './state';
+import {
+  adaptiveCadence,
+  applySmoothing,
+  CadenceBounds,
+  createSmoothingState,
+  createVolatilityState,
+  sanityCheckJump,
+  scaleToIndex,
+  SmoothingState,
+  updateVolatility,
+  VolatilityState,
+} from './pipeline';
+
+// Everything one market's loop needs between ticks.
+export interface MarketRuntime {
+  market: MarketConfig;
+  price: PriceSnapshot;
+  publish: PublishStats;
+  cadence: CadenceState;
+  lastComputedIndex: number | null;
+  volatility: VolatilityState;
+  smoothing: SmoothingState;
+  scheduler: SchedulerStats;
+  pendingValue: number | null;  // newest index waiting for the in-flight publish to finish
+  publishing: Promise<void> | null;  // the running publish loop, if any
+  stopped: boolean;  // set by the loop's stop(); nothing is published afterwards
+  checkpoint: CheckpointFile | null;
+  shadows: ShadowPipeline[];  // candidate configs fed from this market's ticks (never publish)
+  nextNonce?: () => number;
+}
+
+export function createMarketRuntime(market: MarketConfig, nextNonce?: () => number): MarketRuntime {
+  const runtime: MarketRuntime = {
+    market,
+    price: createPriceSnapshot(),
+    publish: createPublishStats(),
+    cadence: createCadenceState(),
+    lastComputedIndex: null,
+    volatility: createVolatilityState(),
+    smoothing: createSmoothingState(),
+    scheduler: createSchedulerStats(),
+    pendingValue: null,
+    publishing: null,
+    stopped: false,
+    checkpoint: null,
+    shadows: createShadows(market),
+    nextNonce,
+  };
+  refreshCadence(runtime);
+  restoreCheckpoint(runtime);
+  return runtime;
+}
+
+// Warm start: keep the jump guard, publish throttle and last price from before
+// a restart so a rolling deploy does not trigger an immediate setOracle burst.
+function restoreCheckpoint(runtime: MarketRuntime) {
+  const { market, price, publish } = runtime;
+  try {
+    runtime.checkpoint = CheckpointFile.open(market);
+    const saved = runtime.checkpoint?.read();
+    if (!saved) {
+      return;
+    }
+    runtime.lastComputedIndex = saved.lastComputedIndex;
+    publish.lastPublishedValue = saved.lastPublishedValue;
+    publish.lastPublish = saved.lastPublish;
+    publish.totalPublishes = saved.totalPublishes;
+    price.value = saved.priceValue;
+    price.timestamp = saved.priceTimestamp;
+    price.stale = Date.now() - saved.priceTimestamp > config.staleThresholdMs;
+    console.log(`[boot] ${market.id}: restored checkpoint from ${Date.now() - saved.savedAt}ms ago (index=${saved.lastComputedIndex})`);
+  } catch (err) {
+    console.warn(`[boot] ${market.id}: checkpoint unavailable`, err);
+  }
+}
+
+function saveCheckpoint(runtime: MarketRuntime) {
+  if (!runtime.checkpoint) {
+    return;
+  }
+  try {
+    runtime.checkpoint.write({
+      savedAt: Date.now(),
+      lastComputedIndex: runtime.lastComputedIndex,
+      lastPublishedValue: runtime.publish.lastPublishedValue,
+      lastPublish: runtime.publish.lastPublish,
+      totalPublishes: runtime.publish.totalPublishes,
+      priceValue: runtime.price.value,
+      priceTimestamp: runtime.price.timestamp,
+    });
+  } catch (err) {
+    console.warn(`[loop] ${runtime.market.id}: checkpoint write failed`, err);
+  }
+}
+
+function cadenceBounds(market: MarketConfig): CadenceBounds {
+  return {
+    baseIntervalMs: market.publishIntervalMs,
+    minIntervalMs: config.adaptiveMinIntervalMs,
+    maxIntervalMs: config.adaptiveMaxIntervalMs,
+    baseEpsilon: market.priceChangeEpsilon,
+    minEpsilon: config.adaptiveMinEpsilon,
+    maxEpsilon: config.adaptiveMaxEpsilon,
+    baseMinPublishIntervalMs: market.minPublishIntervalMs,
+    maxMinPublishIntervalMs: config.adaptiveMaxMinPublishIntervalMs,
+    volHalfLifeMs: config.volHalfLifeMs,
+    volReference: config.volReference,
+    epsilonSigmaMultiple: config.epsilonSigmaMultiple,
+  };
+}
+
+function refreshCadence(runtime: MarketRuntime) {
+  const { market } = runtime;
+  const cadence = config.adaptiveCadence
+    ? adaptiveCadence(runtime.volatility, cadenceBounds(market))
+    : {
+        pollIntervalMs: market.publishIntervalMs,
+        priceChangeEpsilon: market.priceChangeEpsilon,
+        minPublishIntervalMs: market.minPublishIntervalMs,
+        sigma: null,
+      };
+  runtime.cadence.adaptive = config.adaptiveCadence;
+  runtime.cadence.pollIntervalMs = cadence.pollIntervalMs;
+  runtime.cadence.priceChangeEpsilon = cadence.priceChangeEpsilon;
+  runtime.cadence.minPublishIntervalMs = cadence.minPublishIntervalMs;
+  runtime.cadence.sigma = cadence.sigma;
+}
+
+// Swaps a running market's parameters in place (hot reload). The loop picks
+// them up on its next tick. State tied to the old feed, scale or smoothing
+// settings is reset; publish history and counters carry over.
+export function updateMarketConfig(runtime: MarketRuntime, market: MarketConfig) {
+  const previous = runtime.market;
+  runtime.market = market;
+
+  if (previous.pythFeedId !== market.pythFeedId || previous.indexScale !== market.indexScale) {
+    runtime.lastComputedIndex = null;
+    runtime.volatility = createVolatilityState();
+    runtime.smoothing = createSmoothingState();
+    // The checkpoint is keyed to the feed and indexScale it was written under.
+    closeCheckpoint(runtime);
+    restoreCheckpoint(runtime);
+  } else if (previous.smoothingMode !== market.smoothingMode || previous.smoothingWindowMs !== market.smoothingWindowMs) {
+    runtime.smoothing = createSmoothingState();
+  }
+  rebaseShadows(runtime.shadows, market);
+  refreshCadence(runtime);
+}
+
+// Releases a stopped market's files.
+export function closeMarketRuntime(runtime: MarketRuntime) {
+  closeCheckpoint(runtime);
+  closeShadows(runtime.shadows);
+  runtime.shadows = [];
+}
+
+function closeCheckpoint(runtime: MarketRuntime) {
+  const checkpoint = runtime.checkpoint;
+  runtime.checkpoint = null;
+  checkpoint?.close();
+}
+
+export async function validateMarketFeed(market: MarketConfig): Promise<void> {
+  console.log(`[boot] ${market.id}: validating feed ${market.pythFeedId}...`);
+  const isValid = await validateFeedId(market.pythFeedId);
+  if (!isValid) {
+    console.warn(`[boot] WARNING: ${market.id} feed ID ${market.pythFeedId} validation failed. Service will continue but may fail to fetch prices.`);
+    return;
+  }
+  const metadata = await fetchFeedMetadata(market.pythFeedId);
+  if (metadata) {
+    console.log(`[boot] ${market.id} feed metadata: ${metadata.symbol || 'unknown'} (${metadata.description || 'no description'})`);
+  }
+  console.log(`[boot] ${market.id}: feed ID validated successfully`);
+}
+
+// Fetches one price, runs it through the live pipeline and then through any
+// shadow pipelines. Returns the index value to publish, or null when the tick
+// should not publish.
+async function computeMarketTick(runtime: MarketRuntime): Promise<number | null> {
+  let reading: PythPriceResult;
+  try {
+    const { sources, ...rest } = await fetchMarketPrice(runtime.market);
+    runtime.price.sources = sources;
+    reading = rest;
+  } catch (err) {
+    recordError(runtime, err);
+    return null;
+  }
+
+  const indexValue = computeLiveIndex(runtime, reading);
+  if (runtime.shadows.length) {
+    runShadows(runtime.shadows, reading, indexValue, runtime.market.indexScale);
+  }
+  return indexValue;
+}
+
+// Validates one reading and commits it to the market state.
+function computeLiveIndex(runtime: MarketRuntime, reading: PythPriceResult): number | null {
+  const { market, price } = runtime;
+  try {
+    const { value, timestamp, conf } = reading;
+
+    // Scale raw Pyth price into an index level suitable for the DEX.
+    // For example, XAUT ~ 4200 / 40 ~= 105.
+    const rawIndex = scaleToIndex(value, market.indexScale);
+
+    const stale = Date.now() - timestamp > config.staleThresholdMs;
+    price.stale = stale;
+
+    if (stale) {
+      console.warn(`[price] ${market.id}: stale data detected, skipping publish`);
+      return null;
+    }
+
+    const smoothed = applySmoothing(
+      runtime.smoothing,
+      rawIndex,
+      timestamp,
+      conf !== undefined ? scaleToIndex(conf, market.indexScale) : undefined,
+      market.smoothingMode,
+      market.smoothingWindowMs
+    );
+    const indexValue = smoothed.value ?? rawIndex;
+
+    const jumpCheck = sanityCheckJump(runtime.lastComputedIndex, indexValue, market.maxJumpFraction);
+    if (!jumpCheck.ok) {
+      price.lastError = jumpCheck.reason;
+      console.warn(`[price] ${market.id}: sanity check failed: ${jumpCheck.reason}`);
+      return null;
+    }
+
+    price.value = indexValue;
+    price.timestamp = timestamp;
+    price.lastError = undefined;
+    runtime.lastComputedIndex = indexValue;
+    runtime.smoothing = smoothed;
+
+    if (config.adaptiveCadence) {
+      runtime.volatility = updateVolatility(runtime.volatility, rawIndex, timestamp, config.volHalfLifeMs);
+      refreshCadence(runtime);
+    }
+
+    return indexValue;
+  } catch (err) {
+    recordError(runtime, err);
+    return null;
+  }
+}
+
+function recordError(runtime: MarketRuntime, err: unknown) {
+  const message = err instanceof Error ? err.message : String(err);
+  runtime.price.stale = true;
+  runtime.price.lastError = message;
+  console.error(`[loop] ${runtime.market.id}: error`, err);
+}
+
+async function publishValue(runtime: MarketRuntime, value: number): Promise<void> {
+  const { market } = runtime;
+  try {
+    const result = await publishToHyperliquid(market, runtime.publish, value, {
+      priceChangeEpsilon: runtime.cadence.priceChangeEpsilon,
+      minPublishIntervalMs: runtime.cadence.minPublishIntervalMs,
+      nextNonce: runtime.nextNonce,
+    });
+    if (result.skipped && result.reason) {
+      console.log(`[HL] ${market.id}: skipped publish: ${result.reason}`);
+    }
+  } catch (err) {
+    recordError(runtime, err);
+  }
+}
+
+// Single-flight publisher with latest-value-wins backpressure: at most one
+// publish per market is in flight. Values offered meanwhile overwrite each
+// other in a one-slot mailbox, so a slow publisher sends fewer, newer values
+// instead of working through a backlog in order.
+function offerPublish(runtime: MarketRuntime, value: number) {
+  const { scheduler } = runtime;
+  if (runtime.stopped) {
+    return;
+  }
+  if (scheduler.publishInFlight) {
+    if (runtime.pendingValue !== null) {
+      scheduler.droppedTicks += 1;
+    }
+    runtime.pendingValue = value;
+    scheduler.queueDepth = 1;
+    return;
+  }
+
+  scheduler.publishInFlight = true;
+  runtime.publishing = (async () => {
+    let next: number | null = value;
+    while (next !== null && !runtime.stopped) {
+      await publishValue(runtime, next);
+      saveCheckpoint(runtime);
+      next = runtime.pendingValue;
+      runtime.pendingValue = null;
+      scheduler.queueDepth = 0;
+    }
+    scheduler.publishInFlight = false;
+    runtime.publishing = null;
+  })();
+}
+
+export async function runMarketTick(runtime: MarketRuntime): Promise<void> {
+  const started = Date.now();
+  const value = await computeMarketTick(runtime);
+  runtime.scheduler.ticks += 1;
+  runtime.scheduler.lastTickMs = Date.now() - started;
+  if (runtime.stopped) {
+    return;  // removed while the fetch was in flight
+  }
+  // Failed and rejected ticks leave the checkpoint alone so it never outlives
+  // (or re-dates) the last accepted state.
+  if (value !== null) {
+    saveCheckpoint(runtime);
+    offerPublish(runtime, value);
+  }
+}
+
+// Runs the market loop, rescheduling from tick completion so the (possibly
+// adaptive) interval is honoured and two ticks never overlap. Publishing runs
+// beside the loop (see offerPublish), so a slow publish lowers the publish
+// rate rather than delaying price fetches. Returns a function that stops the
+// loop and resolves once the tick and publish in flight (if any) have finished,
+// after which the runtime never publishes again.
+export function startMarketLoop(runtime: MarketRuntime, onTick?: (runtime: MarketRuntime) => void): () => Promise<void> {
+  let timer: NodeJS.Timeout | undefined;
+  let tick: Promise<void> | null = null;
+
+  const schedule = () => {
+    timer = setTimeout(() => {
+      tick = (async () => {
+        await runMarketTick(runtime);
+        if (!runtime.stopped) {
+          onTick?.(runtime);
+        }
+      })();
+      void tick.then(() => {
+        tick = null;
+        if (!runtime.stopped) {
+          schedule();
+        }
+      });
+    }, runtime.cadence.pollIntervalMs);
+  };
+  schedule();
+
+  return async () => {
+    runtime.stopped = true;
+    runtime.pendingValue = null;
+    if (timer) {
+      clearTimeout(timer);
+    }
+    await tick;
+    await runtime.publishing;
+  };
+}
+
+export function marketHealth(runtime: MarketRuntime): MarketHealth {
+  const { price, publish, cadence, scheduler } = runtime;
+  return {
+    market: runtime.market.id,
+    lastPrice: price.value || null,
+    lastUpdate: price.timestamp ? new Date(price.timestamp).toISOString() : null,
+    stale: price.stale,
+    publishes: publish.totalPublishes,
+    lastPublish: publish.lastPublish ? new Date(publish.lastPublish).toISOString() : null,
+    error: price.lastError ?? null,
+    sources: price.sources ?? null,
+    cadence: {
+      adaptive: cadence.adaptive,
+      pollIntervalMs: cadence.pollIntervalMs,
+      priceEpsilon: cadence.priceChangeEpsilon,
+      minPublishIntervalMs: cadence.minPublishIntervalMs,
+      sigma: cadence.sigma,
+    },
+    scheduler: { ...scheduler },
+  };
+}
@@ -0,0 +1,93 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { config } from './config';
+import { parseSmoothingMode, SmoothingMode } from './pipeline';
+
+export interface MarketConfig {
+  id: string;  // On-chain coin id, "<dex>:<ASSET>"
+  dex: string;
+  coin: string;  // Asset name (HL_COIN_SYMBOL), e.g. "GDR"
+  pythFeedId: string;
+  indexScale: number;
+  maxJumpFraction: number;
+  priceChangeEpsilon: number;
+  minPublishIntervalMs: number;
+  publishIntervalMs: number;
+  szDecimals: number;
+  smoothingMode: SmoothingMode;
+  smoothingWindowMs: number;
+}
+
+// Entry in MARKETS_FILE. Anything omitted falls back to the service-wide env config.
+type MarketFileEntry = Partial<Omit<MarketConfig, 'id' | 'smoothingMode'>> & {
+  coin: string;
+  pythFeedId: string;
+  smoothingMode?: string;
+};
+
+export function buildMarket(entry: MarketFileEntry): MarketConfig {
+  const dex = (entry.dex ?? config.hlDexName ?? '').toLowerCase();
+  if (!dex) {
+    throw new Error(`Market ${entry.coin} has no dex (set "dex" or HL_DEX_NAME)`);
+  }
+  const coin = entry.coin.toUpperCase();
+  return {
+    id: `${dex}:${coin}`,
+    dex,
+    coin,
+    pythFeedId: entry.pythFeedId,
+    indexScale: entry.indexScale ?? config.indexScale,
+    maxJumpFraction: entry.maxJumpFraction ?? config.maxJumpFraction,
+    priceChangeEpsilon: entry.priceChangeEpsilon ?? config.priceChangeEpsilon,
+    minPublishIntervalMs: entry.minPublishIntervalMs ?? config.minPublishIntervalMs,
+    publishIntervalMs: entry.publishIntervalMs ?? config.publishIntervalMs,
+    szDecimals: entry.szDecimals ?? config.hlSzDecimals,
+    smoothingMode: entry.smoothingMode !== undefined ? parseSmoothingMode(entry.smoothingMode) : config.smoothingMode,
+    smoothingWindowMs: entry.smoothingWindowMs ?? config.smoothingWindowMs,
+  };
+}
+
+// Parses and validates the contents of MARKETS_FILE. Throws on malformed input.
+export function parseMarkets(text: string, source: string): MarketConfig[] {
+  const entries = JSON.parse(text) as MarketFileEntry[];
+  if (!Array.isArray(entries) || entries.length === 0) {
+    throw new Error(`MARKETS_FILE ${source} must be a non-empty JSON array`);
+  }
+
+  const markets = entries.map(buildMarket);
+  const seen = new Set<string>();
+  for (const market of markets) {
+    if (seen.has(market.id)) {
+      throw new Error(`Duplicate market ${market.id} in ${source}`);
+    }
+    seen.add(market.id);
+  }
+  return markets;
+}
+
+export function marketsFilePath(): string | undefined {
+  return config.marketsFile ? path.resolve(process.cwd(), config.marketsFile) : undefined;
+}
+
+// Markets come from MARKETS_FILE when set, otherwise the single market described
+// by PYTH_FEED_ID / HL_DEX_NAME / HL_COIN_SYMBOL.
+export function loadMarkets(): MarketConfig[] {
+  const filePath = marketsFilePath();
+  if (!filePath) {
+    if (!config.hlCoinSymbol) {
+      throw new Error('Missing env var: HL_COIN_SYMBOL (or set MARKETS_FILE)');
+    }
+    return [buildMarket({ coin: config.hlCoinSymbol, pythFeedId: config.pythFeedId })];
+  }
+  return parseMarkets(fs.readFileSync(filePath, 'utf-8'), filePath);
+}
+
+export function groupByDex(markets: MarketConfig[]): Map<string, MarketConfig[]> {
+  const groups = new Map<string, MarketConfig[]>();
+  for (const market of markets) {
+    const group = groups.get(market.dex) ?? [];
+    group.push(market);
+    groups.set(market.dex, group);
+  }
+  return groups;
+}
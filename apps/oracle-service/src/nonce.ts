@@ -0,0 +1,17 @@
+// Nonces are millisecond timestamps that must be unique per signer. When several
+// shards sign with the same wallet each one draws from its own residue class
+// (nonce % count === index), so streams never collide and stay near wall time.
+export function createNonceStream(index = 0, count = 1): () => number {
+  if (count < 1 || index < 0 || index >= count) {
+    throw new Error(`Invalid nonce stream ${index}/${count}`);
+  }
+
+  let last = 0;
+  return () => {
+    let nonce = Math.max(Date.now(), last + 1);
+    const offset = (index - (nonce % count) + count) % count;
+    nonce += offset;
+    last = nonce;
+    return nonce;
+  };
+}
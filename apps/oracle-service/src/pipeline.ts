@@ -59,3 +59,183 @@ export function shouldPublishValue(
 }
 
 
+
+export interface VolatilityState {
+  lastValue: number | null;
+  lastTimestamp: number;
+  varianceRate: number;  // EWMA of squared log returns per second
+  samples: number;
+}
+
+export interface CadenceBounds {
+  baseIntervalMs: number;
+  minIntervalMs: number;
+  maxIntervalMs: number;
+  baseEpsilon: number;
+  minEpsilon: number;
+  maxEpsilon: number;
+  baseMinPublishIntervalMs: number;
+  maxMinPublishIntervalMs: number;
+  volHalfLifeMs: number;
+  volReference: number;  // sigma (fraction per sqrt second) at which the base interval applies
+  epsilonSigmaMultiple: number;
+}
+
+export interface Cadence {
+  pollIntervalMs: number;
+  priceChangeEpsilon: number;
+  minPublishIntervalMs: number;  // heartbeat: publish at least this often even without a material change
+  sigma: number | null;
+}
+
+export function createVolatilityState(): VolatilityState {
+  return { lastValue: null, lastTimestamp: 0, varianceRate: 0, samples: 0 };
+}
+
+// O(1) online estimate of realised volatility. Each log return is normalised by
+// the elapsed time and folded into an EWMA whose weight also depends on the
+// elapsed time, so irregular tick spacing does not bias the estimate.
+export function updateVolatility(
+  state: VolatilityState,
+  value: number,
+  timestamp: number,
+  halfLifeMs: number
+): VolatilityState {
+  if (state.lastValue === null || value <= 0 || state.lastValue <= 0) {
+    return { ...state, lastValue: value, lastTimestamp: timestamp };
+  }
+
+  const dtMs = timestamp - state.lastTimestamp;
+  if (dtMs <= 0) {
+    return state;
+  }
+
+  const logReturn = Math.log(value / state.lastValue);
+  const sampleRate = (logReturn * logReturn) / (dtMs / 1000);
+  const alpha = state.samples === 0 ? 1 : 1 - Math.pow(0.5, dtMs / Math.max(halfLifeMs, 1));
+
+  return {
+    lastValue: value,
+    lastTimestamp: timestamp,
+    varianceRate: state.varianceRate + alpha * (sampleRate - state.varianceRate),
+    samples: state.samples + 1,
+  };
+}
+
+function clamp(value: number, min: number, max: number): number {
+  return Math.min(Math.max(value, min), max);
+}
+
+// Scale poll interval inversely with volatility and set the publish threshold to
+// a multiple of the expected move over one interval, both within bounds. Above
+// the reference volatility the threshold is capped at maxEpsilon / ratio, so
+// tracking tightens in a shock instead of coarsening with sigma. Below it the
+// heartbeat stretches by 1 / ratio, so a flat feed stops rewriting the same
+// price every few seconds. Falls back to the static settings until a
+// volatility estimate exists.
+export function adaptiveCadence(state: VolatilityState, bounds: CadenceBounds): Cadence {
+  if (state.samples === 0 || state.lastValue === null) {
+    return {
+      pollIntervalMs: bounds.baseIntervalMs,
+      priceChangeEpsilon: bounds.baseEpsilon,
+      minPublishIntervalMs: bounds.baseMinPublishIntervalMs,
+      sigma: null,
+    };
+  }
+
+  const sigma = Math.sqrt(state.varianceRate);
+  const ratio = sigma / Math.max(bounds.volReference, 1e-12);
+  const pollIntervalMs = Math.round(
+    clamp(bounds.baseIntervalMs / Math.max(ratio, 1e-9), bounds.minIntervalMs, bounds.maxIntervalMs)
+  );
+  const expectedMove = sigma * Math.sqrt(pollIntervalMs / 1000) * state.lastValue;
+  const maxEpsilon = Math.max(bounds.minEpsilon, bounds.maxEpsilon / Math.max(ratio, 1));
+  const priceChangeEpsilon = clamp(bounds.epsilonSigmaMultiple * expectedMove, bounds.minEpsilon, maxEpsilon);
+  const minPublishIntervalMs = Math.round(
+    clamp(
+      bounds.baseMinPublishIntervalMs / Math.max(ratio, 1e-9),
+      bounds.baseMinPublishIntervalMs,
+      Math.max(bounds.maxMinPublishIntervalMs, bounds.baseMinPublishIntervalMs)
+    )
+  );
+
+  return { pollIntervalMs, priceChangeEpsilon, minPublishIntervalMs, sigma };
+}
+
+export type SmoothingMode = 'none' | 'ema' | 'twap' | 'conf';
+
+export interface SmoothingState {
+  value: number | null;  // smoothed output
+  last: number | null;  // last raw input
+  timestamp: number;
+  weight: number;  // twap: covered time (ms); conf: accumulated precision
+}
+
+export function createSmoothingState(): SmoothingState {
+  return { value: null, last: null, timestamp: 0, weight: 0 };
+}
+
+export function parseSmoothingMode(mode: string | undefined): SmoothingMode {
+  const normalized = (mode ?? 'none').toLowerCase();
+  if (normalized === 'none' || normalized === 'ema' || normalized === 'twap' || normalized === 'conf') {
+    return normalized;
+  }
+  throw new Error(`Unknown SMOOTHING_MODE: ${mode}`);
+}
+
+// O(1) smoothing stage between scaleToIndex and the jump check. Weights are
+// derived from the elapsed time, so irregular tick spacing is handled:
+//  - ema:  alpha = 1 - exp(-dt / window)
+//  - twap: time-weighted average over the last window, interpolating linearly
+//          between consecutive raw ticks (so the current reading counts and
+//          the output does not lag a tick behind); coverage older than the
+//          window is scaled out proportionally instead of being kept in a queue
+//  - conf: precision-weighted (1 / conf^2) blend whose prior weight decays
+//          with exp(-dt / window), so wide-confidence ticks move it less
+export function applySmoothing(
+  state: SmoothingState,
+  value: number,
+  timestamp: number,
+  conf: number | undefined,
+  mode: SmoothingMode,
+  windowMs: number
+): SmoothingState {
+  if (mode === 'none' || state.value === null || state.last === null || windowMs <= 0) {
+    return { value, last: value, timestamp, weight: mode === 'conf' ? precision(conf, value) : 0 };
+  }
+
+  const dt = timestamp - state.timestamp;
+  if (dt < 0) {
+    return state;
+  }
+
+  if (mode === 'ema') {
+    const alpha = 1 - Math.exp(-dt / windowMs);
+    return { value: state.value + alpha * (value - state.value), last: value, timestamp, weight: 0 };
+  }
+
+  if (mode === 'twap') {
+    const held = Math.min(dt, windowMs);
+    const prior = Math.min(state.weight, windowMs - held);
+    const covered = prior + held;
+    const segment = (state.last + value) / 2;
+    const twap = covered > 0 ? (state.value * prior + segment * held) / covered : state.value;
+    return { value: twap, last: value, timestamp, weight: covered };
+  }
+
+  const priorWeight = state.weight * Math.exp(-dt / windowMs);
+  const nextWeight = precision(conf, value);
+  const total = priorWeight + nextWeight;
+  return {
+    value: (state.value * priorWeight + value * nextWeight) / total,
+    last: value,
+    timestamp,
+    weight: total,
+  };
+}
+
+function precision(conf: number | undefined, value: number): number {
+  // Fall back to 1 bp of the value when Pyth does not report a confidence.
+  const width = conf !== undefined && conf > 0 ? conf : Math.abs(value) * 1e-4;
+  return 1 / Math.max(width * width, 1e-18);
+}
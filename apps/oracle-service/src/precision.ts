@@ -0,0 +1,27 @@
+// Hyperliquid perp price rules: at most 5 significant figures and at most
+// (6 - szDecimals) decimals; integer prices are always valid. Mirrors
+// scripts/warmarket/precision.py so both sides produce the same wire string.
+const PERP_MAX_DECIMALS = 6;
+const MAX_SIG_FIGS = 5;
+
+export function formatPerpPrice(value: number, szDecimals: number): string {
+  if (!Number.isFinite(value) || value <= 0) {
+    throw new Error(`Price must be finite and positive: ${value}`);
+  }
+  const maxDecimals = Math.max(0, PERP_MAX_DECIMALS - szDecimals);
+  const integerDigits = Math.floor(Math.log10(value)) + 1;
+  const decimals = Math.min(Math.max(MAX_SIG_FIGS - integerDigits, 0), maxDecimals);
+
+  // Strip binary noise (1.0049999 for 1.005) before rounding half up.
+  const mantissa = Math.floor(Number((value * 10 ** decimals).toFixed(6)) + 0.5);
+  if (mantissa <= 0) {
+    throw new Error(`Price ${value} rounds to zero at ${maxDecimals} decimals`);
+  }
+
+  let digits = String(mantissa);
+  if (decimals > 0) {
+    digits = digits.padStart(decimals + 1, '0');
+    digits = `${digits.slice(0, -decimals)}.${digits.slice(-decimals)}`.replace(/\.?0+$/, '');
+  }
+  return digits;
+}
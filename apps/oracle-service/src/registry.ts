@@ -0,0 +1,117 @@
+import * as fs from 'fs';
+import { config } from './config';
+import { closeMarketRuntime, createMarketRuntime, MarketRuntime, startMarketLoop, updateMarketConfig, validateMarketFeed } from './market';
+import { MarketConfig, marketsFilePath, parseMarkets } from './markets';
+
+export interface MarketDiff {
+  added: MarketConfig[];
+  removed: MarketConfig[];
+  changed: MarketConfig[];  // same id, different parameters (the new config)
+}
+
+export function diffMarkets(current: MarketConfig[], next: MarketConfig[]): MarketDiff {
+  const before = new Map(current.map((m) => [m.id, m]));
+  const after = new Map(next.map((m) => [m.id, m]));
+  return {
+    added: next.filter((m) => !before.has(m.id)),
+    removed: current.filter((m) => !after.has(m.id)),
+    changed: next.filter((m) => before.has(m.id) && JSON.stringify(before.get(m.id)) !== JSON.stringify(m)),
+  };
+}
+
+export function isEmptyDiff(diff: MarketDiff): boolean {
+  return !diff.added.length && !diff.removed.length && !diff.changed.length;
+}
+
+interface Entry {
+  runtime: MarketRuntime;
+  stop: () => Promise<void>;
+}
+
+// The live set of market loops in one thread. apply() diffs a new market list
+// against it: new markets get a loop, removed ones are stopped, and changed
+// ones have their parameters swapped in place without touching any other loop.
+// A removal resolves only after the market's in-flight tick and publish have
+// finished, and calls are serialized so a re-added id never runs beside its
+// old loop. Feed validation runs in the background and only logs.
+export class MarketRegistry {
+  private readonly entries = new Map<string, Entry>();
+  private applying: Promise<unknown> = Promise.resolve();
+
+  constructor(
+    private readonly nextNonce?: () => number,
+    private readonly onTick?: (runtime: MarketRuntime) => void
+  ) {}
+
+  markets(): MarketConfig[] {
+    return Array.from(this.entries.values(), (entry) => entry.runtime.market);
+  }
+
+  runtimes(): MarketRuntime[] {
+    return Array.from(this.entries.values(), (entry) => entry.runtime);
+  }
+
+  apply(markets: MarketConfig[]): Promise<MarketDiff> {
+    const result = this.applying.then(() => this.applyNow(markets));
+    this.applying = result.catch(() => undefined);
+    return result;
+  }
+
+  private async applyNow(markets: MarketConfig[]): Promise<MarketDiff> {
+    const diff = diffMarkets(this.markets(), markets);
+
+    await Promise.all(
+      diff.removed.map(async (market) => {
+        const entry = this.entries.get(market.id)!;
+        this.entries.delete(market.id);
+        await entry.stop();
+        closeMarketRuntime(entry.runtime);
+        console.log(`[registry] ${market.id}: removed`);
+      })
+    );
+
+    for (const market of diff.changed) {
+      const { runtime } = this.entries.get(market.id)!;
+      const feedChanged = runtime.market.pythFeedId !== market.pythFeedId;
+      updateMarketConfig(runtime, market);
+      console.log(`[registry] ${market.id}: parameters updated`);
+      if (feedChanged) {
+        void validateMarketFeed(market).catch((err) => console.warn(`[registry] ${market.id}: validation error`, err));
+      }
+    }
+
+    for (const market of diff.added) {
+      const runtime = createMarketRuntime(market, this.nextNonce);
+      this.entries.set(market.id, { runtime, stop: startMarketLoop(runtime, this.onTick) });
+      this.onTick?.(runtime);
+      console.log(`[registry] ${market.id}: started`);
+      void validateMarketFeed(market).catch((err) => console.warn(`[registry] ${market.id}: validation error`, err));
+    }
+
+    return diff;
+  }
+}
+
+// Polls MARKETS_FILE and calls onChange with the parsed market list whenever
+// the file changes. Files that fail to parse are logged and ignored, so a
+// half-written or broken edit leaves the running set untouched. Returns a
+// function that stops watching.
+export function watchMarketsFile(onChange: (markets: MarketConfig[]) => void): () => void {
+  const filePath = marketsFilePath();
+  if (!filePath || !config.marketsWatch) {
+    return () => undefined;
+  }
+
+  const listener = (curr: fs.Stats, prev: fs.Stats) => {
+    if (curr.mtimeMs === prev.mtimeMs && curr.size === prev.size) {
+      return;
+    }
+    fs.promises
+      .readFile(filePath, 'utf-8')
+      .then((text) => onChange(parseMarkets(text, filePath)))
+      .catch((err) => console.warn(`[registry] ignoring ${filePath}: ${err instanceof Error ? err.message : err}`));
+  };
+  fs.watchFile(filePath, { interval: config.marketsWatchIntervalMs }, listener);
+  console.log(`[registry] watching ${filePath}`);
+  return () => fs.unwatchFile(filePath, listener);
+}
@@ -1,8 +1,14 @@
-import { execSync } from 'child_process';
+import { execFile } from 'child_process';
 import * as path from 'path';
+import { promisify } from 'util';
 import { config } from '../config';
-import { publishStats } from '../state';
+import { MarketConfig } from '../markets';
+import { PublishStats } from '../state';
 import { shouldPublishValue } from '../pipeline';
+import { formatPerpPrice } from '../precision';
+import { SetOracleResult, signer } from './signer';
+
+const execFileAsync = promisify(execFile);
 
 export interface PublishResult {
   ok: boolean;
@@ -10,10 +16,18 @@ export interface PublishResult {
   reason?: string;
 }
 
-let lastPublishedValue: number | null = null;
-let lastPublishTimestamp = 0;
+export interface PublishOptions {
+  priceChangeEpsilon: number;
+  minPublishIntervalMs: number;
+  nextNonce?: () => number;
+}
 
-export async function publishToHyperliquid(value: number): Promise<PublishResult> {
+export async function publishToHyperliquid(
+  market: MarketConfig,
+  stats: PublishStats,
+  value: number,
+  options: PublishOptions
+): Promise<PublishResult> {
   const now = Date.now();
 
   if (!config.hlPublishEnabled) {
@@ -22,24 +36,16 @@ export async function publishToHyperliquid(value: number): Promise<PublishResult
 
   const { publish, reason } = shouldPublishValue(
     value,
-    lastPublishedValue,
-    lastPublishTimestamp,
+    stats.lastPublishedValue,
+    stats.lastPublish ?? 0,
     now,
-    config.priceChangeEpsilon,
-    config.minPublishIntervalMs
+    options.priceChangeEpsilon,
+    options.minPublishIntervalMs
   );
   if (!publish) {
     return { ok: true, skipped: true, reason };
   }
 
-  if (!config.hlCoinSymbol) {
-    return { ok: false, reason: 'Missing HL_COIN_SYMBOL' };
-  }
-
-  if (!config.hlDexName) {
-    return { ok: false, reason: 'Missing HL_DEX_NAME' };
-  }
-
   // Hyperliquid setOracle action for HIP-3 markets
   // Correct structure: perpDeploy with setOracle
   // Based on: https://hyperliquid.gitbook.io/hyperliquid-docs/for-developers/api/hip-3-deployer-actions
@@ -59,8 +65,9 @@ export async function publishToHyperliquid(value: number): Promise<PublishResult
   //   signature: { r, s, v }
   // }
 
-  // Format price as string (Hyperliquid expects string prices)
-  const priceStr = value.toFixed(8);  // Use sufficient precision
+  // Format price as string (Hyperliquid expects string prices). Values the asset
+  // cannot represent throw here, before a nonce is spent on signing.
+  const priceStr = formatPerpPrice(value, market.szDecimals);
 
   // setOracle action structure for HIP-3
   // Based on Python SDK: perp_deploy_set_oracle
@@ -71,7 +78,7 @@ export async function publishToHyperliquid(value: number): Promise<PublishResult
 
   // Build oracle price dict (coin -> price)
   const oraclePxsDict: Record<string, string> = {
-    [config.hlCoinSymbol]: priceStr,
+    [market.coin]: priceStr,
   };
   
   // Convert to sorted array of [coin, price] pairs (wire format)
@@ -82,42 +89,29 @@ export async function publishToHyperliquid(value: number): Promise<PublishResult
   
   // External perp prices (optional - same as oracle for now)
   const externalPerpPxsDict: Record<string, string> = {
-    [config.hlCoinSymbol]: priceStr,
+    [market.coin]: priceStr,
   };
   const externalPerpPxs = Object.entries(externalPerpPxsDict).sort(([a], [b]) => a.localeCompare(b));
 
   // Use Python SDK for setOracle (canonical signing implementation)
   // This avoids the message hash mismatch issue described in Hyperliquid docs
-  const scriptPath = path.join(__dirname, '../../scripts/set-oracle.py');
-  
-  console.log(`[HL] Publishing setOracle via Python SDK: dex=${config.hlDexName}, coin=${config.hlCoinSymbol}, price=${priceStr}`);
+  console.log(`[HL] Publishing setOracle via Python SDK: dex=${market.dex}, coin=${market.coin}, price=${priceStr}`);
   
   try {
-    // Call Python script with price
-    const output = execSync(
-      `python3 "${scriptPath}" "${priceStr}"`,
-      {
-        cwd: path.join(__dirname, '../..'),
-        encoding: 'utf-8',
-        env: {
-          ...process.env,
-          NETWORK: config.network,
-        },
-      }
-    );
-    
-    const result = JSON.parse(output.trim());
+    const nonce = options.nextNonce?.();
+    const result = config.hlPersistentSigner
+      ? await signer.setOracle({ dex: market.dex, coin: market.coin, price: priceStr, nonce })
+      : await runSetOracleScript(market, priceStr, nonce);
     
     if (!result.ok) {
       throw new Error(`HL publish failed: ${result.response || result.error || 'Unknown error'}`);
     }
     
-    console.log(`[HL] setOracle successful: ${result.response || 'ok'}`);
+    console.log(`[HL] setOracle successful (${market.id}): ${result.response || 'ok'}`);
 
-    lastPublishedValue = value;
-    lastPublishTimestamp = now;
-    publishStats.lastPublish = now;
-    publishStats.totalPublishes += 1;
+    stats.lastPublishedValue = value;
+    stats.lastPublish = now;
+    stats.totalPublishes += 1;
 
     return { ok: true };
   } catch (error) {
@@ -125,3 +119,21 @@ export async function publishToHyperliquid(value: number): Promise<PublishResult
     throw new Error(`HL publish error: ${message}`);
   }
 }
+
+// One set-oracle.py process per publish (HL_PERSISTENT_SIGNER=false). Async so
+// other markets' ticks and /health keep running while the script signs and posts.
+async function runSetOracleScript(market: MarketConfig, priceStr: string, nonce?: number): Promise<SetOracleResult> {
+  const scriptPath = path.join(__dirname, '../../scripts/set-oracle.py');
+  const { stdout: output } = await execFileAsync('python3', [scriptPath, priceStr], {
+    cwd: path.join(__dirname, '../..'),
+    encoding: 'utf-8',
+    env: {
+      ...process.env,
+      NETWORK: config.network,
+      HL_DEX_NAME: market.dex,
+      HL_COIN_SYMBOL: market.coin,
+      ...(nonce !== undefined ? { HL_NONCE: String(nonce) } : {}),
+    },
+  });
+  return JSON.parse(output.trim());
+}
@@ -0,0 +1,121 @@
+import { request } from 'undici';
+import { config } from '../config';
+import { MarketConfig } from '../markets';
+import { PriceSources } from '../state';
+import { fetchOnce, fetchPythPrice, PythPriceResult } from './pyth';
+
+export interface MarketPriceResult extends PythPriceResult {
+  sources: PriceSources;
+}
+
+interface Source {
+  name: string;
+  fetch: (market: MarketConfig, signal: AbortSignal) => Promise<PythPriceResult>;
+}
+
+type AllMidsResponse = Record<string, string>;
+
+function hermesSource(baseUrl: string): Source {
+  return {
+    name: new URL(baseUrl).host,
+    fetch: (market, signal) => fetchOnce(market.pythFeedId, baseUrl, signal),
+  };
+}
+
+// Our own book's mid, converted back to raw feed units so it can sit in the
+// same median as the Hermes readings.
+const hlMidSource: Source = {
+  name: 'hl-mid',
+  fetch: async (market, signal) => {
+    const response = await request(`${config.hlUrl}/info`, {
+      method: 'POST',
+      headers: { 'content-type': 'application/json' },
+      body: JSON.stringify({ type: 'allMids', dex: market.dex }),
+      signal,
+    });
+    if (response.statusCode !== 200) {
+      throw new Error(`HL info error (${response.statusCode})`);
+    }
+    const mids = (await response.body.json()) as AllMidsResponse;
+    const mid = Number(mids[market.id]);
+    if (!Number.isFinite(mid) || mid <= 0) {
+      throw new Error(`No mid for ${market.id}`);
+    }
+    return { value: mid * market.indexScale, timestamp: Date.now() };
+  },
+};
+
+function configuredSources(): Source[] {
+  const urls = Array.from(new Set([config.pythApiUrl, ...config.pythApiUrls]));
+  const sources = urls.map(hermesSource);
+  if (config.priceSourceHlMid) {
+    sources.push(hlMidSource);
+  }
+  return sources;
+}
+
+const sources = configuredSources();
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+}
+
+// Queries every configured source in parallel under one deadline and returns the
+// median of the readings that agree. Tick latency is bounded by PRICE_DEADLINE_MS
+// however slow an individual endpoint is; there are no per-source retries.
+export async function fetchQuorumPrice(market: MarketConfig): Promise<MarketPriceResult> {
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), config.priceDeadlineMs);
+  const settled = await Promise.allSettled(sources.map((source) => source.fetch(market, controller.signal)));
+  clearTimeout(timer);
+
+  const now = Date.now();
+  const result: PriceSources = { used: [], rejected: [], failed: [] };
+  const readings: { name: string; reading: PythPriceResult }[] = [];
+  settled.forEach((outcome, idx) => {
+    const name = sources[idx].name;
+    if (outcome.status === 'rejected') {
+      result.failed.push(name);
+    } else if (now - outcome.value.timestamp > config.staleThresholdMs) {
+      result.rejected.push(name);
+    } else {
+      readings.push({ name, reading: outcome.value });
+    }
+  });
+
+  const quorum = config.priceQuorum > 0 ? config.priceQuorum : Math.floor(sources.length / 2) + 1;
+  const center = readings.length ? median(readings.map((r) => r.reading.value)) : 0;
+  const accepted = readings.filter(({ name, reading }) => {
+    const ok = Math.abs(reading.value - center) <= center * config.priceOutlierFraction;
+    (ok ? result.used : result.rejected).push(name);
+    return ok;
+  });
+
+  if (result.rejected.length || result.failed.length) {
+    console.warn(
+      `[price] ${market.id}: used ${result.used.join(',') || 'none'}; rejected ${result.rejected.join(',') || 'none'}; failed ${result.failed.join(',') || 'none'}`
+    );
+  }
+  if (accepted.length < quorum) {
+    throw new Error(`Price quorum not met for ${market.id}: ${accepted.length} source(s) agree, ${quorum} required`);
+  }
+
+  const confs = accepted.map((r) => r.reading.conf).filter((c): c is number => c !== undefined);
+  return {
+    value: median(accepted.map((r) => r.reading.value)),
+    timestamp: Math.max(...accepted.map((r) => r.reading.timestamp)),
+    conf: confs.length ? median(confs) : undefined,
+    sources: result,
+  };
+}
+
+// Single configured source keeps the original fetch-with-retries path.
+export async function fetchMarketPrice(market: MarketConfig): Promise<MarketPriceResult> {
+  if (sources.length > 1) {
+    return fetchQuorumPrice(market);
+  }
+  const reading = await fetchPythPrice(market.pythFeedId);
+  return { ...reading, sources: { used: [sources[0].name], rejected: [], failed: [] } };
+}
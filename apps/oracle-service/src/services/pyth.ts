@@ -4,16 +4,19 @@ import { config } from '../config';
 export interface PythPriceResult {
   value: number;
   timestamp: number;
+  conf?: number;
 }
 
 type PythApiResponse = {
   price?: {
     price: string;
+    conf?: string;
     expo: number;
     publish_time?: number;
   };
   ema_price?: {
     price: string;
+    conf?: string;
     expo: number;
     publish_time?: number;
   };
@@ -45,14 +48,18 @@ function validatePrice(value: number, timestamp: number) {
   }
 }
 
-async function fetchOnce(feedId: string): Promise<PythPriceResult> {
-  const url = new URL(`${config.pythApiUrl}/latest_price_feeds`);
+export async function fetchOnce(
+  feedId: string,
+  baseUrl: string = config.pythApiUrl,
+  signal?: AbortSignal
+): Promise<PythPriceResult> {
+  const url = new URL(`${baseUrl}/latest_price_feeds`);
   url.searchParams.append('ids[]', feedId);
   if (config.pythCluster) {
     url.searchParams.append('cluster', config.pythCluster);
   }
 
-  const response = await request(url, { method: 'GET' });
+  const response = await request(url, { method: 'GET', signal });
   if (response.statusCode !== 200) {
     const body = await response.body.text();
     throw new Error(`Pyth API error (${response.statusCode}): ${body}`);
@@ -70,11 +77,12 @@ async function fetchOnce(feedId: string): Promise<PythPriceResult> {
   }
 
   const value = decodePrice(priceData.price, priceData.expo ?? DEFAULT_EXPO);
+  const conf = priceData.conf !== undefined ? decodePrice(priceData.conf, priceData.expo ?? DEFAULT_EXPO) : undefined;
   const publishTimeSec = priceData.publish_time ?? Math.floor(Date.now() / 1000);
   const timestamp = publishTimeSec * 1000;
 
   validatePrice(value, timestamp);
-  return { value, timestamp };
+  return { value, timestamp, conf };
 }
 
 function sleep(ms: number): Promise<void> {
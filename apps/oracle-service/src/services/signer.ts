@@ -0,0 +1,110 @@
+import { ChildProcessWithoutNullStreams, spawn } from 'child_process';
+import * as path from 'path';
+import * as readline from 'readline';
+import { config } from '../config';
+
+export interface SetOracleRequest {
+  dex: string;
+  coin: string;
+  price: string;
+  nonce?: number;
+}
+
+export interface SetOracleResult {
+  ok: boolean;
+  status?: string;
+  response?: unknown;
+  error?: string;
+  price?: string;
+}
+
+interface Pending {
+  resolve: (result: SetOracleResult) => void;
+  reject: (err: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+// Keeps one `set-oracle.py --serve` process alive and sends it one JSON line per
+// setOracle. The wallet, Exchange, WebSocket transport and journal are set up
+// once instead of per publish, so a publish costs a sign plus a post rather than
+// an interpreter start, SDK import and fresh connection. Replies are matched by
+// id, so publishes for different markets run concurrently. If the process dies,
+// in-flight requests fail (the caller treats that like any publish error) and
+// the next request starts a new one.
+class PersistentSigner {
+  private child: ChildProcessWithoutNullStreams | null = null;
+  private readonly pending = new Map<number, Pending>();
+  private nextId = 1;
+
+  setOracle(request: SetOracleRequest): Promise<SetOracleResult> {
+    const child = this.ensure();
+    const id = this.nextId++;
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`signer timed out after ${config.signerTimeoutMs}ms`));
+      }, config.signerTimeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+      child.stdin.write(`${JSON.stringify({ id, ...request })}\n`);
+    });
+  }
+
+  private ensure(): ChildProcessWithoutNullStreams {
+    if (this.child) {
+      return this.child;
+    }
+    const root = path.join(__dirname, '../..');
+    const child = spawn('python3', [path.join(root, 'scripts/set-oracle.py'), '--serve'], {
+      cwd: root,
+      env: { ...process.env, NETWORK: config.network },
+    });
+    console.log(`[HL] started persistent signer (pid ${child.pid})`);
+
+    readline.createInterface({ input: child.stdout }).on('line', (line) => {
+      let result: SetOracleResult & { id?: number };
+      try {
+        result = JSON.parse(line);
+      } catch {
+        console.warn(`[HL] signer: unparseable output: ${line.slice(0, 200)}`);
+        return;
+      }
+      const entry = result.id !== undefined ? this.pending.get(result.id) : undefined;
+      if (entry) {
+        this.pending.delete(result.id!);
+        clearTimeout(entry.timer);
+        entry.resolve(result);
+      }
+    });
+    child.stderr.on('data', (chunk: Buffer) => process.stderr.write(chunk));
+    child.stdin.on('error', () => undefined);  // surfaced through 'exit'
+    child.on('exit', (code, signal) => {
+      console.warn(`[HL] persistent signer exited (${signal ?? code}); restarting on next publish`);
+      this.fail(child, new Error('signer exited'));
+    });
+    // Spawn failures (python3 missing, EACCES) arrive here, possibly without an
+    // 'exit'; unhandled they would take the whole service down.
+    child.on('error', (err) => {
+      console.error('[HL] persistent signer error', err);
+      child.kill();
+      this.fail(child, new Error(`signer error: ${err.message}`));
+    });
+
+    this.child = child;
+    return child;
+  }
+
+  // Forgets a dead child and rejects everything still waiting on it.
+  private fail(child: ChildProcessWithoutNullStreams, err: Error) {
+    if (this.child === child) {
+      this.child = null;
+    }
+    for (const [id, entry] of this.pending) {
+      clearTimeout(entry.timer);
+      entry.reject(err);
+      this.pending.delete(id);
+    }
+  }
+}
+
+// One signer per thread: each shard worker gets its own process.
+export const signer = new PersistentSigner();
@@ -0,0 +1,293 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { config } from './config';
+import { MarketConfig } from './markets';
+import {
+  applySmoothing,
+  createSmoothingState,
+  parseSmoothingMode,
+  sanityCheckJump,
+  scaleToIndex,
+  shouldPublishValue,
+  SmoothingState,
+} from './pipeline';
+import { PythPriceResult } from './services/pyth';
+
+// Parameters a shadow may override. Anything omitted follows the live market.
+type ShadowOverrides = Partial<
+  Pick<
+    MarketConfig,
+    'indexScale' | 'maxJumpFraction' | 'priceChangeEpsilon' | 'minPublishIntervalMs' | 'smoothingMode' | 'smoothingWindowMs'
+  >
+>;
+
+// Entry in SHADOW_FILE.
+interface ShadowFileEntry extends Omit<ShadowOverrides, 'smoothingMode'> {
+  name: string;
+  markets?: string[];  // market ids; omitted = every market
+  smoothingMode?: string;
+}
+
+export interface ShadowDefinition {
+  name: string;
+  markets?: string[];
+  overrides: ShadowOverrides;
+}
+
+// One tick as a shadow saw it, kept in the history store.
+export interface ShadowRecord {
+  ts: number;
+  shadow: string;
+  market: string;
+  raw: number;
+  live: number | null;  // live computed index (null when live rejected the tick)
+  value: number | null;  // shadow index (null when the shadow rejected the tick)
+  divergence: number | null;  // relative gap to live, compared in raw feed units
+  wouldPublish: boolean;
+  reason?: string;
+}
+
+export interface ShadowStats {
+  shadow: string;
+  market: string;
+  config: ShadowOverrides;
+  ticks: number;
+  rejected: number;  // stale or failed the shadow's jump check
+  wouldPublish: number;
+  lastValue: number | null;
+  lastDivergence: number | null;
+  meanAbsDivergence: number | null;
+  maxAbsDivergence: number | null;
+}
+
+// A candidate configuration riding on a live market's ticks. It runs the same
+// scale -> smoothing -> jump check -> publish decision stages as the live loop
+// but keeps its own state and never signs or posts anything.
+export interface ShadowPipeline {
+  definition: ShadowDefinition;
+  market: MarketConfig;  // live market with the overrides applied
+  smoothing: SmoothingState;
+  lastComputedIndex: number | null;
+  lastPublishedValue: number | null;
+  lastPublish: number;
+  stats: ShadowStats;
+  divergenceSamples: number;
+  divergenceSum: number;
+  history: ShadowRecord[];  // ring of the last SHADOW_HISTORY_SIZE records; read it with shadowHistory()
+  historyHead: number;  // slot the next record overwrites once the ring is full
+  historyFile: fs.WriteStream | null;
+}
+
+function parseDefinitions(text: string, source: string): ShadowDefinition[] {
+  const entries = JSON.parse(text) as ShadowFileEntry[];
+  if (!Array.isArray(entries)) {
+    throw new Error(`SHADOW_FILE ${source} must be a JSON array`);
+  }
+  return entries.map(({ name, markets, smoothingMode, ...overrides }) => {
+    if (!name) {
+      throw new Error(`Shadow without a name in ${source}`);
+    }
+    return {
+      name,
+      markets: markets?.map((m) => m.toLowerCase()),
+      overrides: smoothingMode !== undefined ? { ...overrides, smoothingMode: parseSmoothingMode(smoothingMode) } : overrides,
+    };
+  });
+}
+
+let definitions: ShadowDefinition[] | null = null;
+
+export function loadShadowDefinitions(): ShadowDefinition[] {
+  if (definitions === null) {
+    const filePath = config.shadowFile ? path.resolve(process.cwd(), config.shadowFile) : undefined;
+    definitions = filePath ? parseDefinitions(fs.readFileSync(filePath, 'utf-8'), filePath) : [];
+  }
+  return definitions;
+}
+
+function openHistoryFile(name: string, market: MarketConfig): fs.WriteStream | null {
+  if (!config.shadowHistoryDir) {
+    return null;
+  }
+  const dir = path.resolve(process.cwd(), config.shadowHistoryDir);
+  fs.mkdirSync(dir, { recursive: true });
+  const file = path.join(dir, `${name}_${market.id}.jsonl`.replace(/[^A-Za-z0-9_.-]/g, '_'));
+  const stream = fs.createWriteStream(file, { flags: 'a' });
+  stream.on('error', (err) => console.warn(`[shadow] ${name}: history write failed`, err));
+  return stream;
+}
+
+export function createShadows(market: MarketConfig): ShadowPipeline[] {
+  return loadShadowDefinitions()
+    .filter((def) => !def.markets || def.markets.includes(market.id.toLowerCase()))
+    .map((definition) => ({
+      definition,
+      market: { ...market, ...definition.overrides },
+      smoothing: createSmoothingState(),
+      lastComputedIndex: null,
+      lastPublishedValue: null,
+      lastPublish: 0,
+      stats: {
+        shadow: definition.name,
+        market: market.id,
+        config: definition.overrides,
+        ticks: 0,
+        rejected: 0,
+        wouldPublish: 0,
+        lastValue: null,
+        lastDivergence: null,
+        meanAbsDivergence: null,
+        maxAbsDivergence: null,
+      },
+      divergenceSamples: 0,
+      divergenceSum: 0,
+      history: [],
+      historyHead: 0,
+      historyFile: openHistoryFile(definition.name, market),
+    }));
+}
+
+// Hot reload: re-applies each shadow's overrides on top of the new live config
+// and resets state under the same conditions as updateMarketConfig does for the
+// live market, so no shadow compares a new feed or scale against old values.
+export function rebaseShadows(shadows: ShadowPipeline[], market: MarketConfig) {
+  for (const shadow of shadows) {
+    const previous = shadow.market;
+    const next = { ...market, ...shadow.definition.overrides };
+    shadow.market = next;
+
+    if (previous.pythFeedId !== next.pythFeedId || previous.indexScale !== next.indexScale) {
+      shadow.lastComputedIndex = null;
+      shadow.lastPublishedValue = null;
+      shadow.lastPublish = 0;
+      shadow.smoothing = createSmoothingState();
+    } else if (previous.smoothingMode !== next.smoothingMode || previous.smoothingWindowMs !== next.smoothingWindowMs) {
+      shadow.smoothing = createSmoothingState();
+    }
+  }
+}
+
+// The newest `limit` records of a shadow's ring, oldest first.
+export function shadowHistory(shadow: ShadowPipeline, limit: number): ShadowRecord[] {
+  const { history, historyHead } = shadow;
+  const count = Math.max(0, Math.min(limit, history.length));
+  const records: ShadowRecord[] = [];
+  for (let i = history.length - count; i < history.length; i++) {
+    records.push(history[(historyHead + i) % history.length]);
+  }
+  return records;
+}
+
+export function closeShadows(shadows: ShadowPipeline[]) {
+  shadows.forEach((shadow) => shadow.historyFile?.end());
+}
+
+function runShadow(
+  shadow: ShadowPipeline,
+  reading: PythPriceResult,
+  liveIndex: number | null,
+  liveScale: number,
+  now: number
+): ShadowRecord {
+  const { market } = shadow;
+  const raw = scaleToIndex(reading.value, market.indexScale);
+  const record: ShadowRecord = {
+    ts: now,
+    shadow: shadow.definition.name,
+    market: market.id,
+    raw,
+    live: liveIndex,
+    value: null,
+    divergence: null,
+    wouldPublish: false,
+  };
+
+  if (now - reading.timestamp > config.staleThresholdMs) {
+    record.reason = 'stale';
+    return record;
+  }
+
+  const smoothed = applySmoothing(
+    shadow.smoothing,
+    raw,
+    reading.timestamp,
+    reading.conf !== undefined ? scaleToIndex(reading.conf, market.indexScale) : undefined,
+    market.smoothingMode,
+    market.smoothingWindowMs
+  );
+  const value = smoothed.value ?? raw;
+  const jump = sanityCheckJump(shadow.lastComputedIndex, value, market.maxJumpFraction);
+  if (!jump.ok) {
+    record.reason = jump.reason;
+    return record;
+  }
+  shadow.smoothing = smoothed;
+  shadow.lastComputedIndex = value;
+  record.value = value;
+
+  // A shadow may override indexScale, so both sides go back to feed units first.
+  if (liveIndex !== null && liveIndex !== 0) {
+    const live = liveIndex * liveScale;
+    record.divergence = (value * market.indexScale - live) / live;
+  }
+
+  const decision = shouldPublishValue(
+    value,
+    shadow.lastPublishedValue,
+    shadow.lastPublish,
+    now,
+    market.priceChangeEpsilon,
+    market.minPublishIntervalMs
+  );
+  record.wouldPublish = decision.publish;
+  record.reason = decision.reason;
+  if (decision.publish) {
+    shadow.lastPublishedValue = value;
+    shadow.lastPublish = now;
+  }
+  return record;
+}
+
+function recordShadow(shadow: ShadowPipeline, entry: ShadowRecord) {
+  const { stats } = shadow;
+  stats.ticks += 1;
+  if (entry.value === null) {
+    stats.rejected += 1;
+  } else {
+    stats.lastValue = entry.value;
+  }
+  if (entry.wouldPublish) {
+    stats.wouldPublish += 1;
+  }
+  if (entry.divergence !== null) {
+    const abs = Math.abs(entry.divergence);
+    shadow.divergenceSamples += 1;
+    shadow.divergenceSum += abs;
+    stats.lastDivergence = entry.divergence;
+    stats.meanAbsDivergence = shadow.divergenceSum / shadow.divergenceSamples;
+    stats.maxAbsDivergence = Math.max(stats.maxAbsDivergence ?? 0, abs);
+  }
+
+  // Fill up to SHADOW_HISTORY_SIZE, then overwrite the oldest slot in place.
+  if (shadow.history.length < config.shadowHistorySize) {
+    shadow.history.push(entry);
+  } else if (config.shadowHistorySize > 0) {
+    shadow.history[shadow.historyHead] = entry;
+    shadow.historyHead = (shadow.historyHead + 1) % shadow.history.length;
+  }
+  shadow.historyFile?.write(`${JSON.stringify(entry)}\n`);
+}
+
+// Feeds one fetched reading through every shadow. liveScale is the live
+// market's indexScale. Errors are contained here so a broken candidate can
+// never affect the live tick.
+export function runShadows(shadows: ShadowPipeline[], reading: PythPriceResult, liveIndex: number | null, liveScale: number) {
+  const now = Date.now();
+  for (const shadow of shadows) {
+    try {
+      recordShadow(shadow, runShadow(shadow, reading, liveIndex, liveScale, now));
+    } catch (err) {
+      console.warn(`[shadow] ${shadow.definition.name} ${shadow.market.id}: error`, err);
+    }
+  }
+}
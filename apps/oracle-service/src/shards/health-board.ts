@@ -0,0 +1,150 @@
+import { MarketRuntime } from '../market';
+import { MarketHealth, PriceSources } from '../state';
+
+// Fixed-size per-market slots in a SharedArrayBuffer. Each slot has exactly one
+// writer (the shard that owns the market) and is guarded by a seqlock: the
+// writer makes the sequence odd while it writes, readers retry until they see
+// the same even sequence before and after copying the slot.
+//
+// Slot layout (bytes):
+//   0   int32   sequence
+//   4   int32   error length
+//   8   f64[16] fields (see FIELD_*)
+//   136 u8[240] error message (UTF-8, truncated)
+//   376 int32   sources length
+//   380 u8[252] price sources as JSON (dropped if it does not fit)
+const FIELD_VALUE = 0;
+const FIELD_TIMESTAMP = 1;
+const FIELD_STALE = 2;
+const FIELD_PUBLISHES = 3;
+const FIELD_LAST_PUBLISH = 4;
+const FIELD_POLL_INTERVAL = 5;
+const FIELD_EPSILON = 6;
+const FIELD_SIGMA = 7;
+const FIELD_ADAPTIVE = 8;
+const FIELD_HEARTBEAT = 9;
+const FIELD_TICKS = 10;
+const FIELD_LAST_TICK_MS = 11;
+const FIELD_QUEUE_DEPTH = 12;
+const FIELD_DROPPED_TICKS = 13;
+const FIELD_PUBLISH_IN_FLIGHT = 14;
+const FIELD_MIN_PUBLISH_INTERVAL = 15;
+const FIELD_COUNT = 16;
+
+const HEADER_BYTES = 8;
+const ERROR_OFFSET = HEADER_BYTES + FIELD_COUNT * 8;
+const ERROR_BYTES = 240;
+const SOURCES_LENGTH_OFFSET = ERROR_OFFSET + ERROR_BYTES;
+const SOURCES_OFFSET = SOURCES_LENGTH_OFFSET + 4;
+const SOURCES_BYTES = 252;
+const SLOT_BYTES = SOURCES_OFFSET + SOURCES_BYTES;
+const MAX_READ_RETRIES = 100;
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+export function createHealthBuffer(slots: number): SharedArrayBuffer {
+  return new SharedArrayBuffer(slots * SLOT_BYTES);
+}
+
+export class HealthBoard {
+  private readonly ints: Int32Array;
+  private readonly floats: Float64Array;
+  private readonly bytes: Uint8Array;
+
+  constructor(buffer: SharedArrayBuffer) {
+    this.ints = new Int32Array(buffer);
+    this.floats = new Float64Array(buffer);
+    this.bytes = new Uint8Array(buffer);
+  }
+
+  write(slot: number, runtime: MarketRuntime): void {
+    const base = slot * SLOT_BYTES;
+    const seq = base / 4;
+    const f = (base + HEADER_BYTES) / 8;
+    const { price, publish, cadence, scheduler } = runtime;
+
+    Atomics.add(this.ints, seq, 1);
+    this.floats[f + FIELD_VALUE] = price.value;
+    this.floats[f + FIELD_TIMESTAMP] = price.timestamp;
+    this.floats[f + FIELD_STALE] = price.stale ? 1 : 0;
+    this.floats[f + FIELD_PUBLISHES] = publish.totalPublishes;
+    this.floats[f + FIELD_LAST_PUBLISH] = publish.lastPublish ?? 0;
+    this.floats[f + FIELD_POLL_INTERVAL] = cadence.pollIntervalMs;
+    this.floats[f + FIELD_EPSILON] = cadence.priceChangeEpsilon;
+    this.floats[f + FIELD_MIN_PUBLISH_INTERVAL] = cadence.minPublishIntervalMs;
+    this.floats[f + FIELD_SIGMA] = cadence.sigma ?? Number.NaN;
+    this.floats[f + FIELD_ADAPTIVE] = cadence.adaptive ? 1 : 0;
+    this.floats[f + FIELD_HEARTBEAT] = Date.now();
+    this.floats[f + FIELD_TICKS] = scheduler.ticks;
+    this.floats[f + FIELD_LAST_TICK_MS] = scheduler.lastTickMs;
+    this.floats[f + FIELD_QUEUE_DEPTH] = scheduler.queueDepth;
+    this.floats[f + FIELD_DROPPED_TICKS] = scheduler.droppedTicks;
+    this.floats[f + FIELD_PUBLISH_IN_FLIGHT] = scheduler.publishInFlight ? 1 : 0;
+
+    const error = price.lastError ? encoder.encode(price.lastError).subarray(0, ERROR_BYTES) : new Uint8Array(0);
+    this.bytes.set(error, base + ERROR_OFFSET);
+    this.ints[seq + 1] = error.length;
+
+    const sources = price.sources ? encoder.encode(JSON.stringify(price.sources)) : new Uint8Array(0);
+    const sourcesLength = sources.length <= SOURCES_BYTES ? sources.length : 0;
+    this.bytes.set(sources.subarray(0, sourcesLength), base + SOURCES_OFFSET);
+    this.ints[(base + SOURCES_LENGTH_OFFSET) / 4] = sourcesLength;
+    Atomics.add(this.ints, seq, 1);
+  }
+
+  read(slot: number, market: string): (MarketHealth & { heartbeat: number }) | null {
+    const base = slot * SLOT_BYTES;
+    const seq = base / 4;
+    const f = (base + HEADER_BYTES) / 8;
+
+    for (let attempt = 0; attempt < MAX_READ_RETRIES; attempt++) {
+      const before = Atomics.load(this.ints, seq);
+      if (before % 2 === 1) {
+        continue;
+      }
+      if (before === 0) {
+        return null;  // never written
+      }
+
+      const fields = this.floats.slice(f, f + FIELD_COUNT);
+      const errorLength = this.ints[seq + 1];
+      const error = errorLength > 0 ? this.bytes.slice(base + ERROR_OFFSET, base + ERROR_OFFSET + errorLength) : null;
+      const sourcesLength = this.ints[(base + SOURCES_LENGTH_OFFSET) / 4];
+      const sources = sourcesLength > 0 ? this.bytes.slice(base + SOURCES_OFFSET, base + SOURCES_OFFSET + sourcesLength) : null;
+
+      if (Atomics.load(this.ints, seq) !== before) {
+        continue;
+      }
+
+      const sigma = fields[FIELD_SIGMA];
+      return {
+        market,
+        lastPrice: fields[FIELD_VALUE] || null,
+        lastUpdate: fields[FIELD_TIMESTAMP] ? new Date(fields[FIELD_TIMESTAMP]).toISOString() : null,
+        stale: fields[FIELD_STALE] === 1,
+        publishes: fields[FIELD_PUBLISHES],
+        lastPublish: fields[FIELD_LAST_PUBLISH] ? new Date(fields[FIELD_LAST_PUBLISH]).toISOString() : null,
+        error: error ? decoder.decode(error) : null,
+        sources: sources ? (JSON.parse(decoder.decode(sources)) as PriceSources) : null,
+        cadence: {
+          adaptive: fields[FIELD_ADAPTIVE] === 1,
+          pollIntervalMs: fields[FIELD_POLL_INTERVAL],
+          priceEpsilon: fields[FIELD_EPSILON],
+          minPublishIntervalMs: fields[FIELD_MIN_PUBLISH_INTERVAL],
+          sigma: Number.isNaN(sigma) ? null : sigma,
+        },
+        scheduler: {
+          ticks: fields[FIELD_TICKS],
+          lastTickMs: fields[FIELD_LAST_TICK_MS],
+          queueDepth: fields[FIELD_QUEUE_DEPTH],
+          droppedTicks: fields[FIELD_DROPPED_TICKS],
+          publishInFlight: fields[FIELD_PUBLISH_IN_FLIGHT] === 1,
+        },
+        heartbeat: fields[FIELD_HEARTBEAT],
+      };
+    }
+
+    return null;
+  }
+}
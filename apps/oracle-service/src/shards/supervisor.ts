@@ -0,0 +1,205 @@
+import * as path from 'path';
+import { Worker } from 'worker_threads';
+import { config } from '../config';
+import { MarketConfig } from '../markets';
+import { MarketHealth } from '../state';
+import { createHealthBuffer, HealthBoard } from './health-board';
+import { ShardInit, ShardUpdate } from './worker';
+
+const MAX_RESTART_DELAY_MS = 30000;
+const HEALTHY_RUN_MS = 60000;
+
+export interface ShardStatus {
+  dex: string;
+  markets: string[];
+  alive: boolean;
+  restarts: number;
+  lastExit: string | null;
+}
+
+interface Shard {
+  init: ShardInit;
+  board: HealthBoard;
+  worker?: Worker;
+  restartTimer?: NodeJS.Timeout;  // pending restart after a crash
+  startedAt: number;
+  restarts: number;
+  consecutiveFailures: number;
+  lastExit: string | null;
+  reloading: boolean;  // planned restart with a new market list, not a failure
+}
+
+// Runs one worker thread per dex so a slow publish on one dex never delays
+// another. Each shard reports through its own HealthBoard rather than messages.
+export class ShardSupervisor {
+  private shards: Shard[] = [];
+  private stopping = false;
+
+  constructor(groups: Map<string, MarketConfig[]>) {
+    this.shards = this.buildShards(groups);
+  }
+
+  private buildShards(groups: Map<string, MarketConfig[]>): Shard[] {
+    return Array.from(groups, ([dex, markets], shardIndex) => {
+      const buffer = createHealthBuffer(markets.length);
+      return {
+        init: { dex, markets, slots: markets.map((_m, idx) => idx), shardIndex, shardCount: groups.size, buffer },
+        board: new HealthBoard(buffer),
+        startedAt: 0,
+        restarts: 0,
+        consecutiveFailures: 0,
+        lastExit: null,
+        reloading: false,
+      };
+    });
+  }
+
+  start(): void {
+    this.shards.forEach((shard) => this.spawn(shard));
+  }
+
+  async stop(): Promise<void> {
+    this.stopping = true;
+    this.shards.forEach((shard) => clearTimeout(shard.restartTimer));
+    await Promise.all(this.shards.map((shard) => shard.worker?.terminate()));
+  }
+
+  // Applies a new market set. Parameter changes are sent to the running shard
+  // and applied in place. A shard whose market list changed is restarted (its
+  // state carries over through checkpoints). Adding or removing a dex changes
+  // the nonce partitioning, so every shard restarts.
+  async reload(groups: Map<string, MarketConfig[]>): Promise<void> {
+    if (this.stopping) {
+      return;
+    }
+    const currentDexes = this.shards.map((shard) => shard.init.dex).sort().join(',');
+    const nextDexes = Array.from(groups.keys()).sort().join(',');
+
+    if (currentDexes !== nextDexes) {
+      console.log(`[supervisor] dex set changed (${currentDexes} -> ${nextDexes}); restarting all shards`);
+      const old = this.shards;
+      this.shards = [];
+      this.stopping = true;
+      old.forEach((shard) => clearTimeout(shard.restartTimer));
+      await Promise.all(old.map((shard) => shard.worker?.terminate()));
+      this.stopping = false;
+      this.shards = this.buildShards(groups);
+      this.start();
+      return;
+    }
+
+    for (const shard of this.shards) {
+      const markets = groups.get(shard.init.dex) ?? [];
+      if (JSON.stringify(markets) === JSON.stringify(shard.init.markets)) {
+        continue;
+      }
+      const sameIds = markets.map((m) => m.id).join(',') === shard.init.markets.map((m) => m.id).join(',');
+      if (sameIds && shard.worker) {
+        shard.init = { ...shard.init, markets };
+        const update: ShardUpdate = { type: 'update', markets };
+        shard.worker.postMessage(update);
+        continue;
+      }
+      console.log(`[supervisor] shard ${shard.init.dex}: markets changed; restarting shard`);
+      const buffer = createHealthBuffer(markets.length);
+      shard.init = { ...shard.init, markets, slots: markets.map((_m, idx) => idx), buffer };
+      shard.board = new HealthBoard(buffer);
+      if (shard.worker) {
+        shard.reloading = true;
+        await shard.worker.terminate();
+      } else {
+        // Crashed and waiting out its backoff: start now instead.
+        clearTimeout(shard.restartTimer);
+        shard.restartTimer = undefined;
+        this.spawn(shard);
+      }
+    }
+  }
+
+  private spawn(shard: Shard): void {
+    // Under ts-node the worker is a .ts file and needs the same loader.
+    const ext = path.extname(__filename);
+    const workerPath = path.join(__dirname, `worker${ext}`);
+    const worker = new Worker(workerPath, {
+      workerData: shard.init,
+      execArgv: ext === '.ts' ? ['--require', 'ts-node/register/transpile-only'] : undefined,
+    });
+
+    shard.worker = worker;
+    shard.startedAt = Date.now();
+
+    worker.on('error', (err) => {
+      shard.lastExit = err.message;
+      console.error(`[supervisor] shard ${shard.init.dex} error`, err);
+    });
+
+    worker.on('exit', (code) => {
+      shard.worker = undefined;
+      if (this.stopping) {
+        return;
+      }
+      if (shard.reloading) {
+        shard.reloading = false;
+        this.spawn(shard);
+        return;
+      }
+
+      shard.lastExit = shard.lastExit ?? `exit code ${code}`;
+      shard.consecutiveFailures = Date.now() - shard.startedAt > HEALTHY_RUN_MS ? 1 : shard.consecutiveFailures + 1;
+      const delay = Math.min(
+        config.shardRestartDelayMs * Math.pow(2, shard.consecutiveFailures - 1),
+        MAX_RESTART_DELAY_MS
+      );
+      console.warn(`[supervisor] shard ${shard.init.dex} exited (${shard.lastExit}); restarting in ${delay}ms`);
+
+      shard.restartTimer = setTimeout(() => {
+        shard.restartTimer = undefined;
+        if (this.stopping || shard.worker) {
+          return;
+        }
+        shard.restarts += 1;
+        shard.lastExit = null;
+        this.spawn(shard);
+      }, delay);
+    });
+  }
+
+  shardStatus(): ShardStatus[] {
+    return this.shards.map((shard) => ({
+      dex: shard.init.dex,
+      markets: shard.init.markets.map((m) => m.id),
+      alive: shard.worker !== undefined,
+      restarts: shard.restarts,
+      lastExit: shard.lastExit,
+    }));
+  }
+
+  marketHealth(): MarketHealth[] {
+    return this.shards.flatMap((shard) => shard.init.markets.map((m, slot) => this.slotHealth(shard.board, slot, m.id)));
+  }
+
+  private slotHealth(board: HealthBoard, slot: number, market: string): MarketHealth {
+    const health = board.read(slot, market);
+    if (!health) {
+      return {
+        market,
+        lastPrice: null,
+        lastUpdate: null,
+        stale: true,
+        publishes: 0,
+        lastPublish: null,
+        error: 'shard not reporting',
+        sources: null,
+        cadence: { adaptive: config.adaptiveCadence, pollIntervalMs: 0, priceEpsilon: 0, minPublishIntervalMs: 0, sigma: null },
+        scheduler: { ticks: 0, lastTickMs: 0, queueDepth: 0, droppedTicks: 0, publishInFlight: false },
+      };
+    }
+    const { heartbeat, ...rest } = health;
+    // A shard whose event loop is stuck stops writing its slot; surface that as stale.
+    const silentFor = Date.now() - heartbeat;
+    if (silentFor > Math.max(config.staleThresholdMs, rest.cadence.pollIntervalMs * 3)) {
+      return { ...rest, stale: true, error: rest.error ?? `no report for ${silentFor}ms` };
+    }
+    return rest;
+  }
+}
@@ -0,0 +1,43 @@
+import { parentPort, workerData } from 'worker_threads';
+import { MarketConfig } from '../markets';
+import { createNonceStream } from '../nonce';
+import { MarketRegistry } from '../registry';
+import { HealthBoard } from './health-board';
+
+export interface ShardInit {
+  dex: string;
+  markets: MarketConfig[];
+  slots: number[];  // health board slot per market, same order as markets
+  shardIndex: number;
+  shardCount: number;
+  buffer: SharedArrayBuffer;
+}
+
+// Sent by the supervisor when a reload changes parameters but not the shard's
+// market list, so the markets can be updated without restarting the shard.
+export interface ShardUpdate {
+  type: 'update';
+  markets: MarketConfig[];
+}
+
+async function runShard(init: ShardInit) {
+  const board = new HealthBoard(init.buffer);
+  const slotOf = new Map(init.markets.map((market, idx) => [market.id, init.slots[idx]]));
+  const registry = new MarketRegistry(createNonceStream(init.shardIndex, init.shardCount), (rt) =>
+    board.write(slotOf.get(rt.market.id)!, rt)
+  );
+
+  console.log(`[shard:${init.dex}] starting ${init.markets.length} market(s): ${init.markets.map((m) => m.id).join(', ')}`);
+
+  await registry.apply(init.markets);
+  parentPort?.on('message', (message: ShardUpdate) => {
+    if (message.type === 'update') {
+      void registry.apply(message.markets).catch((err) => console.error(`[shard:${init.dex}] update failed`, err));
+    }
+  });
+}
+
+runShard(workerData as ShardInit).catch((err) => {
+  console.error('[shard] fatal error', err);
+  process.exit(1);
+});
@@ -3,20 +3,97 @@ export interface PriceSnapshot {
   timestamp: number;
   stale: boolean;
   lastError?: string;
+  sources?: PriceSources;  // which price sources fed the last reading
+}
+
+export interface PriceSources {
+  used: string[];
+  rejected: string[];  // answered in time but stale or too far from the median
+  failed: string[];  // errored or missed the deadline
 }
 
 export interface PublishStats {
   lastPublish?: number;
+  lastPublishedValue: number | null;
   totalPublishes: number;
 }
 
-export const priceState: PriceSnapshot = {
-  value: 0,
-  timestamp: 0,
-  stale: true,
-  lastError: undefined,
-};
+export interface CadenceState {
+  adaptive: boolean;
+  pollIntervalMs: number;
+  priceChangeEpsilon: number;
+  minPublishIntervalMs: number;
+  sigma: number | null;
+}
+
+// Per-market tick scheduler counters. Ticks never overlap; a tick that finishes
+// while a publish is still in flight parks its value in a one-slot mailbox, and
+// a newer value replaces (drops) an older one that was never sent.
+export interface SchedulerStats {
+  ticks: number;
+  lastTickMs: number;
+  queueDepth: number;
+  droppedTicks: number;
+  publishInFlight: boolean;
+}
+
+export interface MarketHealth {
+  market: string;
+  lastPrice: number | null;
+  lastUpdate: string | null;
+  stale: boolean;
+  publishes: number;
+  lastPublish: string | null;
+  error: string | null;
+  sources: PriceSources | null;
+  cadence: {
+    adaptive: boolean;
+    pollIntervalMs: number;
+    priceEpsilon: number;
+    minPublishIntervalMs: number;
+    sigma: number | null;
+  };
+  scheduler: {
+    ticks: number;
+    lastTickMs: number;
+    queueDepth: number;
+    droppedTicks: number;
+    publishInFlight: boolean;
+  };
+}
 
-export const publishStats: PublishStats = {
-  totalPublishes: 0,
-};
+export function createPriceSnapshot(): PriceSnapshot {
+  return {
+    value: 0,
+    timestamp: 0,
+    stale: true,
+    lastError: undefined,
+  };
+}
+
+export function createPublishStats(): PublishStats {
+  return {
+    lastPublishedValue: null,
+    totalPublishes: 0,
+  };
+}
+
+export function createCadenceState(): CadenceState {
+  return {
+    adaptive: false,
+    pollIntervalMs: 0,
+    priceChangeEpsilon: 0,
+    minPublishIntervalMs: 0,
+    sigma: null,
+  };
+}
+
+export function createSchedulerStats(): SchedulerStats {
+  return {
+    ticks: 0,
+    lastTickMs: 0,
+    queueDepth: 0,
+    droppedTicks: 0,
+    publishInFlight: false,
+  };
+}
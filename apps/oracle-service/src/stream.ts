@@ -0,0 +1,185 @@
+import { IncomingMessage, ServerResponse } from 'http';
+import { config } from './config';
+import { MarketHealth } from './state';
+
+// One market's entry in a stream frame.
+export interface StreamMarket {
+  market: string;
+  value: number | null;
+  timestamp: number | null;
+  stale: boolean;
+  change24h: number | null;  // fraction vs the oldest sample within 24h (null until there is one)
+}
+
+interface Client {
+  res: ServerResponse;
+  blockedSince: number;  // when the socket buffer filled up; 0 while writable
+  missed: boolean;  // skipped frames while blocked, so it needs a snapshot
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const SAMPLE_EVERY_MS = 60 * 1000;
+
+// Per-market minute samples for the 24h change, oldest first.
+interface History {
+  samples: { timestamp: number; value: number }[];
+  lastSampleAt: number;
+}
+
+// Server-sent events fan-out of index updates for every market.
+//
+// Every STREAM_INTERVAL_MS it diffs the current health against the last frame
+// and, if anything moved, serializes one "update" frame holding just the
+// changed markets. The same buffer goes to every subscriber, so the cost per
+// tick is one serialization whatever the audience.
+//
+// Backpressure is per client. When a socket's buffer is full, that client
+// stops receiving frames. Once it drains it gets a fresh snapshot, so a slow
+// viewer skips to the latest values rather than queueing stale ones. Nothing
+// is buffered per client beyond the socket. Clients that stay blocked for longer
+// than STREAM_MAX_BLOCKED_MS are disconnected.
+export class PriceStream {
+  private readonly clients = new Set<Client>();
+  private readonly last = new Map<string, StreamMarket>();
+  private readonly history = new Map<string, History>();
+  private snapshotFrame: Buffer | null = null;  // cached until the next change
+  private timer?: NodeJS.Timeout;
+  private heartbeat?: NodeJS.Timeout;
+
+  constructor(private readonly collect: () => MarketHealth[]) {}
+
+  start(): void {
+    this.tick();
+    this.timer = setInterval(() => this.tick(), config.streamIntervalMs);
+    // Comment lines keep idle proxies from closing the connection.
+    this.heartbeat = setInterval(() => this.broadcast(Buffer.from(': ping\n\n')), 15000);
+  }
+
+  stop(): void {
+    clearInterval(this.timer);
+    clearInterval(this.heartbeat);
+    for (const client of this.clients) {
+      client.res.end();
+    }
+    this.clients.clear();
+  }
+
+  subscriberCount(): number {
+    return this.clients.size;
+  }
+
+  subscribe(req: IncomingMessage, res: ServerResponse): void {
+    res.writeHead(200, {
+      'content-type': 'text/event-stream',
+      'cache-control': 'no-cache',
+      connection: 'keep-alive',
+      'x-accel-buffering': 'no',
+      'access-control-allow-origin': '*',
+    });
+    res.socket?.setNoDelay(true);
+
+    const client: Client = { res, blockedSince: 0, missed: false };
+    this.clients.add(client);
+    res.on('drain', () => {
+      client.blockedSince = 0;
+      if (client.missed) {
+        client.missed = false;
+        this.send(client, this.snapshot());
+      }
+    });
+    req.on('close', () => this.clients.delete(client));
+
+    this.send(client, this.snapshot());
+  }
+
+  private tick(): void {
+    const now = Date.now();
+    const changed: StreamMarket[] = [];
+    const seen = new Set<string>();
+
+    for (const health of this.collect()) {
+      const entry = this.entry(health, now);
+      seen.add(entry.market);
+      const previous = this.last.get(entry.market);
+      if (!previous || previous.value !== entry.value || previous.timestamp !== entry.timestamp || previous.stale !== entry.stale) {
+        changed.push(entry);
+      }
+      this.last.set(entry.market, entry);
+    }
+
+    // Markets removed by a hot reload.
+    const removed = Array.from(this.last.keys()).filter((market) => !seen.has(market));
+    removed.forEach((market) => {
+      this.last.delete(market);
+      this.history.delete(market);
+    });
+
+    if (!changed.length && !removed.length) {
+      return;
+    }
+    this.snapshotFrame = null;
+    if (this.clients.size) {
+      this.broadcast(frame('update', { ts: now, markets: changed, removed }));
+    }
+  }
+
+  private entry(health: MarketHealth, now: number): StreamMarket {
+    const timestamp = health.lastUpdate ? Date.parse(health.lastUpdate) : null;
+    return {
+      market: health.market,
+      value: health.lastPrice,
+      timestamp,
+      stale: health.stale,
+      change24h: health.lastPrice !== null ? this.change24h(health.market, health.lastPrice, now) : null,
+    };
+  }
+
+  private change24h(market: string, value: number, now: number): number | null {
+    let history = this.history.get(market);
+    if (!history) {
+      history = { samples: [], lastSampleAt: 0 };
+      this.history.set(market, history);
+    }
+    if (now - history.lastSampleAt >= SAMPLE_EVERY_MS) {
+      history.samples.push({ timestamp: now, value });
+      history.lastSampleAt = now;
+      while (history.samples.length && now - history.samples[0].timestamp > DAY_MS) {
+        history.samples.shift();
+      }
+    }
+    const oldest = history.samples[0];
+    return oldest && oldest.timestamp < now && oldest.value ? value / oldest.value - 1 : null;
+  }
+
+  private snapshot(): Buffer {
+    if (!this.snapshotFrame) {
+      this.snapshotFrame = frame('snapshot', { ts: Date.now(), markets: Array.from(this.last.values()) });
+    }
+    return this.snapshotFrame;
+  }
+
+  private broadcast(data: Buffer): void {
+    const now = Date.now();
+    for (const client of this.clients) {
+      if (!client.blockedSince) {
+        this.send(client, data);
+      } else if (now - client.blockedSince > config.streamMaxBlockedMs) {
+        console.warn('[stream] dropping slow subscriber');
+        this.clients.delete(client);
+        client.res.destroy();
+      } else {
+        client.missed = true;
+      }
+    }
+  }
+
+  private send(client: Client, data: Buffer): void {
+    if (!client.res.write(data)) {
+      client.blockedSince = Date.now();
+    }
+  }
+}
+
+function frame(event: string, payload: unknown): Buffer {
+  return Buffer.from(`event: ${event}\ndata: ${JSON.stringify(payload)}\n\n`);
+}
@@ -61,3 +61,106 @@ window.WAR_MARKETS = [
 ];
 
 
+
+// Live index updates from the oracle service's /stream endpoint (server-sent
+// events). One connection per tab; the service pushes a snapshot on connect
+// and then only the markets that changed. onMarket(code, entry) is called for
+// each market, with entry = { market, value, timestamp, stale, change24h }.
+// onStatus(state) receives 'open' or 'error'; EventSource reconnects by itself.
+window.WAR_STREAM = {
+  apiBase() {
+    const params = new URLSearchParams(window.location.search);
+    const apiBaseParam = params.get('api');
+    if (apiBaseParam) {
+      localStorage.setItem('wm_api_base', apiBaseParam);
+    }
+    return apiBaseParam || localStorage.getItem('wm_api_base') || '';
+  },
+
+  connect(apiBase, onMarket, onStatus) {
+    if (!apiBase || !window.EventSource) return null;
+    const source = new EventSource(`${apiBase}/stream`);
+    const handle = (event) => {
+      const payload = JSON.parse(event.data);
+      payload.markets.forEach((entry) => {
+        const code = entry.market.split(':').pop().toUpperCase();
+        onMarket(code, entry);
+      });
+    };
+    source.addEventListener('snapshot', handle);
+    source.addEventListener('update', handle);
+    source.onopen = () => onStatus && onStatus('open');
+    source.onerror = () => onStatus && onStatus('error');
+    return source;
+  },
+
+  // Live price, 24h change and "updated Ns ago" for a single-index page
+  // (#livePrice, #liveChange, #liveIndicator). Uses the stream, and polls
+  // /health every 5s while EventSource is unavailable or the stream is down.
+  bindIndexPage(pageIndex) {
+    const apiBase = this.apiBase();
+    let lastUpdate = null;
+    let pollTimer = null;
+
+    const render = (entry) => {
+      if (Number.isFinite(entry.value)) {
+        document.getElementById('livePrice').textContent = this.formatPrice(entry.value);
+      }
+      if (Number.isFinite(entry.change24h)) {
+        const change = document.getElementById('liveChange');
+        change.className = `metric-value ${entry.change24h < 0 ? 'status-down' : 'status-up'}`;
+        change.textContent = this.formatChange(entry.change24h);
+      }
+      if (entry.timestamp) {
+        lastUpdate = entry.timestamp;
+      }
+    };
+
+    // /price only takes a full market id, so look the page's index up in /health.
+    const poll = async () => {
+      try {
+        const health = await fetch(`${apiBase}/health`).then(r => r.json());
+        const market = (health.markets || []).find((m) => m.market.split(':').pop().toUpperCase() === pageIndex);
+        if (market) {
+          render({
+            value: market.lastPrice ?? NaN,
+            timestamp: market.lastUpdate ? Date.parse(market.lastUpdate) : null,
+          });
+        }
+      } catch (err) {
+        document.getElementById('liveIndicator').textContent = 'LIVE • price unavailable';
+      }
+    };
+    const startPolling = () => {
+      if (pollTimer || !apiBase) return;
+      poll();
+      pollTimer = setInterval(poll, 5000);
+    };
+    const stopPolling = () => {
+      clearInterval(pollTimer);
+      pollTimer = null;
+    };
+
+    const source = this.connect(apiBase, (code, entry) => {
+      if (code === pageIndex) render(entry);
+    }, (state) => (state === 'open' ? stopPolling() : startPolling()));
+    if (!source) {
+      startPolling();
+    }
+
+    setInterval(() => {
+      if (!lastUpdate) return;
+      const ago = Math.max(0, (Date.now() - lastUpdate) / 1000);
+      document.getElementById('liveIndicator').textContent = `LIVE • updated ${ago.toFixed(1)}s ago`;
+    }, 500);
+  },
+
+  formatPrice(value) {
+    return `$${value.toFixed(2)}`;
+  },
+
+  formatChange(change) {
+    const pct = change * 100;
+    return `${pct >= 0 ? '+' : ''}${pct.toFixed(2)}%`;
+  }
+};